@@ -0,0 +1,168 @@
+# Author-Florian
+# Description-Builds several laser cut cases from a csv or json job file.
+#
+# A job file lists one case per row (csv with a header line) or per object (json,
+# a list or {"cases": [...]}). The columns are name, materialThickness, width,
+# length, height and optionally fingerWidth, kerf and cornerRadius. Values are expressions like in the
+# dialog, plain numbers are in mm.
+#
+# Every case is built into its own component, placed next to the previous one.
+# Cases with the same dimensions as a case built before are not built again,
+# another occurrence of the first case component is placed instead, so they
+# share its parameters, sketches and features. Running a job again updates the
+# cases of the job, cases of an earlier run that are not part of the job
+# anymore are left in the design.
+
+import csv
+import json
+import os
+import time
+
+import adsk.core
+from .CaseGeometry import clearPatternCache, patternCacheStats
+from .EasyFusionAPI import EZFusionAPI
+from .LaserCutCase import Case
+
+# gap between the cases in cm
+defaultSpacing = 1.0
+
+requiredColumns = ('name', 'materialThickness', 'width', 'length', 'height')
+
+
+def readJobFile(path):
+    '''
+    reads the case specs of a csv or json job file
+
+    returns a list of dictionaries with the column names as keys and the
+    values as strings
+    '''
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, newline='') as file:
+        if extension == '.json':
+            data = json.load(file)
+            rows = data['cases'] if isinstance(data, dict) else data
+        elif extension == '.csv':
+            rows = list(csv.DictReader(file))
+        else:
+            raise Exception('unknown job file type %s, use .csv or .json' % extension)
+
+    specs = []
+    names = set()
+    for i, row in enumerate(rows):
+        spec = {}
+        for key, value in row.items():
+            if key != None and value != None and str(value).strip() != '':
+                spec[key.strip()] = str(value).strip()
+        for column in requiredColumns:
+            if column not in spec:
+                raise Exception('case %d of %s has no %s' % (i + 1, path, column))
+        # the case name names its component, parameters and panels
+        if spec['name'] in names:
+            raise Exception('case %d of %s repeats the name %s' % (i + 1, path, spec['name']))
+        names.add(spec['name'])
+        specs.append(spec)
+    return specs
+
+
+def buildCases(specs, spacing=defaultSpacing, captureHistory=True):
+    '''
+    builds every case spec into its own component
+
+    spacing is the gap between the cases in cm
+    captureHistory is passed on to every case, see Case.buildCase
+
+    returns a list of dictionaries, one per spec, with the case name, the
+    build time in seconds, the number of timeline entries created, the name of
+    the case it shares the geometry with (or None) and the error message if the
+    case could not be built (or None)
+    '''
+    # the pattern statistics of the report are per job
+    clearPatternCache()
+    fa = EZFusionAPI()
+    unitsMgr = adsk.core.Application.get().activeProduct.unitsManager
+
+    built = {}
+    # number of occurrences placed per case component, running the same job
+    # again moves the occurrences of the last run instead of adding new ones
+    uses = {}
+    report = []
+    offset = 0.0
+    for spec in specs:
+        start = time.perf_counter()
+        entry = {'name': spec['name'], 'seconds': 0.0, 'timelineEntries': 0, 'sharedWith': None, 'error': None}
+        report.append(entry)
+        try:
+            case = Case()
+            case.name = spec['name']
+            case.captureHistory = captureHistory
+            case.materialThickness = unitsMgr.evaluateExpression(spec['materialThickness'], 'mm')
+            case.width = unitsMgr.evaluateExpression(spec['width'], 'mm')
+            case.length = unitsMgr.evaluateExpression(spec['length'], 'mm')
+            case.height = unitsMgr.evaluateExpression(spec['height'], 'mm')
+            if 'fingerWidth' in spec:
+                case.fingerWidth = unitsMgr.evaluateExpression(spec['fingerWidth'], 'mm')
+            if 'kerf' in spec:
+                case.kerf = unitsMgr.evaluateExpression(spec['kerf'], 'mm')
+            if 'cornerRadius' in spec:
+                case.cornerRadius = unitsMgr.evaluateExpression(spec['cornerRadius'], 'mm')
+            case.geometry().validate()
+
+            transform = adsk.core.Matrix3D.create()
+            transform.translation = adsk.core.Vector3D.create(offset, 0, 0)
+
+            key = (case.materialThickness, case.width, case.length, case.height, case.fingerWidth, case.kerf,
+                   case.cornerRadius)
+            if key in built:
+                component, entry['sharedWith'] = built[key]
+                _placeOccurrence(fa, component, uses, transform)
+            else:
+                component = fa.get_Component(case.name)
+                if component == None:
+                    component = fa.create_NewComponent(case.name, transform)
+                else:
+                    _placeOccurrence(fa, component, uses, transform)
+                uses[component.name] = 1
+                case.parentComponent = component
+                case.buildCase()
+                entry['timelineEntries'] = case.timelineEntries
+                built[key] = (component, case.name)
+
+            offset += case.width + spacing
+        except Exception as e:
+            # a failed case does not stop the job
+            entry['error'] = str(e)
+        entry['seconds'] = time.perf_counter() - start
+    return report
+
+
+def _placeOccurrence(fa, component, uses, transform):
+    '''
+    moves the next unused occurrence of the component or places a new one
+    '''
+    index = uses.get(component.name, 0)
+    occurrences = fa.__base__.rootComp.occurrencesByComponent(component)
+    if index < occurrences.count:
+        occurrences.item(index).transform = transform
+    else:
+        fa.create_Occurrence(component, transform)
+    uses[component.name] = index + 1
+
+
+def formatReport(report):
+    '''
+    formats the report of buildCases as text, one line per case
+    '''
+    lines = []
+    for entry in report:
+        if entry['error'] != None:
+            state = 'failed: %s' % entry['error']
+        elif entry['sharedWith'] != None:
+            state = 'shares %s' % entry['sharedWith']
+        else:
+            state = 'built'
+        lines.append('%s: %.3f s, %d timeline entries, %s'
+                     % (entry['name'], entry['seconds'], entry['timelineEntries'], state))
+    lines.append('total: %.3f s' % sum(entry['seconds'] for entry in report))
+    stats = patternCacheStats()
+    lines.append('finger patterns: %d computed, %d reused' % (stats['misses'], stats['hits']))
+    return '\n'.join(lines)
@@ -0,0 +1,520 @@
+# Author-Florian
+# Description-Pure python panel and finger joint geometry of the laser cut case.
+#
+# Nothing in this module talks to Fusion 360. All panel outlines are computed
+# from the case dimensions alone, so case variants can be generated and checked
+# in batch before the chosen one is handed to the EZFusionAPI.
+
+import functools
+import itertools
+import math
+
+from .VectorMath import PointArray
+
+# number of distinct edge and slit patterns kept by fingerPattern and slitPattern
+patternCacheSize = 1024
+
+# number of straight segments a rounded corner of 90 degrees is drawn with
+cornerSegments = 16
+
+# edge genders, a male edge starts and ends with a tab, a female edge with a slot
+MALE = 1
+FEMALE = 0
+
+
+def fingerCount(length, fingerWidth):
+    '''
+    calculates the number of fingers (tabs and slots) along an edge
+
+    the count is always odd so both ends of an edge are of the same kind
+    '''
+    if fingerWidth <= 0:
+        return 1
+    n = int(length // fingerWidth)
+    if n % 2 == 0:
+        n -= 1
+    return max(n, 1)
+
+
+@functools.lru_cache(maxsize=patternCacheSize)
+def fingerPattern(length, materialThickness, fingerWidth, gender, kerf=0.0):
+    '''
+    calculates the tab/slot sequence of an edge
+
+    the sequences are cached, opposite panels of a case and repeated cases of a
+    batch share their edges, so every distinct edge is computed once
+
+    length is the outer length of the edge
+    gender is MALE or FEMALE
+    kerf is the width of the laser cut, the outline is moved outwards by half
+    of it, so every tab grows by kerf and every slot shrinks by kerf
+
+    returns a tuple of (segmentLength, inset) pairs, the inset is 0 for a tab
+    and materialThickness for a slot, both less half the kerf. The segment
+    lengths still add up to length, the edge grows by half the kerf at both
+    ends through the insets of the neighbouring edges.
+    '''
+    n = fingerCount(length, fingerWidth)
+    segmentLength = length / n
+    half = kerf / 2
+    pattern = []
+    for i in range(n):
+        isTab = (i % 2 == 0) == (gender == MALE)
+        # the walls between the segments move into the slots by half the kerf
+        grow = (i > 0) + (i < n - 1)
+        compensated = segmentLength + grow * half if isTab else segmentLength - grow * half
+        pattern.append((compensated, (0.0 if isTab else materialThickness) - half))
+    return tuple(pattern)
+
+
+def patternCacheStats():
+    '''
+    returns a dictionary with the hits, misses and size of the edge pattern cache
+    '''
+    info = fingerPattern.cache_info()
+    return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize}
+
+
+def clearPatternCache():
+    fingerPattern.cache_clear()
+    slitPattern.cache_clear()
+
+
+@functools.lru_cache(maxsize=patternCacheSize)
+def slitPattern(length, height, slitLength, slitGap, slitSpacing, margin):
+    '''
+    calculates the slits of a living hinge
+
+    the slits run across the bend in columns, every second column is shifted by
+    half a slit, so the material between the slits twists instead of breaking.
+    The slits keep margin away from the long edges. The patterns are cached,
+    the bends of a case all share one pattern.
+
+    length is the length of the bend, height the length of the slit columns
+    slitLength is the length of a slit, slitGap the material between two slits
+    of a column and slitSpacing the distance of the columns
+
+    returns a tuple of ((x1, y1), (x2, y2)) lines, x from 0 to length
+    '''
+    columns = max(1, int(length / slitSpacing))
+    spacing = length / columns
+    period = slitLength + slitGap
+    top = height - margin
+    lines = []
+    for j in range(columns):
+        x = (j + 0.5) * spacing
+        y = margin - (period / 2 if j % 2 else 0.0)
+        while y < top:
+            y1 = max(y, margin)
+            y2 = min(y + slitLength, top)
+            # pieces cut off at the margins shorter than a gap are left out
+            if y2 - y1 > slitGap:
+                lines.append(((x, y1), (x, y2)))
+            y += period
+    return tuple(lines)
+
+
+def _edgeSteps(pattern, position=0.0):
+    '''
+    yields the (along, inset) points where the inset of an edge changes
+
+    position is the along coordinate the pattern starts at
+    '''
+    for i in range(1, len(pattern)):
+        position += pattern[i - 1][0]
+        if pattern[i][1] != pattern[i - 1][1]:
+            yield position, pattern[i - 1][1]
+            yield position, pattern[i][1]
+
+
+class Panel:
+    '''
+    a flat panel of the case
+
+    the outline lives in the local xy plane of the panel in the rectangle
+    [0, width] x [0, height]. The panel is placed into the case by origin, xAxis
+    and yAxis and extruded along normal by the material thickness.
+
+    edgeGenders are the genders of the bottom, right, top and left edge
+    (counter clockwise, starting at the local origin)
+
+    kerf is the width of the laser cut, the outline is grown by half of it on
+    every side, so width and height are the nominal size of the panel
+    '''
+
+    # True if the outline only has horizontal and vertical segments
+    rectilinear = True
+
+    def __init__(self, name, width, height, edgeGenders, materialThickness, fingerWidth,
+                 origin=(0.0, 0.0, 0.0), xAxis=(1.0, 0.0, 0.0), yAxis=(0.0, 1.0, 0.0), kerf=0.0):
+        self.name = name
+        self.width = width
+        self.height = height
+        self.edgeGenders = tuple(edgeGenders)
+        self.materialThickness = materialThickness
+        self.fingerWidth = fingerWidth
+        self.origin = origin
+        self.xAxis = xAxis
+        self.yAxis = yAxis
+        self.kerf = kerf
+
+    @property
+    def normal(self):
+        x = self.xAxis
+        y = self.yAxis
+        return (x[1] * y[2] - x[2] * y[1],
+                x[2] * y[0] - x[0] * y[2],
+                x[0] * y[1] - x[1] * y[0])
+
+    def outlineInputs(self):
+        '''
+        returns a tuple of all inputs the outline of the panel depends on
+        '''
+        return (self.width, self.height, self.edgeGenders, self.materialThickness, self.fingerWidth, self.kerf)
+
+    def placementInputs(self):
+        '''
+        returns a tuple of all inputs the placement of the panel depends on
+        '''
+        return (tuple(self.origin), tuple(self.xAxis), tuple(self.yAxis))
+
+    def edgeFrames(self):
+        '''
+        returns a list of (start, direction, inwardNormal, length) tuples
+        of the four edges in counter clockwise order
+        '''
+        w = self.width
+        h = self.height
+        return [((0.0, 0.0), (1.0, 0.0), (0.0, 1.0), w),
+                ((w, 0.0), (0.0, 1.0), (-1.0, 0.0), h),
+                ((w, h), (-1.0, 0.0), (0.0, -1.0), w),
+                ((0.0, h), (0.0, -1.0), (1.0, 0.0), h)]
+
+    def edgePatterns(self):
+        '''
+        returns the tab/slot sequence of every edge in counter clockwise order
+        '''
+        patterns = []
+        for (_, _, _, length), gender in zip(self.edgeFrames(), self.edgeGenders):
+            patterns.append(fingerPattern(length, self.materialThickness, self.fingerWidth, gender, self.kerf))
+        return patterns
+
+    def outline(self):
+        '''
+        calculates the closed outline of the panel including all finger joints
+
+        returns a PointArray of (x, y) points in counter clockwise order, the
+        closing segment from the last to the first point is implied
+        '''
+        return PointArray(self.iterOutline())
+
+    def iterOutline(self):
+        '''
+        yields the points of outline() one at a time, only the edge patterns are
+        held in memory
+        '''
+        frames = self.edgeFrames()
+        patterns = self.edgePatterns()
+        for k, ((start, direction, inward, length), pattern) in enumerate(zip(frames, patterns)):
+            # the corner is moved along the edge by the inset of the previous edge, the
+            # end point of an edge is the start point of the next edge, so it is left out
+            prevInset = patterns[k - 1][-1][1]
+            yield (start[0] + prevInset * direction[0] + pattern[0][1] * inward[0],
+                   start[1] + prevInset * direction[1] + pattern[0][1] * inward[1])
+            for along, inset in _edgeSteps(pattern):
+                yield (start[0] + along * direction[0] + inset * inward[0],
+                       start[1] + along * direction[1] + inset * inward[1])
+
+    def iterSegments(self):
+        '''
+        yields the ((x1, y1), (x2, y2)) segments of the closed outline one at a time
+        '''
+        points = self.iterOutline()
+        first = previous = next(points)
+        for point in points:
+            yield previous, point
+            previous = point
+        yield previous, first
+
+    def cuts(self):
+        '''
+        returns the cut lines inside the outline as ((x1, y1), (x2, y2)) tuples
+        '''
+        return list(self.iterCuts())
+
+    def iterCuts(self):
+        '''
+        yields the lines of cuts() one at a time
+        '''
+        return iter(())
+
+    def boxCorners(self):
+        '''
+        calculates the corners of the bounding box of the placed panel
+
+        returns a list of 8 (x, y, z) tuples, the first 4 are on the sketch plane
+        and the last 4 on the extruded face, both counter clockwise
+        '''
+        corners = []
+        for z in (0.0, self.materialThickness):
+            for u, v in ((0.0, 0.0), (self.width, 0.0), (self.width, self.height), (0.0, self.height)):
+                corners.append(self.localToCase(u, v, z))
+        return corners
+
+    def localToCase(self, u, v, w=0.0):
+        '''
+        transforms a point in the local coordinates of the panel into the case
+        '''
+        o, x, y, n = self.origin, self.xAxis, self.yAxis, self.normal
+        return tuple(o[i] + u * x[i] + v * y[i] + w * n[i] for i in range(3))
+
+    def area(self):
+        '''
+        returns the area of the panel outline
+        '''
+        area = 0.0
+        for (x1, y1), (x2, y2) in self.iterSegments():
+            area += x1 * y2 - x2 * y1
+        return abs(area) / 2
+
+
+class CaseGeometry:
+    '''
+    calculates the six finger jointed panels of a closed box
+
+    width, length and height are the outer dimensions of the case along x, y and z
+    kerf is the width of the laser cut the panel outlines are compensated for
+    '''
+
+    def __init__(self, width, length, height, materialThickness, fingerWidth, kerf=0.0):
+        self.width = width
+        self.length = length
+        self.height = height
+        self.materialThickness = materialThickness
+        self.fingerWidth = fingerWidth
+        self.kerf = kerf
+
+    def validate(self):
+        '''
+        raises an exception if the case dimensions can not be built
+        '''
+        t = self.materialThickness
+        if t <= 0:
+            raise Exception('material thickness must be positive')
+        if self.fingerWidth <= 0:
+            raise Exception('finger width must be positive')
+        if self.kerf < 0:
+            raise Exception('kerf must not be negative')
+        if self.kerf >= self.fingerWidth or self.kerf >= t:
+            raise Exception('kerf must be smaller than the finger width and the material thickness')
+        for name, value in (('width', self.width), ('length', self.length), ('height', self.height)):
+            if value <= 2 * t:
+                raise Exception('%s must be larger than twice the material thickness' % name)
+
+    def panels(self):
+        '''
+        returns the list of the six panels of the case
+
+        bottom and top only have female edges, front and back only male edges and
+        left and right have male edges towards bottom and top and female edges
+        towards front and back. So every corner cube is owned by front or back.
+        '''
+        self.validate()
+        w = self.width
+        l = self.length
+        h = self.height
+        t = self.materialThickness
+        fw = self.fingerWidth
+        k = self.kerf
+        X = (1.0, 0.0, 0.0)
+        Y = (0.0, 1.0, 0.0)
+        Z = (0.0, 0.0, 1.0)
+
+        plate = (FEMALE, FEMALE, FEMALE, FEMALE)
+        front = (MALE, MALE, MALE, MALE)
+        side = (MALE, FEMALE, MALE, FEMALE)
+
+        return [Panel('Bottom', w, l, plate, t, fw, (0.0, 0.0, 0.0), X, Y, k),
+                Panel('Top', w, l, plate, t, fw, (0.0, 0.0, h - t), X, Y, k),
+                Panel('Front', w, h, front, t, fw, (0.0, t, 0.0), X, Z, k),
+                Panel('Back', w, h, front, t, fw, (0.0, l, 0.0), X, Z, k),
+                Panel('Left', l, h, side, t, fw, (0.0, 0.0, 0.0), Y, Z, k),
+                Panel('Right', l, h, side, t, fw, (w - t, 0.0, 0.0), Y, Z, k)]
+
+
+class RoundedPlate(Panel):
+    '''
+    a bottom or top plate of a case with rounded corners
+
+    the straight edges have female finger joints, the corners are quarter
+    circles on the inside of the hinge panel wrapped around the plate.
+    cornerRadius is the outer radius of the case corners.
+    '''
+
+    rectilinear = False
+
+    def __init__(self, name, width, height, materialThickness, fingerWidth, cornerRadius,
+                 origin=(0.0, 0.0, 0.0), xAxis=(1.0, 0.0, 0.0), yAxis=(0.0, 1.0, 0.0), kerf=0.0):
+        super().__init__(name, width, height, (FEMALE, FEMALE, FEMALE, FEMALE), materialThickness, fingerWidth,
+                         origin, xAxis, yAxis, kerf)
+        self.cornerRadius = cornerRadius
+
+    def outlineInputs(self):
+        return super().outlineInputs() + (self.cornerRadius,)
+
+    def edgeFrames(self):
+        '''
+        returns a list of (start, direction, inwardNormal, length) tuples of the
+        straight parts of the four edges in counter clockwise order
+        '''
+        w = self.width
+        h = self.height
+        r = self.cornerRadius
+        return [((r, 0.0), (1.0, 0.0), (0.0, 1.0), w - 2 * r),
+                ((w, r), (0.0, 1.0), (-1.0, 0.0), h - 2 * r),
+                ((w - r, h), (-1.0, 0.0), (0.0, -1.0), w - 2 * r),
+                ((0.0, h - r), (0.0, -1.0), (1.0, 0.0), h - 2 * r)]
+
+    def iterOutline(self):
+        frames = self.edgeFrames()
+        patterns = self.edgePatterns()
+        r = self.cornerRadius
+        # the corners continue the slots at the ends of the edges
+        arcRadius = r - self.materialThickness + self.kerf / 2
+        for (start, direction, inward, length), pattern in zip(frames, patterns):
+            edgePoints = itertools.chain([(0.0, pattern[0][1])], _edgeSteps(pattern), [(length, pattern[-1][1])])
+            for along, inset in edgePoints:
+                yield (start[0] + along * direction[0] + inset * inward[0],
+                       start[1] + along * direction[1] + inset * inward[1])
+
+            # quarter circle to the start of the next edge, without its end points
+            centreX = start[0] + length * direction[0] + r * inward[0]
+            centreY = start[1] + length * direction[1] + r * inward[1]
+            startAngle = math.atan2(-inward[1], -inward[0])
+            for i in range(1, cornerSegments):
+                angle = startAngle + math.pi / 2 * i / cornerSegments
+                yield centreX + arcRadius * math.cos(angle), centreY + arcRadius * math.sin(angle)
+
+
+class HingePanel(Panel):
+    '''
+    the walls of a case with rounded corners as one unrolled panel
+
+    the panel is bent around the plates, living hinges (slit patterns) make the
+    corners bendable. sections is a list of (length, isBend) tuples along the
+    panel, the straight sections have male finger joints on the bottom and top
+    edge, the bends have plain edges and the slits of slitPattern. The ends of
+    the panel are plain and meet at the seam.
+    '''
+
+    def __init__(self, name, sections, height, materialThickness, fingerWidth, slitLength, slitGap, slitSpacing,
+                 origin=(0.0, 0.0, 0.0), xAxis=(1.0, 0.0, 0.0), yAxis=(0.0, 1.0, 0.0), kerf=0.0):
+        width = sum(length for length, _ in sections)
+        super().__init__(name, width, height, (MALE, None, MALE, None), materialThickness, fingerWidth,
+                         origin, xAxis, yAxis, kerf)
+        self.sections = tuple(sections)
+        self.slitLength = slitLength
+        self.slitGap = slitGap
+        self.slitSpacing = slitSpacing
+
+    def outlineInputs(self):
+        return super().outlineInputs() + (self.sections, self.slitLength, self.slitGap, self.slitSpacing)
+
+    def edgePatterns(self):
+        '''
+        returns the tab/slot sequence of every straight section, None for the bends
+        '''
+        return [None if isBend else fingerPattern(length, self.materialThickness, self.fingerWidth, MALE, self.kerf)
+                for length, isBend in self.sections]
+
+    def iterOutline(self):
+        half = self.kerf / 2
+        w = self.width
+        h = self.height
+        patterns = self.edgePatterns()
+        starts = [sum(length for length, _ in self.sections[:i]) for i in range(len(self.sections))]
+
+        # the straight sections start and end with a tab, which lines up with the
+        # plain bends, so only the steps within the sections are points
+        yield -half, -half
+        for x0, pattern in zip(starts, patterns):
+            if pattern != None:
+                for x, inset in _edgeSteps(pattern, x0):
+                    yield x, inset
+        yield w + half, -half
+        yield w + half, h + half
+        # the top edge runs backwards, the steps of one section are few
+        for x0, pattern in zip(reversed(starts), reversed(patterns)):
+            if pattern != None:
+                for x, inset in reversed(list(_edgeSteps(pattern, x0))):
+                    yield x, h - inset
+        yield -half, h + half
+
+    def iterCuts(self):
+        '''
+        yields the slits of all bends, they keep a gap away from the plates
+        '''
+        margin = self.materialThickness + self.slitGap
+        x0 = 0.0
+        for length, isBend in self.sections:
+            if isBend:
+                for (x1, y1), (x2, y2) in slitPattern(length, self.height, self.slitLength, self.slitGap,
+                                                      self.slitSpacing, margin):
+                    yield (x0 + x1, y1), (x0 + x2, y2)
+            x0 += length
+
+
+class HingeCaseGeometry(CaseGeometry):
+    '''
+    calculates the panels of a case with rounded vertical corners
+
+    the four walls are one living hinge panel wrapped around the bottom and top
+    plate. cornerRadius is the outer radius of the corners, the bends are
+    measured in the middle of the material. The hinge panel is placed unrolled
+    in front of the case, as it is cut.
+
+    slitLength, slitGap and slitSpacing set the slit pattern, see slitPattern
+    '''
+
+    def __init__(self, width, length, height, materialThickness, fingerWidth, cornerRadius, kerf=0.0,
+                 slitLength=2.0, slitGap=0.3, slitSpacing=0.15):
+        super().__init__(width, length, height, materialThickness, fingerWidth, kerf)
+        self.cornerRadius = cornerRadius
+        self.slitLength = slitLength
+        self.slitGap = slitGap
+        self.slitSpacing = slitSpacing
+
+    def validate(self):
+        super().validate()
+        t = self.materialThickness
+        if self.cornerRadius <= t:
+            raise Exception('corner radius must be larger than the material thickness')
+        if 2 * self.cornerRadius >= min(self.width, self.length):
+            raise Exception('corner radius must be smaller than half the width and the length')
+        if self.slitLength <= 0 or self.slitGap <= 0 or self.slitSpacing <= 0:
+            raise Exception('slit length, gap and spacing must be positive')
+        if self.height - 2 * (t + self.slitGap) <= self.slitLength:
+            raise Exception('height is too small for the slits of the living hinge')
+
+    def panels(self):
+        '''
+        returns the bottom and top plate and the hinge panel of the case
+        '''
+        self.validate()
+        w = self.width
+        l = self.length
+        h = self.height
+        t = self.materialThickness
+        fw = self.fingerWidth
+        r = self.cornerRadius
+        k = self.kerf
+        X = (1.0, 0.0, 0.0)
+        Y = (0.0, 1.0, 0.0)
+
+        bend = (math.pi / 2 * (r - t / 2), True)
+        sections = [(w - 2 * r, False), bend, (l - 2 * r, False), bend] * 2
+
+        return [RoundedPlate('Bottom', w, l, t, fw, r, (0.0, 0.0, 0.0), X, Y, k),
+                RoundedPlate('Top', w, l, t, fw, r, (0.0, 0.0, h - t), X, Y, k),
+                HingePanel('Hinge', sections, h, t, fw, self.slitLength, self.slitGap, self.slitSpacing,
+                           (0.0, -h - 1.0, 0.0), X, Y, k)]
@@ -0,0 +1,280 @@
+# Author-Florian
+# Description-Writes laser cut files (svg or dxf) straight from the panel outlines.
+#
+# Nothing in this module talks to Fusion 360, the files are written from the
+# pure python panel geometry of CaseGeometry. Panels are written one at a time
+# as they come and their points and cut lines are formatted in chunks as they
+# are generated, so neither hundreds of panels nor the thousands of slits of a
+# living hinge have to be held in memory at once.
+#
+# Conventions: outlines are cut on the layer CUT in red, panel names are
+# engraved on the layer ENGRAVE in blue. Files are in mm, the panel geometry
+# is in cm (the internal unit of Fusion 360).
+
+import itertools
+import os
+from xml.sax.saxutils import escape
+
+from .VectorMath import PointArray, offsetOutline
+
+cutLayer = 'CUT'
+engraveLayer = 'ENGRAVE'
+
+# svg colours and dxf colour indices of the layers
+svgColours = {cutLayer: '#FF0000', engraveLayer: '#0000FF'}
+dxfColours = {cutLayer: 1, engraveLayer: 5}
+
+# factor from cm (panel geometry) to mm (cut file)
+unitScale = 10.0
+
+# label height in mm
+labelHeight = 5.0
+
+# number of points or lines formatted before they are written to the file
+writeChunk = 512
+
+
+def cutOutline(points, kerf=0.0):
+    '''
+    calculates the path of the laser for an outline
+
+    the path runs half the kerf outside of the outline, so the cut parts keep
+    their size. points is a counter clockwise list or iterable of (x, y)
+    tuples, without kerf it is returned as it is.
+    '''
+    if kerf == 0:
+        return points
+    return offsetOutline(PointArray(points), kerf / 2)
+
+
+def _writePoints(file, points, firstFormat, format, transform):
+    '''
+    formats the points in chunks and writes them in one pass
+
+    the first point is formatted with firstFormat, all others with format, both
+    take the coordinates returned by transform
+
+    returns the (minX, minY, maxX, maxY) bounding box of the points
+    '''
+    minX = minY = float('inf')
+    maxX = maxY = float('-inf')
+    chunk = []
+    pointFormat = firstFormat
+    for x, y in points:
+        if x < minX:
+            minX = x
+        if x > maxX:
+            maxX = x
+        if y < minY:
+            minY = y
+        if y > maxY:
+            maxY = y
+        chunk.append(pointFormat % transform(x, y))
+        pointFormat = format
+        if len(chunk) == writeChunk:
+            file.write(''.join(chunk))
+            chunk = []
+    file.write(''.join(chunk))
+    return minX, minY, maxX, maxY
+
+
+def _writeLines(file, lines, format, transform):
+    '''
+    formats the ((x1, y1), (x2, y2)) lines in chunks and writes them in one pass
+
+    returns the number of lines written
+    '''
+    count = 0
+    chunk = []
+    for (x1, y1), (x2, y2) in lines:
+        chunk.append(format % (transform(x1, y1) + transform(x2, y2)))
+        count += 1
+        if len(chunk) == writeChunk:
+            file.write(''.join(chunk))
+            chunk = []
+    file.write(''.join(chunk))
+    return count
+
+
+class SvgWriter:
+    '''
+    writes closed outlines and labels into an svg file
+
+    the document size is written as a fixed width placeholder first and filled
+    in by close(), so the file can be streamed without knowing all panels.
+    Coordinates passed in are in cm with y pointing up, they are written with
+    y pointing down and the document is moved into view by its height.
+    '''
+
+    # width of the placeholder fields of the document size
+    _sizeField = 14
+
+    def __init__(self, file):
+        self.file = file
+        self.width = 0.0
+        self.height = 0.0
+        self.file.write(self._headerLine(0.0, 0.0))
+        self.file.write('<desc>laser cut case, %s: cut, %s: engrave</desc>\n'
+                        % (svgColours[cutLayer], svgColours[engraveLayer]))
+
+    def _headerLine(self, width, height):
+        sizeX = ('%.3f' % (width * unitScale)).zfill(self._sizeField)
+        sizeY = ('%.3f' % (height * unitScale)).zfill(self._sizeField)
+        return ('<svg xmlns="http://www.w3.org/2000/svg" width="%smm" height="%smm" viewBox="0 0 %s %s">'
+                '<g transform="translate(0 %s)">\n' % (sizeX, sizeY, sizeX, sizeY, sizeY))
+
+    def _y(self, y):
+        return -y * unitScale
+
+    @staticmethod
+    def _transform(x, y):
+        return x * unitScale, -y * unitScale
+
+    def addOutline(self, points, name=None):
+        '''
+        writes a closed outline, points in cm, they are run through once
+        '''
+        self.file.write('<g>\n')
+        self.file.write('<path fill="none" stroke="%s" stroke-width="0.1" d="' % svgColours[cutLayer])
+        minX, minY, maxX, maxY = _writePoints(self.file, points, 'M%.4f,%.4f', ' L%.4f,%.4f', self._transform)
+        self.file.write(' Z"/>\n')
+        self.width = max(self.width, maxX)
+        self.height = max(self.height, maxY)
+        if name:
+            cx = (minX + maxX) / 2
+            cy = (minY + maxY) / 2
+            self.file.write('<text x="%.4f" y="%.4f" fill="%s" font-size="%.1f" text-anchor="middle">%s</text>\n'
+                            % (cx * unitScale, self._y(cy), svgColours[engraveLayer], labelHeight, escape(name)))
+        self.file.write('</g>\n')
+
+    def addLines(self, lines):
+        '''
+        writes open lines (e.g. the slits of a living hinge) as a single path,
+        points in cm, the lines are run through once
+        '''
+        lines = iter(lines)
+        first = next(lines, None)
+        if first == None:
+            return
+        self.file.write('<path fill="none" stroke="%s" stroke-width="0.1" d="' % svgColours[cutLayer])
+        _writeLines(self.file, itertools.chain([first], lines), 'M%.4f,%.4f L%.4f,%.4f ', self._transform)
+        self.file.write('"/>\n')
+
+    def close(self):
+        self.file.write('</g>\n</svg>\n')
+        if self.file.seekable():
+            self.file.seek(0)
+            self.file.write(self._headerLine(self.width, self.height))
+
+
+class DxfWriter:
+    '''
+    writes closed outlines and labels into an ascii dxf file (R12)
+
+    coordinates passed in are in cm
+    '''
+
+    def __init__(self, file):
+        self.file = file
+        self._write(0, 'SECTION', 2, 'HEADER', 9, '$ACADVER', 1, 'AC1009', 9, '$INSUNITS', 70, 4, 0, 'ENDSEC')
+        self._write(0, 'SECTION', 2, 'TABLES', 0, 'TABLE', 2, 'LAYER', 70, len(dxfColours))
+        for layer, colour in dxfColours.items():
+            self._write(0, 'LAYER', 2, layer, 70, 0, 62, colour, 6, 'CONTINUOUS')
+        self._write(0, 'ENDTAB', 0, 'ENDSEC')
+        self._write(0, 'SECTION', 2, 'ENTITIES')
+
+    def _write(self, *pairs):
+        self.file.write(''.join('%d\n%s\n' % (pairs[i], pairs[i + 1]) for i in range(0, len(pairs), 2)))
+
+    @staticmethod
+    def _transform(x, y):
+        return x * unitScale, y * unitScale
+
+    def addOutline(self, points, name=None):
+        '''
+        writes a closed outline, points in cm, they are run through once
+        '''
+        self._write(0, 'POLYLINE', 8, cutLayer, 66, 1, 70, 1, 10, 0.0, 20, 0.0, 30, 0.0)
+        # one format string per vertex, outlines have hundreds of them
+        vertex = '0\nVERTEX\n8\n%s\n10\n%%.4f\n20\n%%.4f\n30\n0.0\n' % cutLayer
+        minX, minY, maxX, maxY = _writePoints(self.file, points, vertex, vertex, self._transform)
+        self._write(0, 'SEQEND', 8, cutLayer)
+        if name:
+            self._write(0, 'TEXT', 8, engraveLayer,
+                        10, '%.4f' % ((minX + maxX) / 2 * unitScale), 20, '%.4f' % ((minY + maxY) / 2 * unitScale),
+                        30, 0.0, 40, labelHeight, 1, name, 72, 1,
+                        11, '%.4f' % ((minX + maxX) / 2 * unitScale), 21, '%.4f' % ((minY + maxY) / 2 * unitScale),
+                        31, 0.0)
+
+    def addLines(self, lines):
+        '''
+        writes open lines (e.g. the slits of a living hinge), points in cm, the
+        lines are run through once
+        '''
+        line = '0\nLINE\n8\n%s\n10\n%%.4f\n20\n%%.4f\n30\n0.0\n11\n%%.4f\n21\n%%.4f\n31\n0.0\n' % cutLayer
+        _writeLines(self.file, lines, line, self._transform)
+
+    def close(self):
+        self._write(0, 'ENDSEC', 0, 'EOF')
+
+
+def exportOutlines(outlines, path, kerf=0.0, labels=True):
+    '''
+    writes placed outlines into a cut file
+
+    outlines is an iterable of (name, points) or (name, points, cuts) tuples
+    with the points in cm, e.g. Nesting.Sheet.outlines(). The outlines, their
+    points and cuts can be generators, each is only run through once. cuts are
+    lines inside the outline, they are cut as they are.
+    path ends with .svg or .dxf
+    kerf is the width of the laser cut in cm, it has to be 0 for outlines that
+    are already compensated, e.g. the panels of a case with a kerf
+    labels is a bool and engraves the names
+
+    returns the number of outlines written
+    '''
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.svg':
+        writerClass = SvgWriter
+    elif extension == '.dxf':
+        writerClass = DxfWriter
+    else:
+        raise Exception('unknown cut file type %s, use .svg or .dxf' % extension)
+
+    count = 0
+    with open(path, 'w', newline='\n') as file:
+        writer = writerClass(file)
+        for item in outlines:
+            writer.addOutline(cutOutline(item[1], kerf), item[0] if labels else None)
+            if len(item) > 2:
+                writer.addLines(item[2])
+            count += 1
+        writer.close()
+    return count
+
+
+def exportPanels(panels, path, kerf=0.0, spacing=0.5, labels=True):
+    '''
+    writes the panels side by side into a cut file
+
+    panels is an iterable of CaseGeometry.Panel objects, it is only run through once
+    kerf is the width of the laser cut in cm. It is only applied to panels
+    without kerf compensation (panel.kerf of 0), the panels of a case with a
+    kerf are already compensated and written as they are.
+    spacing is the gap between the panels in cm
+
+    returns the number of panels written
+    '''
+    def placedOutlines():
+        offsetX = 0.0
+        for panel in panels:
+            panelKerf = kerf if panel.kerf == 0 else 0.0
+            # the written outline is grown by half the kerf on every side
+            grow = panel.kerf + panelKerf
+            dx = offsetX + grow / 2
+            dy = grow / 2
+            yield (panel.name, cutOutline(((x + dx, y + dy) for x, y in panel.iterOutline()), panelKerf),
+                   (((x1 + dx, y1 + dy), (x2 + dx, y2 + dy)) for (x1, y1), (x2, y2) in panel.iterCuts()))
+            offsetX += panel.width + grow + spacing
+
+    return exportOutlines(placedOutlines(), path, labels=labels)
@@ -27,9 +27,12 @@
 
 import adsk.core
 import adsk.fusion
+import itertools
 import math
 import traceback
 
+from .VectorMath import PointArray, tangentArcMidpoints
+
 
 class BaseClass():
     def __init__(self):
@@ -52,9 +55,21 @@ class EZFusionAPI:
         self.Patterns = PatteringOperations()
         self.EZSketch = EZSketch
         self.EZFeatures = EZFeatures
+        self._userParamCache = {}
+
+    def create_NewComponent(self, name=None, transform=None, parent=None):
+        '''
+        creates a new component
 
-    def create_NewComponent(self, name=None):
-        comp = self.__base__.rootComp.occurrences.addNewComponent(adsk.core.Matrix3D.create()).component
+        name is a string which sets the name of the component
+        transform is a Matrix3D object which places the occurrence of the component
+        parent is the component to create the new component in, defaults to the root component
+        '''
+        if transform == None:
+            transform = adsk.core.Matrix3D.create()
+        if parent == None:
+            parent = self.__base__.rootComp
+        comp = parent.occurrences.addNewComponent(transform).component
         if not name == None:
             comp._set_name(name)
         return comp
@@ -62,6 +77,66 @@ class EZFusionAPI:
     def set_ComponentName(self, component, name):
         component._set_name(name)
 
+    def get_Component(self, name):
+        '''
+        returns the component of the design with the name or None
+        '''
+        return self.__base__.design.allComponents.itemByName(name)
+
+    def create_Occurrence(self, component, transform=None, parent=None):
+        '''
+        places another occurrence of an existing component
+
+        transform is a Matrix3D object which places the occurrence
+        parent is the component to place the occurrence in, defaults to the root component
+
+        returns the occurrence
+        '''
+        if transform == None:
+            transform = adsk.core.Matrix3D.create()
+        if parent == None:
+            parent = self.__base__.rootComp
+        return parent.occurrences.addExistingComponent(component, transform)
+
+    def get_Occurrence(self, component, parent=None):
+        '''
+        returns the first occurrence of a component in parent or None
+
+        parent is a component, defaults to the root component
+        '''
+        if parent == None:
+            parent = self.__base__.rootComp
+        occurrences = parent.occurrencesByComponent(component)
+        if occurrences.count == 0:
+            return None
+        return occurrences.item(0)
+
+    def get_Occurrences(self, component, parent=None):
+        '''
+        returns a list of all occurrences of a component in parent
+
+        parent is a component, defaults to the root component
+        '''
+        if parent == None:
+            parent = self.__base__.rootComp
+        occurrences = parent.occurrencesByComponent(component)
+        return [occurrences.item(i) for i in range(occurrences.count)]
+
+    def set_Attribute(self, entity, groupName, name, value):
+        '''
+        stores a string value in the design on entity (a component, the design, ...)
+        '''
+        return entity.attributes.add(groupName, name, value)
+
+    def get_Attribute(self, entity, groupName, name):
+        '''
+        returns the string value stored on entity or None
+        '''
+        attribute = entity.attributes.itemByName(groupName, name)
+        if attribute == None:
+            return None
+        return attribute.value
+
     def create_UserParameter(self, name, expression, units=None, comment=None, favorite=False):
         '''
         Automates the Process of adding a User Parameter to Fusion 360
@@ -84,33 +159,66 @@ class EZFusionAPI:
         if not isinstance(expression, str):
             expression = str(expression)
 
-        self.getUserParameterNames()
-        if name in self._userParamDict:
-            up = self.__base__.design.userParameters.item(self._userParamDict[name])
-            up._set_expression(expression)
+        up = self.get_UserParameter(name)
+        if up != None:
+            # setting an expression recomputes the design, so only set changed ones
+            if up.expression != expression:
+                up._set_expression(expression)
         else:
             userValue = self.__base__.core.ValueInput.createByString(expression)
             up = self.__base__.design.userParameters.add(name, userValue, units, comment)
-            # up._set_expression(expression)
-            self.getUserParameterNames()
+            self._userParamCache[name] = up
 
         if favorite:
             up.isFavorite = True
         return up
 
+    def create_UserParameters(self, parameters, units=None, comment=None, favorite=False):
+        '''
+        adds or modifies many User Parameters in one pass
+
+        parameters is a dictionary with the parameter names as keys and the
+        expressions as values, units, comment and favorite are applied to all
+        parameters (see create_UserParameter)
+
+        returns a dictionary with the parameter names as keys and the
+        userParameter objects as values
+        '''
+        return dict((name, self.create_UserParameter(name, expression, units=units, comment=comment,
+                                                     favorite=favorite))
+                    for name, expression in parameters.items())
+
+    def get_UserParameter(self, name):
+        '''
+        returns the userParameter object with the name or None
+
+        the parameters are looked up by name once and cached, so the
+        parameter collection is never iterated
+        '''
+        if name not in self._userParamCache:
+            up = self.__base__.design.userParameters.itemByName(name)
+            if up == None:
+                return None
+            self._userParamCache[name] = up
+        return self._userParamCache[name]
+
     def getUserParameterNames(self):
         '''
         returns a dictionary listing the user Parameter names as keys
         and the item number as values
+
+        note: this iterates the whole parameter collection, use get_UserParameter
+        to look up single parameters
         '''
         existingParameters = self.__base__.design.userParameters
         paramNameDict = {}
         for i in range(existingParameters.count):
             paramNameDict[existingParameters.item(i).name] = i
         self._userParamDict = paramNameDict
+        return paramNameDict
 
     def get_UserParameterValue(self, name):
-        return self.__base__.design.userParameters.item(self._userParamDict[name]).value
+        return self.get_UserParameter(name).value
 
     def create_Point3d(self, x, y, z=0):
         return adsk.core.Point3D.create(x, y, z)
@@ -153,6 +261,7 @@ class EZSketch:
         self.set = Sketch_Set(self)
         self.get = Sketch_Get(self)
         self.vector = Sketch_Vector(self)
+        self.batch = Sketch_Batch(self)
 
     def _create_Sketch(self, name=None, visibility=True, startCurveConstruction=False):
         '''
@@ -190,6 +299,83 @@ class EZSketch:
         return success
 
 
+class Sketch_Batch():
+    '''
+    subclass of EZSketch that suspends the sketch solve while it is entered
+
+        with ezSketch.batch:
+            ezSketch.create.line((0, 0), (1, 0))
+            ezSketch.batch.geometric([line1, line2], 'perp')
+
+    all geometry created inside the block is solved once on exit, constraints
+    and dimensions added through the batch are queued and applied on exit
+    after all geometry exists. Blocks can be nested, only the outermost block
+    flushes.
+
+    operations is the number of sketch operations coalesced into the last batch
+    '''
+
+    def __init__(self, parent):
+        self.__parent__ = parent
+        self.operations = 0
+        self._depth = 0
+        self._queue = []
+        self._wasDeferred = False
+
+    @property
+    def active(self):
+        return self._depth > 0
+
+    def __enter__(self):
+        if self._depth == 0:
+            sketch = self.__parent__.sketch
+            self._wasDeferred = sketch.isComputeDeferred
+            sketch.isComputeDeferred = True
+            self.operations = 0
+            self._queue = []
+        self._depth += 1
+        return self
+
+    def __exit__(self, excType, excValue, tb):
+        if self._depth > 1:
+            self._depth -= 1
+            return False
+        try:
+            if excType is None:
+                self.flush()
+        finally:
+            self._depth = 0
+            self._queue = []
+            self.__parent__.sketch.isComputeDeferred = self._wasDeferred
+        return False
+
+    def geometric(self, objects, constraintType):
+        '''
+        queues a geometric constraint, see Sketch_Constrain.geometric
+        '''
+        self._queue.append((self.__parent__.constrain.geometric, (objects, constraintType), {}))
+
+    def dimension(self, objects, **kwargs):
+        '''
+        queues a dimension, see Sketch_Constrain.dimension for the keyword arguments
+        '''
+        self._queue.append((self.__parent__.constrain.dimension, (objects,), kwargs))
+
+    def flush(self):
+        '''
+        applies all queued constraints and dimensions
+
+        returns a list of the created constraint and dimension objects
+        '''
+        queue = self._queue
+        self._queue = []
+        return [method(*args, **kwargs) for method, args, kwargs in queue]
+
+    def _record(self, count=1):
+        if self._depth > 0:
+            self.operations += count
+
+
 class Sketch_Get():
     '''
     subclass of EZSketch that containts all the get methods
@@ -241,8 +427,13 @@ class Sketch_Get():
         checks to see if a point in in a list of points
         pt is a sketchPoint or Point3d object or tuple of coordinates
         ptList is a python List of points where every element is either
-        a sketchPoint or Point3d object or tuple of coordinates
+        a sketchPoint or Point3d object or tuple of coordinates, or a PointIndex
+
+        note: use a PointIndex for repeated lookups, checking a list is linear
+        in the length of the list
         '''
+        if isinstance(ptList, PointIndex):
+            return pt in ptList
 
         pt = self.point3d(pt)
         if len(ptList) == 0:
@@ -253,6 +444,20 @@ class Sketch_Get():
                 return True
         return False
 
+    def pointIndex(self, ptList=None):
+        '''
+        creates a PointIndex with the tolerance of the sketch
+
+        ptList is an optional python List of points to add to the index
+
+        returns a PointIndex
+        '''
+        index = PointIndex(self.__parent__.__base__.smallNumber)
+        if ptList != None:
+            for pt in ptList:
+                index.add(pt)
+        return index
+
     def slopeBetweenPoints(self, pt1, pt2):
         '''
         calculates the slope of a line between two points
@@ -302,17 +507,11 @@ class Sketch_Get():
         makes sure pt is a point3d object
         
         pt can be a point3D object or SketchPoint object or a tuple of coordinates
+
+        note: use Utils.ingestPoints to convert a whole list of points
         '''
         if type(pt) is tuple:
-            for i in pt:
-                if not isinstance(pt[i], (int, float)):
-                    raise Exception('tuple elements must be numbers')
-            if len(pt) == 2:
-                return adsk.core.Point3D.create(pt[0], pt[1], 0)
-            elif len(pt) == 3:
-                return adsk.core.Point3D.create(pt[0], pt[1], pt[2])
-            else:
-                raise Exception('tuple must be of length 2 or 3')
+            return self.__parent__.__base__.Utils.tuple2Point3d(pt)
 
         elif type(pt) is adsk.core.Point3D or type(pt) is adsk.fusion.SketchPoint:
             try:
@@ -368,6 +567,12 @@ class Sketch_Get():
 
 
 class Sketch_Vector():
+    '''
+    subclass of EZSketch that contains vector math on single vectors
+
+    note: VectorMath has the same operations for whole lists of points
+    '''
+
     def __init__(self, parent):
         self.__parent__ = parent
 
@@ -393,20 +598,24 @@ class Sketch_Vector():
         
         returns a vector
         '''
-        pt1 = self.__parent__.get.point3d(pt1)
-        pt2 = self.__parent__.get.point3d(pt2)
-
-        pt1x = pt1.x
-        pt1y = pt1.y
-
-        pt2x = pt2.x
-        pt2y = pt2.y
+        pt1x, pt1y = self._xy(pt1)
+        pt2x, pt2y = self._xy(pt2)
 
         dx = pt2x - pt1x
         dy = pt2y - pt1y
 
         return dx, dy
 
+    def _xy(self, pt):
+        '''
+        returns the x and y coordinate of a point, tuples are used as they are
+        so no Point3D object is created for them
+        '''
+        if type(pt) is tuple:
+            return pt[0], pt[1]
+        pt = self.__parent__.get.point3d(pt)
+        return pt.x, pt.y
+
     def magnitude(self, vect):
         '''
         returns the magnitude of a vector
@@ -517,12 +726,84 @@ class Sketch_Constrain():
     subclass of EZSketch that contains all of the methods to constrain sketch elements
     '''
 
+    # geometric constraint types, every lower case alias maps to the name of the
+    # GeometricConstraints method and the number of objects it takes. Horizontal
+    # and vertical depend on the objects and map to a method of this class.
+    _geometricTypes = {
+        'horizontal': ('_horizontal', None), 'h': ('_horizontal', None),
+        'vertical': ('_vertical', None), 'v': ('_vertical', None),
+        'coincident': ('addCoincident', 2), 'coin': ('addCoincident', 2),
+        'collinear': ('addCollinear', 2), 'colinear': ('addCollinear', 2), 'col': ('addCollinear', 2),
+        'midpoint': ('addMidPoint', 2), 'mid': ('addMidPoint', 2), 'mp': ('addMidPoint', 2),
+        'parallel': ('addParallel', 2), 'par': ('addParallel', 2),
+        'perpendicular': ('addPerpendicular', 2), 'perp': ('addPerpendicular', 2),
+        'concentric': ('addConcentric', 2), 'con': ('addConcentric', 2),
+        'symmetry': ('addSymmetry', 3), 'sym': ('addSymmetry', 3),
+        'tangent': ('addTangent', 2), 'tan': ('addTangent', 2),
+        'smooth': ('addSmooth', 2), 's': ('addSmooth', 2),
+    }
+
+    # dimension types, every lower case alias maps to the method adding the dimension
+    _dimensionTypes = {
+        'distance': '_distanceDimension', 'd': '_distanceDimension',
+        'angular': '_angularDimension', 'a': '_angularDimension',
+        'radial': '_radialDimension', 'r': '_radialDimension',
+        'diameter': '_diameterDimension', 'dia': '_diameterDimension',
+        'concentric': '_concentricDimension', 'c': '_concentricDimension',
+        'offset': '_offsetDimension', 'o': '_offsetDimension',
+    }
+
     def __init__(self, parent):
         self.__parent__ = parent
         self._orientAligned = adsk.fusion.DimensionOrientations.AlignedDimensionOrientation
         self._orientHorizontal = adsk.fusion.DimensionOrientations.HorizontalDimensionOrientation
         self._orientVertical = adsk.fusion.DimensionOrientations.VerticalDimensionOrientation
+        self._orientations = {'horizontal': self._orientHorizontal, 'h': self._orientHorizontal,
+                              'vertical': self._orientVertical, 'v': self._orientVertical}
         self._noSketchMessage = 'no sketch defined, use createSketch() to define a sketch'
+        # handlers by the constraint type as passed in, filled on first use
+        self._geometricHandlers = {}
+
+    def _geometricHandler(self, constraintType):
+        '''
+        returns the function adding a geometric constraint of a type, the
+        function takes the list of objects
+        '''
+        handler = self._geometricHandlers.get(constraintType)
+        if handler != None:
+            return handler
+        entry = self._geometricTypes.get(constraintType.lower())
+        if entry == None:
+            raise Exception('Did Not Recognize Constraint Type %s' % constraintType)
+        name, count = entry
+        if count == None:
+            handler = getattr(self, name)
+        else:
+            add = getattr(self.__parent__._constraints, name)
+            if count == 2:
+                handler = lambda objects: add(objects[0], objects[1])
+            else:
+                handler = lambda objects: add(objects[0], objects[1], objects[2])
+        self._geometricHandlers[constraintType] = handler
+        return handler
+
+    def _horizontal(self, objects):
+        if len(objects) == 2:
+            if type(objects[0]) is adsk.fusion.SketchPoint and \
+                    type(objects[1]) is adsk.fusion.SketchPoint:
+                return self.__parent__._constraints.addHorizontalPoints(objects[0], objects[1])
+
+        if len(objects) == 1 and type(objects[0]) is adsk.fusion.SketchLine:
+            return self.__parent__._constraints.addHorizontal(objects[0])
+
+    def _vertical(self, objects):
+        if len(objects) == 2:
+            if type(objects[0]) is adsk.fusion.SketchPoint and \
+                    type(objects[1]) is adsk.fusion.SketchPoint:
+                return self.__parent__._constraints.addVerticalPoints(objects[0], objects[1])
+
+        if len(objects) == 1 and type(objects[0]) is adsk.fusion.SketchLine:
+            return self.__parent__._constraints.addVertical(objects[0])
 
     def geometric(self, objects, constraintType):
         '''
@@ -541,59 +822,34 @@ class Sketch_Constrain():
         -Symmetry of Sym for symmetry
         -Smooth or S for smooth
         '''
+        self.__parent__.batch._record()
         if type(objects) is not list:
             objects = [objects]
-        constraintType = constraintType.lower()
-        if (constraintType == "horizontal" or \
-                constraintType == "h"):
-
-            if len(objects) == 2:
-                if type(objects[0]) is adsk.fusion.SketchPoint and \
-                        type(objects[1]) is adsk.fusion.SketchPoint:
-                    return self.__parent__._constraints.addHorizontalPoints(objects[0], objects[1])
-
-            if len(objects) == 1 and type(objects[0]) is adsk.fusion.SketchLine:
-                return self.__parent__._constraints.addHorizontal(objects[0])
-
-        if (constraintType == "vertical" or \
-                constraintType == "v"):
-
-            if len(objects) == 2:
-                if type(objects[0]) is adsk.fusion.SketchPoint and \
-                        type(objects[1]) is adsk.fusion.SketchPoint:
-                    self.__parent__._constraints.addVerticalPoints(objects[0], objects[1])
+        return self._geometricHandler(constraintType)(objects)
 
-            if len(objects) == 1 and type(objects[0]) is adsk.fusion.SketchLine:
-                return self.__parent__._constraints.addVertical(objects[0])
-
-        if constraintType == "coincident" or constraintType == "coin":
-            if isinstance(objects[0], adsk.fusion.SketchCurve) and isinstance(objects[0], adsk.fusion.SketchCurve):
-                pass  # do find intersection and get points and then pass them in
-            return self.__parent__._constraints.addCoincident(objects[0], objects[1])
-
-        if constraintType == "colinear" or constraintType == "col":
-            return self.__parent__._constraints.addCollinear(objects[0], objects[1])
-
-        if constraintType == "midpoint" or constraintType == "mp":
-            return self.__parent__._constraints.addMidPoint(objects[0], objects[1])
-
-        if constraintType == "parallel" or constraintType == "par":
-            return self.__parent__._constraints.addParallel(objects[0], objects[1])
-
-        if constraintType == "perpendicular" or constraintType == "perp":
-            return self.__parent__._constraints.addPerpendicular(objects[0], objects[1])
-
-        if constraintType == "concentric" or constraintType == "con":
-            return self.__parent__._constraints.addConcentric(objects[0], objects[1])
-
-        if constraintType == "symmetry" or constraintType == "sym":
-            return self.__parent__._constraints.addSymmetry(objects[0], objects[1], objects[2])
+    def apply_Constraints(self, constraints):
+        '''
+        adds many geometric constraints at once
 
-        if constraintType == "tangent" or constraintType == "tan":
-            return self.__parent__._constraints.addTangent(objects[0], objects[1])
+        constraints is a list of (constraintType, objects) tuples, see geometric()
+        for the constraint types. Every constraint type is looked up once for the
+        whole list and the sketch is solved once after all constraints are added.
 
-        if constraintType == "smooth" or constraintType == "s":
-            return self.__parent__._constraints.addSmooth(objects[0], objects[1])
+        returns a list of the created constraints
+        '''
+        batch = self.__parent__.batch
+        handlers = {}
+        result = []
+        with batch:
+            for constraintType, objects in constraints:
+                handler = handlers.get(constraintType)
+                if handler == None:
+                    handler = handlers[constraintType] = self._geometricHandler(constraintType)
+                if type(objects) is not list:
+                    objects = [objects]
+                batch._record()
+                result.append(handler(objects))
+        return result
 
     def dimension(self, objects, dimensionType=None, expression=None, value=None, txtPt=None, orientation="Aligned"):
         '''
@@ -602,7 +858,7 @@ class Sketch_Constrain():
         -Distance or d for distance dimension
         -angular or a for angluar dimension
         -radial or r for radial dimension
-        -diameter or d for diameter dimension
+        -diameter or dia for diameter dimension
         -concentric or c for concentric dimension
         -offset or o for offset dimension
         
@@ -612,6 +868,7 @@ class Sketch_Constrain():
         txtPt is a point3D object to set the text point of the dimension to a value
         orientation is specified for distance dimensions "Horizontal" ("h"), "Vertical" ("v"), or "Aligned" ("a")
         '''
+        self.__parent__.batch._record()
         if type(objects) is not list:
             objects = [objects]
 
@@ -622,7 +879,6 @@ class Sketch_Constrain():
             obj1 = objects[0]
             obj2 = objects[1]
 
-        orientation = orientation.lower()
         errMsg1 = 'Unable to Determine Dimension Type Automatically, Please specify dimensionType parameter'
         if dimensionType == None:
             if obj2 == None:
@@ -631,8 +887,7 @@ class Sketch_Constrain():
                 elif type(obj1) is adsk.fusion.SketchCircle:
                     dimensionType = 'dia'
                 elif type(obj1) is adsk.fusion.SketchLine:
-                    obj1 = obj1.startSketchPoint
-                    obj2 = obj1.endSketchPoint
+                    obj1, obj2 = obj1.startSketchPoint, obj1.endSketchPoint
                     dimensionType = 'd'
                 else:
                     raise Exception(errMsg1)
@@ -657,53 +912,51 @@ class Sketch_Constrain():
                 else:
                     raise Exception(errMsg1)
 
-        dimensionType = dimensionType.lower()
+        name = self._dimensionTypes.get(dimensionType.lower())
+        if name == None:
+            raise Exception('Did Not Recognize Dimension Type')
+        dimObj = getattr(self, name)(obj1, obj2, txtPt, orientation)
 
-        if dimensionType == "distance" or dimensionType == "d":
-            if orientation == "horizontal" or orientation == "h":
-                dimOrientation = self._orientHorizontal
-            elif orientation == "vertical" or orientation == "v":
-                dimOrientation = self._orientVertical
-            else:
-                dimOrientation = self._orientAligned
-            dimObj = self.__parent__._dims.addDistanceDimension(obj1, obj2, dimOrientation,
-                                                                self._handleTxtPt(txtPt, obj1, obj2))
+        return self._handleDimObjExpressionOrValue(dimObj, expression, value)
 
-        elif dimensionType == "angular" or dimensionType == "a":
-            dimObj = self.__parent__._dims.addAngularDimension(obj1, obj2, self._handleTxtPt(txtPt, obj1.endSketchPoint,
-                                                                                             obj2.endSketchPoint))
+    def _distanceDimension(self, obj1, obj2, txtPt, orientation):
+        dimOrientation = self._orientations.get(orientation.lower(), self._orientAligned)
+        return self.__parent__._dims.addDistanceDimension(obj1, obj2, dimOrientation,
+                                                          self._handleTxtPt(txtPt, obj1, obj2))
 
-        elif dimensionType == "radial" or dimensionType == "r":
-            dimObj = self.__parent__._dims.addRadialDimension(obj1, self._handleTxtPt(txtPt, obj1.startSketchPoint,
-                                                                                      obj1.endSketchPoint))
+    def _angularDimension(self, obj1, obj2, txtPt, orientation):
+        return self.__parent__._dims.addAngularDimension(obj1, obj2, self._handleTxtPt(txtPt, obj1.endSketchPoint,
+                                                                                       obj2.endSketchPoint))
 
-        elif dimensionType == "diameter" or dimensionType == "dia":
-            if txtPt == None:
-                txtPt = obj1.centerSketchPoint.geometry
-            else:
-                radius = obj1.radius
-                txtPt = obj1.centerSketchPoint.geometry
-                txtPt.x += radius * 1.1
-                txtPt.y += radius * 1.1
-            dimObj = self.__parent__._dims.addDiameterDimension(obj1, txtPt)
-        elif dimensionType == "concentric" or dimensionType == "c":
+    def _radialDimension(self, obj1, obj2, txtPt, orientation):
+        return self.__parent__._dims.addRadialDimension(obj1, self._handleTxtPt(txtPt, obj1.startSketchPoint,
+                                                                                obj1.endSketchPoint))
+
+    def _diameterDimension(self, obj1, obj2, txtPt, orientation):
+        if txtPt == None:
             txtPt = obj1.centerSketchPoint.geometry
-            r1 = obj1.radius
-            r2 = obj2.radius
-            aveR = (r1 + r2) / 2
-            txtPt.x += aveR * 1.1
-            txtPt.y += aveR * 1.1
-            dimObj = self.__parent__._dims.addConcentricCircleDimension(obj1, obj2, txtPt)
-        elif dimensionType == 'offset' or dimensionType == 'o':
-            if type(obj2) is adsk.fusion.SketchPoint:
-                txtPt = self._handleTxtPt(txtPt, obj1.startSketchPoint, obj2)
-            dimObj = self.__parent__._dims.addOffsetDimension(obj1, obj2,
-                                                              self._handleTxtPt(txtPt, obj1.startSketchPoint,
-                                                                                obj2.startSketchPoint))
         else:
-            raise Exception('Did Not Recognize Dimension Type')
-
-        return self._handleDimObjExpressionOrValue(dimObj, expression, value)
+            radius = obj1.radius
+            txtPt = obj1.centerSketchPoint.geometry
+            txtPt.x += radius * 1.1
+            txtPt.y += radius * 1.1
+        return self.__parent__._dims.addDiameterDimension(obj1, txtPt)
+
+    def _concentricDimension(self, obj1, obj2, txtPt, orientation):
+        txtPt = obj1.centerSketchPoint.geometry
+        r1 = obj1.radius
+        r2 = obj2.radius
+        aveR = (r1 + r2) / 2
+        txtPt.x += aveR * 1.1
+        txtPt.y += aveR * 1.1
+        return self.__parent__._dims.addConcentricCircleDimension(obj1, obj2, txtPt)
+
+    def _offsetDimension(self, obj1, obj2, txtPt, orientation):
+        if type(obj2) is adsk.fusion.SketchPoint:
+            txtPt = self._handleTxtPt(txtPt, obj1.startSketchPoint, obj2)
+        return self.__parent__._dims.addOffsetDimension(obj1, obj2,
+                                                        self._handleTxtPt(txtPt, obj1.startSketchPoint,
+                                                                          obj2.startSketchPoint))
 
     def _handleDimObjExpressionOrValue(self, dimObj, expression, value):
         if not expression == None:
@@ -746,6 +999,7 @@ class Sketch_Create():
             raise Exception("Type Error")
         if fixed:
             pt.isFixed = True
+        self.__parent__.batch._record()
         return pt
 
     def line(self, pt1, pt2, construction=False, fixed=False):
@@ -760,19 +1014,20 @@ class Sketch_Create():
         returns a sketchLine object
         '''
         if type(pt1) is tuple:
-            pt1 = self.point3d(pt1)
+            pt1 = self.__parent__.__base__.Utils.tuple2Point3d(pt1)
 
         if type(pt2) is tuple:
-            pt2 = self.point3d(pt2)
+            pt2 = self.__parent__.__base__.Utils.tuple2Point3d(pt2)
 
         line = self.__parent__._lines.addByTwoPoints(pt1, pt2)
         if construction:
             line._set_isConstruction(True)
         if fixed:
             line.isFixed = True
+        self.__parent__.batch._record()
         return line
 
-    def curveChain(self, pointList, close=None):
+    def curveChain(self, pointList, close=None, bulk=False):
         '''
         Creates a chain of lines/arcs from a list of points.
         Behaves exactly like the create arc by click and drag.
@@ -781,33 +1036,33 @@ class Sketch_Create():
         
         pointList is a python list containing tuples containing numbers
         representing point coordinates, sketchPoint object, or point3D object
+        bulk is a bool, a chain without arcs is then created by polyline, which
+        connects the lines by their sketch points instead of fixing the points
+        and adding coincident constraints
         
         returns a list of the created sketchCurvs in the order they were created
         in the chain
         '''
-        pts = self._handleObjectsChecks(pointList)
-        ptList = []
-        cmdList = []
-        PI = self.__parent__.__base__._pi
+        if bulk and not any(type(pt) is str for pt in pointList) and close not in ('a', 'arc'):
+            return self.polyline(pointList, close=close != None)
 
-        for i in range(len(pts) - 1):
-            if type(pts[i]) is adsk.core.Point3D:
-                ptList.append(pts[i])
-                if type(pts[i + 1]) is str:
-                    if pts[i + 1].lower() == 'a' or pts[i + 1].lower() == 'arc':
+        # the chain is computed on compact coordinates, Point3D objects are only
+        # created for the curves
+        ptList = self.__parent__.__base__.Utils.ingestPoints([pt for pt in pointList if type(pt) is not str],
+                                                             compact=True)
+        cmdList = []
+        for i in range(len(pointList) - 1):
+            if type(pointList[i]) is not str:
+                if type(pointList[i + 1]) is str:
+                    if pointList[i + 1].lower() == 'a' or pointList[i + 1].lower() == 'arc':
                         cmdList.append('a')
                     else:
                         cmdList.append('l')
-                elif type(pts[i]) is adsk.core.Point3D:
-                    cmdList.append('l')
                 else:
-                    raise Exception('pointList item type is invalid')
-
-        if type(pts[-1]) is adsk.core.Point3D:
-            ptList.append(pts[-1])
+                    cmdList.append('l')
 
         if close != None:
-            ptList.append(pts[0])
+            ptList.append(ptList[0])
             if close == 'a' or close == 'arc':
                 cmdList.append('a')
             else:
@@ -817,142 +1072,164 @@ class Sketch_Create():
         if cmdList[0] != 'l':
             raise Exception('First geterated element must be a line')
 
-        fixedPtList = []
+        fixedPtList = self.__parent__.get.pointIndex()
         prevLine = None
         for i, cmd in enumerate(cmdList):
             if cmd == 'l':
                 pt1 = ptList[i]
                 pt2 = ptList[i + 1]
-                line = self.line(pt1, pt2)
+                # the tuples were checked by ingestPoints, so the points are
+                # created directly instead of through Utils.tuple2Point3d
+                line = self.line(adsk.core.Point3D.create(pt1[0], pt1[1], 0),
+                                 adsk.core.Point3D.create(pt2[0], pt2[1], 0))
                 if not self.__parent__.get.isPointInList(pt1, fixedPtList):
                     line.startSketchPoint.isFixed = True
-                    fixedPtList.append(line.startSketchPoint)
+                    fixedPtList.add(line.startSketchPoint)
                 if not self.__parent__.get.isPointInList(pt2, fixedPtList):
                     line.endSketchPoint.isFixed = True
-                    fixedPtList.append(line.endSketchPoint)
+                    fixedPtList.add(line.endSketchPoint)
                 if i > 0 and self.__parent__.get.arePontsCoincident(line.startSketchPoint, prevLine.endSketchPoint):
                     self.__parent__.constrain.geometric([line.startSketchPoint, prevLine.endSketchPoint], 'coin')
                 crvList.append(line)
                 prevLine = line
                 if i == len(ptList) - 2 and close != None:  # case where line is the last command and close is True
-                    int1, _ = self.__parent__.get.orderCurveEndsByDist(line, ptList[0], returnSketchPoint=True)
-                    int2, _ = self.__parent__.get.orderCurveEndsByDist(crvList[0], ptList[0], returnSketchPoint=True)
+                    firstPoint = adsk.core.Point3D.create(ptList[0][0], ptList[0][1], 0)
+                    int1, _ = self.__parent__.get.orderCurveEndsByDist(line, firstPoint, returnSketchPoint=True)
+                    int2, _ = self.__parent__.get.orderCurveEndsByDist(crvList[0], firstPoint, returnSketchPoint=True)
                     self.__parent__.constrain.geometric([int1, int2], 'coin')
             else:
                 crvList.append('arc')
+        # the arcs are solved from the input points, the sketch is not queried
+        midpoints = tangentArcMidpoints(ptList, cmdList)
+        arcEnd = None
         for i, crv in enumerate(crvList):
             if crv == 'arc':
-                if i > 0 and type(crvList[i - 1]) is adsk.fusion.SketchLine:  # case where previous curve is a line
-                    # grab handle from previous line
-                    line = crvList[i - 1]
-
-                    intersectPoint = ptList[i]
-                    lineEnd, lineStart = self.__parent__.get.orderCurveEndsByDist(line, intersectPoint,
-                                                                                  returnSketchPoint=True)
-
-                    vect = self.__parent__.vector.fromPoints(lineStart, lineEnd)
-                    unitVect = self.__parent__.vector.unitVector(vect)
-                    length = self.__parent__.vector.magnitude(vect)
-                    length += self.__parent__.__base__.smallNumber * 100
-                    scaledVect = self.__parent__.vector.scaleVector(unitVect, length)
-                    guessPointOnAcr = self.__parent__.vector.addVectorAndPoint(scaledVect, lineStart)
-
-                    # get the end point of the arc
-                    if i == len(crvList) - 1:  # this is the case if an ark is the last command
-                        if close == 'arc' or close == 'a':
-                            endPoint = crvList[0].startSketchPoint
-                        else:
-                            endPoint = self.point(ptList[-1])
-                            if not self.__parent__.get.isPointInList(endPoint, fixedPtList):
-                                line.endSketchPoint.isFixed = True
-                                fixedPtList.append(endPoint)
-                    else:
-                        if type(crvList[i + 1]) is adsk.fusion.SketchLine:  # case where next element is a line
-                            endPoint = crvList[i + 1].startSketchPoint
-                        else:  # case where next element is an ark
-                            endPoint = self.point(ptList[i + 1])
-                            if not self.__parent__.get.isPointInList(endPoint, fixedPtList):
-                                endPoint.isFixed = True
-                                fixedPtList.append(endPoint)
-
-                    # create the ark based on end points and guess point
-                    arc = self.arc([lineEnd, guessPointOnAcr, endPoint], '3p')
-                    self.__parent__.constrain.geometric([arc, line], 'tan')
-                    crvList[i] = arc
-                else:  # case where previous curve is an arc
-
-                    # grab handle to previous ark
-                    prevArc = crvList[i - 1]
-                    intersectPoint = ptList[i]
-                    prevEndPt, prevStartPt = self.__parent__.get.orderCurveEndsByDist(prevArc, intersectPoint,
-                                                                                      returnSketchPoint=True)
-                    prevCntrPt = prevArc.centerSketchPoint
-
-                    # calculate a guess point on the ark that is just past the end of previous arc
-                    startVect = self.__parent__.vector.fromPoints(prevCntrPt, prevStartPt)
-                    endVect = self.__parent__.vector.fromPoints(prevCntrPt, prevEndPt)
-
-                    prevRadius = prevArc.radius
-                    prevLength = prevArc.length
-
-                    if prevLength / (PI * prevRadius * 2) > 0.5:
-                        rev = True
+                prevCurve = crvList[i - 1]
+                if type(prevCurve) is adsk.fusion.SketchLine:  # case where previous curve is a line
+                    startPoint = prevCurve.endSketchPoint
+                else:  # case where previous curve is an arc, its sketch points are not ordered along the chain
+                    startPoint = arcEnd
+
+                # get the end point of the arc
+                if i == len(crvList) - 1:  # this is the case if an ark is the last command
+                    if close == 'arc' or close == 'a':
+                        endPoint = crvList[0].startSketchPoint
                     else:
-                        rev = False
+                        endPoint = self.point(*ptList[-1])
+                        if not self.__parent__.get.isPointInList(endPoint, fixedPtList):
+                            endPoint.isFixed = True
+                            fixedPtList.add(endPoint)
+                else:
+                    if type(crvList[i + 1]) is adsk.fusion.SketchLine:  # case where next element is a line
+                        endPoint = crvList[i + 1].startSketchPoint
+                    else:  # case where next element is an ark
+                        endPoint = self.point(*ptList[i + 1])
+                        if not self.__parent__.get.isPointInList(endPoint, fixedPtList):
+                            endPoint.isFixed = True
+                            fixedPtList.add(endPoint)
+
+                x, y = midpoints[i]
+                arc = self.arc([startPoint, adsk.core.Point3D.create(x, y, 0), endPoint], '3p')
+                # the arc is created tangent, the constraint keeps it tangent
+                self.__parent__.constrain.geometric([arc, prevCurve], 'tan')
+                crvList[i] = arc
+                arcEnd = endPoint
 
-                    perpVect = self.__parent__.vector.perpendicularUnitVector(endVect)
-                    perpVect = self.__parent__.vector.scaleVector(perpVect, self.__parent__.__base__.smallNumber * 100)
-                    guessPointOnAcr1 = self.__parent__.vector.addVectorAndPoint(perpVect, prevEndPt)
+        for pt in fixedPtList:
+            pt.isFixed = False
 
-                    perpVect = self.__parent__.vector.perpendicularUnitVector(endVect)
-                    perpVect = self.__parent__.vector.scaleVector(perpVect, -1)
-                    perpVect = self.__parent__.vector.scaleVector(perpVect, self.__parent__.__base__.smallNumber * 100)
-                    guessPointOnAcr2 = self.__parent__.vector.addVectorAndPoint(perpVect, prevEndPt)
+        return crvList
 
-                    gVect1 = self.__parent__.vector.fromPoints(prevCntrPt, guessPointOnAcr1)
+    def polyline(self, pointList, close=False, construction=False, constraints=False):
+        '''
+        creates a chain of lines from a list of points in one pass
 
-                    A = self.__parent__.vector.sweptAngle(startVect, endVect)
-                    A1 = self.__parent__.vector.sweptAngle(startVect, gVect1)
+        every line starts on the end sketchPoint of the previous line, so the chain
+        is connected without fixing points or adding coincident constraints, and
+        the sketch is only solved once after the whole chain is created
 
-                    if rev:
-                        if A1 < A:
-                            guessPointOnAcr = guessPointOnAcr1
-                        else:
-                            guessPointOnAcr = guessPointOnAcr2
-                    else:
-                        if A1 > A:
-                            guessPointOnAcr = guessPointOnAcr1
-                        else:
-                            guessPointOnAcr = guessPointOnAcr2
-
-                    # get the end point of the arc
-                    if i == len(crvList) - 1:  # this is the case if an ark is the last command
-                        if close == 'arc' or close == 'a':
-                            endPoint = crvList[0].startSketchPoint
-                        else:
-                            endPoint = self.point(ptList[-1])
-                            if not self.__parent__.get.isPointInList(endPoint, fixedPtList):
-                                line.endSketchPoint.isFixed = True
-                                fixedPtList.append(endPoint)
-                    else:
-                        if type(crvList[i + 1]) is adsk.fusion.SketchLine:  # case where next element is a line
-                            endPoint = crvList[i + 1].startSketchPoint
-                        else:  # case where next element is an ark
-                            endPoint = self.point(ptList[i + 1])
-                            if not self.__parent__.get.isPointInList(endPoint, fixedPtList):
-                                endPoint.isFixed = True
-                                fixedPtList.append(endPoint)
+        pointList is a python list or any iterable (e.g. a generator) containing
+        tuples containing numbers representing point coordinates, sketchPoint
+        object, or point3D object. It is run through once and converted in
+        chunks by Utils.ingestStream.
+        close is a bool and connects the last point to the first point
+        construction is a bool and sets the construction property
+        constraints is a bool and adds horizontal and vertical constraints to
+        all axis aligned lines after the chain is created
+
+        returns a list of the created sketchLines in the order of the chain
+        '''
+        # the points are only kept for the constraints
+        pts = [] if constraints else None
+
+        with self.__parent__.batch:
+            sketchLines = self.__parent__._lines
+            lines = []
+            endPoint = None
+            for pt in self.__parent__.__base__.Utils.ingestStream(pointList):
+                if pts != None:
+                    pts.append(pt)
+                if endPoint == None:
+                    endPoint = pt
+                    continue
+                line = sketchLines.addByTwoPoints(endPoint, pt)
+                endPoint = line.endSketchPoint
+                lines.append(line)
+            if not lines:
+                raise Exception('polyline needs at least 2 points')
+            if close:
+                lines.append(sketchLines.addByTwoPoints(endPoint, lines[0].startSketchPoint))
+
+            if construction:
+                for line in lines:
+                    line.isConstruction = True
 
-                    arc = self.arc([prevEndPt, guessPointOnAcr, endPoint], '3p')
+            if constraints:
+                self._constrainAxisAligned(pts, lines, close)
+            self.__parent__.batch._record(len(lines))
 
-                    # add tangent constraint
-                    self.__parent__.constrain.geometric([arc, prevArc], 'tan')
-                    crvList[i] = arc
+        return lines
 
-        for pt in fixedPtList:
-            pt.isFixed = False
+    def lines(self, lineList, construction=False):
+        '''
+        creates many unconnected lines in one pass, e.g. the slits of a living hinge
 
-        return crvList
+        the coordinates are converted directly and the sketch is only solved
+        once after all lines are created, no points are fixed or constrained
+
+        lineList is a list or any iterable of ((x1, y1), (x2, y2)) tuples
+        construction is a bool and sets the construction property
+
+        returns a list of the created sketchLines
+        '''
+        create = adsk.core.Point3D.create
+        with self.__parent__.batch:
+            sketchLines = self.__parent__._lines
+            lines = [sketchLines.addByTwoPoints(create(x1, y1, 0), create(x2, y2, 0))
+                     for (x1, y1), (x2, y2) in lineList]
+            if construction:
+                for line in lines:
+                    line.isConstruction = True
+            self.__parent__.batch._record(len(lines))
+        return lines
+
+    def _constrainAxisAligned(self, pts, lines, close):
+        '''
+        adds horizontal or vertical constraints to the lines of a polyline based on
+        the input points, so the sketch is not queried for the line geometry
+        '''
+        smallNumber = self.__parent__.__base__.smallNumber
+        constraints = self.__parent__._constraints
+        ends = pts[1:] + [pts[0]] if close else pts[1:]
+        for line, pt1, pt2 in zip(lines, pts, ends):
+            pt1 = self.__parent__.get.point3d(pt1)
+            pt2 = self.__parent__.get.point3d(pt2)
+            if abs(pt1.y - pt2.y) < smallNumber:
+                constraints.addHorizontal(line)
+                self.__parent__.batch._record()
+            elif abs(pt1.x - pt2.x) < smallNumber:
+                constraints.addVertical(line)
+                self.__parent__.batch._record()
 
     def rectangle(self, points, rectType, fixPoint=None, orthogonal=True, axisAligned=True, sideDims=False,
                   expressions=[None, None], construction=False):
@@ -1001,18 +1278,21 @@ class Sketch_Create():
 
         for i in range(4):
             lines.append(rect.item(i))
+        self.__parent__.batch._record()
 
         corners = [rect.item(0).startSketchPoint, rect.item(1).startSketchPoint, rect.item(2).startSketchPoint,
                    rect.item(3).startSketchPoint]
         corners[0].isFixed = True
         corners[2].isFixed = True
 
+        constraints = []
         if orthogonal:
             for i in range(rect.count - 1):
-                self.__parent__.constrain.geometric([rect.item(i), rect.item(i + 1)], 'perp')
+                constraints.append(('perp', [rect.item(i), rect.item(i + 1)]))
 
         if axisAligned:
-            self.__parent__.constrain.geometric([rect.item(2)], 'v')
+            constraints.append(('v', [rect.item(2)]))
+        self.__parent__.constrain.apply_Constraints(constraints)
 
         if fixPoint != None:
             for i in range(4):
@@ -1103,6 +1383,7 @@ class Sketch_Create():
         if fixed:
             circ.isFixed = fixed
 
+        self.__parent__.batch._record()
         return circ
 
     def arc(self, objects, arcType, radius=None, construction=False, fixed=False, dimension=False, expression=None):
@@ -1152,6 +1433,7 @@ class Sketch_Create():
             for i in range(arc.geomtricConstraints.count):
                 arc.geomtricConstraints.item(i)
 
+        self.__parent__.batch._record()
         return arc
 
     def _handleObjectsChecks(self, objects):
@@ -1265,13 +1547,15 @@ class Features_Create():
     def __init__(self, parent):
         self.__parent__ = parent
 
-    def extrude(self, profile, distance, isSymmetric=False, distanceUnits='in'):
+    def extrude(self, profile, distance, isSymmetric=False, distanceUnits='in', baseFeature=None):
         '''
         Automates the task of extruding a profile a given distance
         
         profile is the profile to extrude
         distance is the distance to extrude, it can be a numeric value or a string or an expression
         isSymetric defines if the extrusion is to happen on both sides of the profile
+        baseFeature is a base feature in edit the extrusion is created in, it is
+        then not part of the timeline
         
         This is considered a primary feature, as in this feature is not dependant
         on other features to be created.  The feature must be created in the same
@@ -1285,6 +1569,8 @@ class Features_Create():
         features = self.__parent__._parentComponent.features.extrudeFeatures
         featureInput = features.createInput(profile, adsk.fusion.FeatureOperations.NewBodyFeatureOperation)
         featureInput.setDistanceExtent(isSymmetric, distance)
+        if baseFeature != None:
+            featureInput.targetBaseFeature = baseFeature
         self.__parent__.feature = features.add(featureInput)
         self.__parent__._featureType = 'extrude'
         return self.__parent__.feature
@@ -1485,6 +1771,74 @@ class PatteringOperations(BaseClass):
 
 
 # _____ Utility Functions ______
+class PointIndex:
+    '''
+    spatial hash of points for constant time coincidence lookups
+
+    points are hashed on their coordinates quantized to the tolerance, a lookup
+    checks the neighbouring cells as well, so two points closer than tolerance
+    are always found regardless of where the cell borders are
+
+    points are sketchPoint or Point3d objects or tuples of coordinates, the
+    coordinates are read once when a point is added
+    '''
+
+    def __init__(self, tolerance=1e-6):
+        self._tolerance = tolerance
+        self._cells = {}
+        self._items = []
+
+    def _coordinates(self, pt):
+        if type(pt) is tuple or type(pt) is list:
+            if len(pt) == 2:
+                return pt[0], pt[1], 0
+            return pt[0], pt[1], pt[2]
+        if type(pt) is adsk.fusion.SketchPoint:
+            pt = pt.geometry
+        return pt.x, pt.y, pt.z
+
+    def _key(self, x, y, z):
+        tol = self._tolerance
+        return int(math.floor(x / tol)), int(math.floor(y / tol)), int(math.floor(z / tol))
+
+    def add(self, pt, item=None):
+        '''
+        adds a point to the index
+
+        item is the object stored for the point, defaults to the point itself
+        '''
+        if item is None:
+            item = pt
+        x, y, z = self._coordinates(pt)
+        self._cells.setdefault(self._key(x, y, z), []).append((x, y, z, item))
+        self._items.append(item)
+        return item
+
+    def find(self, pt):
+        '''
+        returns the item of a point coincident to pt or None
+        '''
+        x, y, z = self._coordinates(pt)
+        i, j, k = self._key(x, y, z)
+        tolSquared = self._tolerance * self._tolerance
+        for di in (-1, 0, 1):
+            for dj in (-1, 0, 1):
+                for dk in (-1, 0, 1):
+                    for px, py, pz, item in self._cells.get((i + di, j + dj, k + dk), ()):
+                        if (px - x) ** 2 + (py - y) ** 2 + (pz - z) ** 2 <= tolSquared:
+                            return item
+        return None
+
+    def __contains__(self, pt):
+        return self.find(pt) is not None
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+
 class UtilityOperations:
     def __init__(self):
         self.app = adsk.core.Application.get()
@@ -1574,28 +1928,83 @@ class UtilityOperations:
         return pyList
 
     def tuple2Point3d(self, tpl):
-        for i in tpl:
-            if not isinstance(i, (int, float)):
-                raise Exception("tuple must contain int or float objects")
+        '''
+        converts a tuple of 2 or 3 numbers to a point3D object, the tuple is
+        checked like the tuples of ingestPoints
+        '''
+        self.checkPointTuples([tpl])
+        return adsk.core.Point3D.create(tpl[0], tpl[1], tpl[2] if len(tpl) == 3 else 0)
 
-        if len(tpl) == 2:
-            z = 0
-            x = tpl[0]
-            y = tpl[1]
-        elif len(tpl) == 3:
-            x = tpl[0]
-            y = tpl[1]
-            z = tpl[2]
-        else:
-            raise Exception("tuple must be of length 2 or 3")
+    def checkPointTuples(self, tuples):
+        '''
+        checks a list of point tuples at once
 
-        return adsk.core.Point3D.create(x, y, z)
+        the lengths of all tuples are collected in one set and the types of all
+        coordinates in another, only the distinct types are checked. Coordinates
+        must be int or float (or subclasses), bools and other objects that can
+        be converted to float are rejected.
+        '''
+        if not set(map(len, tuples)) <= {2, 3}:
+            raise Exception("tuple must be of length 2 or 3")
+        for coordinateType in set(map(type, itertools.chain.from_iterable(tuples))):
+            if not issubclass(coordinateType, (int, float)) or issubclass(coordinateType, bool):
+                raise Exception("tuple must contain int or float objects")
 
     def handleObjectList2Points(self, lst):
-        for i, obj in enumerate(lst):
-            if type(obj) is tuple:
-                lst[i] = self.tuple2Point3d(obj)
-        return lst
+        '''
+        converts the tuples of a list of points and objects to point3D objects,
+        all other objects are passed through
+
+        returns a new list, the tuples are validated at once by ingestPoints
+        '''
+        return self.ingestPoints(lst)
+
+    def ingestPoints(self, points, compact=False):
+        '''
+        validates and converts a whole list of points at once
+
+        points is a list (or any iterable) of tuples of 2 or 3 numbers, point3D
+        or sketchPoint objects. All tuples are checked at once by
+        checkPointTuples, instead of checking every element of every tuple.
+
+        compact is a bool, False returns a list of point3D objects (other objects
+        than tuples are passed through), True returns a VectorMath.PointArray of
+        the x and y coordinates for computations before anything is created
+
+        returns a list of point3D objects or a PointArray
+        '''
+        points = list(points)
+        tuples = [pt for pt in points if type(pt) is tuple]
+        if tuples:
+            self.checkPointTuples(tuples)
+
+        if compact:
+            result = PointArray()
+            for pt in points:
+                if type(pt) is not tuple:
+                    if type(pt) is adsk.fusion.SketchPoint:
+                        pt = pt.geometry
+                    pt = (pt.x, pt.y)
+                result.append(pt)
+            return result
+
+        create = adsk.core.Point3D.create
+        return [(create(pt[0], pt[1], pt[2] if len(pt) == 3 else 0) if type(pt) is tuple else pt) for pt in points]
+
+    def ingestStream(self, points, chunkSize=512):
+        '''
+        validates and converts an iterable of points in chunks, see ingestPoints
+
+        yields point3D objects (and passes other objects through) as the points
+        come, so a generator is never held in memory at once
+        '''
+        points = iter(points)
+        while True:
+            chunk = list(itertools.islice(points, chunkSize))
+            if not chunk:
+                return
+            for pt in self.ingestPoints(chunk):
+                yield pt
 
     def findUnitPerpPoints(self, obj1, obj2=None, lineEnd='end'):
         '''
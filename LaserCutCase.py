@@ -7,6 +7,9 @@ import adsk.core
 import adsk.fusion
 import traceback
 from .EasyFusionAPI import EZFusionAPI
+from .CaseGeometry import CaseGeometry, HingeCaseGeometry
+from .CutFileExport import exportPanels
+from .Profiling import Profiler
 
 # values in cm
 defaultCaseName = 'Case'
@@ -14,43 +17,170 @@ defaultMaterialThickness = 4.0
 defaultCaseWidth = 300.0
 defaultCaseLength = 200.0
 defaultCaseHeight = 100.0
+defaultFingerWidth = 15.0
+defaultKerf = 0.0
+# 0 builds a box with square corners, a larger radius wraps the walls in a living hinge
+defaultCornerRadius = 0.0
+
+# attribute group of the values stored in the design
+attributeGroup = 'LaserCutCase'
+
+# path of a speedscope profile (https://www.speedscope.app) written after every
+# execute of the command, None disables profiling
+profileFile = None
 
 # global set of event handlers to keep them referenced for the duration of the command
 handlers = []
+# dimensions and panel box lines of the last preview
+lastPreview = None
 app = adsk.core.Application.get()
 if app:
     ui = app.userInterface
 
+def caseFromInputs(inputs):
+    '''
+    creates a Case from the command inputs of the dialog
+    '''
+    unitsMgr = app.activeProduct.unitsManager
+    case = Case()
+    for input in inputs:
+        if input.id == 'name':
+            case.name = input.value
+        elif input.id == 'materialThickness':
+            case.materialThickness = unitsMgr.evaluateExpression(input.expression, "mm")
+        elif input.id == 'kerf':
+            case.kerf = unitsMgr.evaluateExpression(input.expression, "mm")
+        elif input.id == 'width':
+            case.width = unitsMgr.evaluateExpression(input.expression, "mm")
+        elif input.id == 'length':
+            case.length = unitsMgr.evaluateExpression(input.expression, "mm")
+        elif input.id == 'height':
+            case.height = unitsMgr.evaluateExpression(input.expression, "mm")
+        elif input.id == 'fingerWidth':
+            case.fingerWidth = unitsMgr.evaluateExpression(input.expression, "mm")
+        elif input.id == 'cornerRadius':
+            case.cornerRadius = unitsMgr.evaluateExpression(input.expression, "mm")
+        elif input.id == 'captureHistory':
+            case.captureHistory = input.value
+    return case
+
+
 class CaseCommandExecuteHandler(adsk.core.CommandEventHandler):
     def __init__(self):
         super().__init__()
 
     def notify(self, args):
+        profiler = None
         try:
-            unitsMgr = app.activeProduct.unitsManager
             command = args.firingEvent.sender
             inputs = command.commandInputs
 
-            case = Case()
-            for input in inputs:
-                if input.id == 'name':
-                    case.name = input.value
-                elif input.id == 'materialThickness':
-                    case.materialThickness = unitsMgr.evaluateExpression(input.expression, "mm")
-                elif input.id == 'width':
-                    case.width = unitsMgr.evaluateExpression(input.expression, "mm")
-                elif input.id == 'length':
-                    case.length = unitsMgr.evaluateExpression(input.expression, "mm")
-                elif input.id == 'height':
-                    case.height = unitsMgr.evaluateExpression(input.expression, "mm")
-
-            case.buildCase()
+            if profileFile != None:
+                profiler = Profiler()
+                profiler.instrumentEZFusionAPI()
+                profiler.instrument(Case, ['buildCase', '_updatePanelGroup', '_buildPanelFeatures'])
+                profiler.start()
+
+            jobFile = inputs.itemById('jobFile')
+            if jobFile != None and jobFile.value.strip():
+                from .CaseBatch import readJobFile, buildCases, formatReport
+                report = buildCases(readJobFile(jobFile.value.strip()),
+                                    captureHistory=inputs.itemById('captureHistory').value)
+                ui.messageBox(formatReport(report))
+            else:
+                case = caseFromInputs(inputs)
+                case.buildCase()
             args.isValidResult = True
 
         except:
             if ui:
                 ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
 
+        finally:
+            if profiler != None:
+                profiler.stop()
+                profiler.writeSpeedscope(profileFile)
+
+
+class CaseCommandPreviewHandler(adsk.core.CommandEventHandler):
+    '''
+    draws the panels of the case as custom graphics boxes, without finger joints,
+    parameters, sketches or features
+    '''
+
+    def __init__(self):
+        super().__init__()
+
+    def notify(self, args):
+        try:
+            command = args.firingEvent.sender
+            jobFile = command.commandInputs.itemById('jobFile')
+            if jobFile != None and jobFile.value.strip():
+                # batch jobs are not previewed
+                return
+            lines = previewLines(caseFromInputs(command.commandInputs))
+            if lines == None:
+                # no preview for dimensions that can not be built
+                return
+            drawPreview(lines)
+            # the preview is not the result, execute builds the case
+            args.isValidResult = False
+
+        except:
+            if ui:
+                ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
+
+
+def previewLines(case):
+    '''
+    returns the coordinates and the line indices of the panel boxes of the
+    case, or None if the case can not be built
+
+    the result of the last dimensions is kept. Inputs that do not change them
+    (e.g. the name, or several preview events for one change) reuse it without
+    validating the case and computing its panels again.
+    '''
+    global lastPreview
+    signature = (case.width, case.length, case.height, case.materialThickness, case.fingerWidth, case.kerf,
+                 case.cornerRadius)
+    if lastPreview != None and lastPreview[0] == signature:
+        return lastPreview[1]
+
+    lines = None
+    try:
+        geometry = case.geometry()
+        geometry.validate()
+    except:
+        geometry = None
+    if geometry != None:
+        coordinates = []
+        indices = []
+        for corners in (panel.boxCorners() for panel in geometry.panels()):
+            offset = len(coordinates) // 3
+            for corner in corners:
+                coordinates.extend(corner)
+            for i in range(4):
+                indices.extend([offset + i, offset + (i + 1) % 4,
+                                offset + 4 + i, offset + 4 + (i + 1) % 4,
+                                offset + i, offset + 4 + i])
+        lines = (coordinates, indices)
+    lastPreview = (signature, lines)
+    return lines
+
+
+def drawPreview(lines):
+    '''
+    draws the (coordinates, indices) of previewLines with a single addLines call
+
+    the graphics are created on every preview event, Fusion 360 deletes them
+    before the next preview and before execute
+    '''
+    coordinates, indices = lines
+    rootComp = adsk.fusion.Design.cast(app.activeProduct).rootComponent
+    group = rootComp.customGraphicsGroups.add()
+    group.addLines(adsk.fusion.CustomGraphicsCoordinates.create(coordinates), indices, False)
+    return group
+
 
 class CaseCommandDestroyHandler(adsk.core.CommandEventHandler):
     def __init__(self):
@@ -76,7 +206,7 @@ class CaseCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
             cmd.isRepeatable = False
             onExecute = CaseCommandExecuteHandler()
             cmd.execute.add(onExecute)
-            onExecutePreview = CaseCommandExecuteHandler()
+            onExecutePreview = CaseCommandPreviewHandler()
             cmd.executePreview.add(onExecutePreview)
             onDestroy = CaseCommandDestroyHandler()
             cmd.destroy.add(onDestroy)
@@ -92,6 +222,9 @@ class CaseCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
             initBody = adsk.core.ValueInput.createByReal(defaultMaterialThickness)
             inputs.addValueInput('materialThickness', 'Material Thickness', 'mm', initBody)
 
+            initBody = adsk.core.ValueInput.createByReal(defaultKerf)
+            inputs.addValueInput('kerf', 'Kerf', 'mm', initBody)
+
             initBody = adsk.core.ValueInput.createByReal(defaultCaseWidth)
             inputs.addValueInput('width', 'Width', 'mm', initBody)
 
@@ -101,6 +234,18 @@ class CaseCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
             initBody = adsk.core.ValueInput.createByReal(defaultCaseHeight)
             inputs.addValueInput('height', 'Height', 'mm', initBody)
 
+            initBody = adsk.core.ValueInput.createByReal(defaultFingerWidth)
+            inputs.addValueInput('fingerWidth', 'Finger Width', 'mm', initBody)
+
+            initBody = adsk.core.ValueInput.createByReal(defaultCornerRadius)
+            inputs.addValueInput('cornerRadius', 'Corner Radius (Living Hinge)', 'mm', initBody)
+
+            # throwaway cases are built without parameters into base features, which are faster
+            inputs.addBoolValueInput('captureHistory', 'Capture Design History', True, '', True)
+
+            # csv or json file with several cases, builds those instead of the case above
+            inputs.addStringValueInput('jobFile', 'Job File', '')
+
         except:
             if ui:
                 ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
@@ -113,6 +258,20 @@ class Case:
         self._width = defaultCaseWidth
         self._length = defaultCaseLength
         self._height = defaultCaseHeight
+        self._fingerWidth = defaultFingerWidth
+        self._kerf = defaultKerf
+        self._cornerRadius = defaultCornerRadius
+        self.lastBuild = {}
+        # component the panels are created in, None for the root component
+        self.parentComponent = None
+        # False builds the panels without parameters into base features
+        self.captureHistory = True
+        # number of timeline entries the last build created
+        self.timelineEntries = 0
+        self._parametric = True
+        self._baseFeatures = False
+        # timeline object of the first entity the build created
+        self._firstEntry = None
 
     # properties
     @property
@@ -155,30 +314,315 @@ class Case:
     def length(self, value):
         self._length = value
 
-    def buildCase(self):
-        fa = EZFusionAPI()
+    @property
+    def fingerWidth(self):
+        return self._fingerWidth
 
-        # set parameter names
-        materialThicknessParamName = 'MaterialThickness' % self.name
-        widthParamName = '%sWidth' % self.name
-        lengthParamName = '%sLength' % self.name
-        heightParamName = '%sHeight' % self.name
+    @fingerWidth.setter
+    def fingerWidth(self, value):
+        self._fingerWidth = value
 
-        # set sketch parameters
-        fa.create_UserParameter(materialThicknessParamName, self.materialThickness, units='mm', favorite=True)
-        fa.create_UserParameter(widthParamName, self.width, units='mm', favorite=True)
-        fa.create_UserParameter(lengthParamName, self.length, units='mm', favorite=True)
-        fa.create_UserParameter(heightParamName, self.height, units='mm', favorite=True)
+    @property
+    def kerf(self):
+        return self._kerf
+
+    @kerf.setter
+    def kerf(self, value):
+        self._kerf = value
 
-        # create base
-        basePlateSketch = fa.EZSketch()
-        basePlateSketch.create.rectangle([(0, 0), (1, 1)], '2pr', fixPoint=0, expressions=[widthParamName, lengthParamName])
-        basePlateSketch.sketch.name = '%sBasePlateSketch' % self.name
+    @property
+    def cornerRadius(self):
+        return self._cornerRadius
 
-        box = fa.EZFeatures()
-        box.create.extrude(basePlateSketch.get.profiles()[0], materialThicknessParamName)
-        box.feature.name = '%sBasePlate' % self.name
+    @cornerRadius.setter
+    def cornerRadius(self, value):
+        self._cornerRadius = value
 
+    def geometry(self):
+        '''
+        returns the pure python geometry of the case, no Fusion 360 calls involved
+
+        a corner radius above 0 gives a case with its walls in one living hinge panel
+        '''
+        if self.cornerRadius > 0:
+            return HingeCaseGeometry(self.width, self.length, self.height, self.materialThickness,
+                                     self.fingerWidth, self.cornerRadius, self.kerf)
+        return CaseGeometry(self.width, self.length, self.height, self.materialThickness, self.fingerWidth, self.kerf)
+
+    def exportCutFile(self, path):
+        '''
+        writes the panels of the case into a svg or dxf cut file, no Fusion 360 calls involved
+
+        the outlines are already compensated for the kerf of the case
+        '''
+        return exportPanels(self.geometry().panels(), path)
+
+    def buildCase(self):
+        '''
+        builds the case, or updates the case with the same name built before
+
+        panels with the same outline (bottom and top, front and back, left and
+        right) are sketched and extruded once, every panel is an occurrence of
+        that component. The components store the inputs the outline and the
+        placements depend on. Only panels with a changed outline are sketched and
+        extruded again, panels that only moved get a new transform and all other
+        panels are left alone. Panel components the case does not have anymore
+        are deleted. The material thickness parameter is updated by expression.
+
+        with captureHistory the panels are parametric. Without, no parameters
+        are created and every panel is sketched and extruded inside a base
+        feature, which the timeline does not recompute. In a parametric design
+        the timeline entries of the case are kept in one timeline group named
+        after the case, a rebuild inserts its entries behind the ones of the last
+        build and groups them again. The design type is never changed, in a
+        direct design the case is built without parameters and timeline.
+
+        returns a dictionary with the panel names as keys and 'created',
+        'rebuilt', 'moved' or 'unchanged' as values
+        '''
+        # compute every outline before touching Fusion 360
+        panels = self.geometry().panels()
+
+        fa = EZFusionAPI()
+
+        design = fa.__base__.design
+        hasTimeline = design.designType == adsk.fusion.DesignTypes.ParametricDesignType
+        self._parametric = hasTimeline and self.captureHistory
+        self._baseFeatures = hasTimeline and not self.captureHistory
+        self._firstEntry = None
+
+        timeline = None
+        groups = None
+        lastGroup = None
+        marker = None
+        if hasTimeline:
+            timeline = design.timeline
+            groups = timeline.timelineGroups
+            lastGroup = groups.itemByName(self.name)
+            if lastGroup != None:
+                lastEnd = lastGroup.item(lastGroup.count - 1).index
+                marker = timeline.markerPosition
+                if marker <= lastEnd:
+                    # the marker is rolled back into the case, the new entries
+                    # are inserted there and not grouped
+                    groups = None
+                    lastGroup = None
+                    marker = None
+                elif marker == lastEnd + 1:
+                    marker = None
+                else:
+                    # the entries of a rebuild go right behind the entries of the
+                    # last build, so the case stays one timeline group
+                    entries = timeline.count
+                    timeline.markerPosition = lastEnd + 1
+
+        try:
+            if self._parametric:
+                thicknessExpression = self._createParameters(fa)
+            else:
+                thicknessExpression = '%r cm' % self.materialThickness
+
+            self.lastBuild = {}
+            for group in self._panelGroups(panels):
+                self.lastBuild.update(self._updatePanelGroup(fa, group, thicknessExpression))
+            self._deleteStalePanels(fa, panels)
+
+            self.timelineEntries = 0
+            if self._firstEntry != None:
+                # the entries of the case end in front of the marker, deleted entries
+                # of rebuilt panels moved them to lower indices
+                timelineEnd = timeline.markerPosition - 1
+                timelineStart = self._firstEntry.index
+                self.timelineEntries = timelineEnd + 1 - timelineStart
+                if lastGroup != None:
+                    if lastGroup.count > 0:
+                        timelineStart = lastGroup.item(0).index
+                    lastGroup.deleteMe(False)
+                if groups != None:
+                    groups.add(timelineStart, timelineEnd).name = self.name
+        finally:
+            if marker != None:
+                # back behind the entries that were in front of the marker before
+                timeline.markerPosition = marker + timeline.count - entries
+        return self.lastBuild
+
+    def _createParameters(self, fa):
+        '''
+        creates or updates the user parameter of the material thickness, which
+        drives the extrusions of the panels
+
+        the outlines are computed by the script, so width, length, height and
+        kerf have no parameters, a parameter that drives nothing would only
+        suggest it could be edited in Fusion 360
+
+        returns the name of the material thickness parameter
+        '''
+        materialThicknessParamName = '%sMaterialThickness' % self.name
+        # the value is in internal units, an unchanged parameter is not touched
+        fa.create_UserParameter(materialThicknessParamName, self.materialThickness, units='cm',
+                                comment='extrusion depth, run the script to change the finger depth',
+                                favorite=True)
+        return materialThicknessParamName
+
+    def _panelGroups(self, panels):
+        '''
+        groups the panels with the same outline, in the order of their first panel
+        '''
+        groups = {}
+        for panel in panels:
+            groups.setdefault(panel.outlineInputs(), []).append(panel)
+        return list(groups.values())
+
+    def _updatePanelGroup(self, fa, group, thicknessExpression):
+        '''
+        creates the component of panels with the same outline or brings it up to date
+
+        the first panel of the group names the component, every panel of the
+        group is an occurrence of it, placed by its own transform
+
+        returns a dictionary with what has been done to every panel
+        '''
+        first = group[0]
+        # switching between parametric panels and base features rebuilds the panels
+        outlineKey = repr(first.outlineInputs() + (self._parametric,))
+
+        component = fa.get_Component('%s%s' % (self.name, first.name))
+        occurrences = fa.get_Occurrences(component, self.parentComponent) if component != None else []
+        if not occurrences:
+            component = self._buildPanel(fa, first, thicknessExpression)
+            occurrences = fa.get_Occurrences(component, self.parentComponent)
+            outlineState = 'created'
+        elif fa.get_Attribute(component, attributeGroup, 'outline') != outlineKey:
+            self._deletePanelFeatures(component, first)
+            self._buildPanelFeatures(fa, component, first, thicknessExpression)
+            outlineState = 'rebuilt'
+        else:
+            outlineState = None
+        if outlineState != None:
+            fa.set_Attribute(component, attributeGroup, 'outline', outlineKey)
+
+        states = {}
+        for i, panel in enumerate(group):
+            placementKey = repr(panel.placementInputs())
+            placementName = 'placement%d' % i
+            if i >= len(occurrences):
+                self._recordEntry(fa.create_Occurrence(component, self._panelTransform(panel), self.parentComponent))
+                state = outlineState or 'created'
+            elif fa.get_Attribute(component, attributeGroup, placementName) != placementKey:
+                if not (outlineState == 'created' and i == 0):
+                    occurrences[i].transform = self._panelTransform(panel)
+                state = outlineState or 'moved'
+            else:
+                states[panel.name] = outlineState or 'unchanged'
+                continue
+            fa.set_Attribute(component, attributeGroup, placementName, placementKey)
+            states[panel.name] = state
+        for occurrence in occurrences[len(group):]:
+            occurrence.deleteMe()
+        return states
+
+    def _deleteStalePanels(self, fa, panels):
+        '''
+        deletes the panel components of the case that are not part of panels
+        anymore, e.g. the walls of a case that got a living hinge
+
+        the names of the panel components of every case are stored in the design,
+        a stale component is only deleted if it carries the outline attribute
+        '''
+        design = fa.__base__.design
+        panelComponents = []
+        for panel in panels:
+            if '%s%s' % (self.name, panel.name) not in panelComponents:
+                panelComponents.append('%s%s' % (self.name, panel.name))
+        attributeName = '%sPanels' % self.name
+        lastComponents = fa.get_Attribute(design, attributeGroup, attributeName)
+        for componentName in (lastComponents or '').split(','):
+            if not componentName or componentName in panelComponents:
+                continue
+            component = fa.get_Component(componentName)
+            if component == None or fa.get_Attribute(component, attributeGroup, 'outline') == None:
+                continue
+            # a component is removed from the design with its last occurrence
+            for occurrence in fa.get_Occurrences(component, self.parentComponent):
+                occurrence.deleteMe()
+        if lastComponents != ','.join(panelComponents):
+            fa.set_Attribute(design, attributeGroup, attributeName, ','.join(panelComponents))
+
+    def _recordEntry(self, entity):
+        '''
+        keeps the timeline object of the first entity the build created, the
+        timeline entries of the build start there
+        '''
+        if self._firstEntry == None and (self._parametric or self._baseFeatures):
+            self._firstEntry = entity.timelineObject
+
+    def _panelTransform(self, panel):
+        transform = adsk.core.Matrix3D.create()
+        transform.setWithCoordinateSystem(adsk.core.Point3D.create(*panel.origin),
+                                          adsk.core.Vector3D.create(*panel.xAxis),
+                                          adsk.core.Vector3D.create(*panel.yAxis),
+                                          adsk.core.Vector3D.create(*panel.normal))
+        return transform
+
+    def _buildPanel(self, fa, panel, thicknessExpression):
+        '''
+        creates a component for the panel, sketches its outline and extrudes it
+        '''
+        component = fa.create_NewComponent('%s%s' % (self.name, panel.name), self._panelTransform(panel),
+                                           self.parentComponent)
+        if self._firstEntry == None:
+            # the occurrence of the component is created before the sketch
+            self._recordEntry(fa.get_Occurrence(component, self.parentComponent))
+        self._buildPanelFeatures(fa, component, panel, thicknessExpression)
+        return component
+
+    def _buildPanelFeatures(self, fa, component, panel, thicknessExpression):
+        baseFeature = None
+        if self._baseFeatures:
+            baseFeature = component.features.baseFeatures.add()
+            baseFeature.name = '%s%s' % (self.name, panel.name)
+            self._recordEntry(baseFeature)
+            baseFeature.startEdit()
+        try:
+            panelSketch = fa.EZSketch(component.xYConstructionPlane)
+            # the outline and the slits of a living hinge are streamed into the sketch
+            # as they are generated, the sketch is solved once for both
+            with panelSketch.batch:
+                panelSketch.create.polyline(panel.iterOutline(), close=True)
+                panelSketch.create.lines(panel.iterCuts())
+            panelSketch.sketch.name = '%s%sSketch' % (self.name, panel.name)
+
+            panelFeature = fa.EZFeatures()
+            panelFeature.create.extrude(panelSketch.get.profiles()[0], thicknessExpression, baseFeature=baseFeature)
+        finally:
+            if baseFeature != None:
+                baseFeature.finishEdit()
+        if self._parametric:
+            panelFeature.feature.name = '%s%s' % (self.name, panel.name)
+            self._recordEntry(panelSketch.sketch)
+        else:
+            # base features and direct designs keep no features, only the body
+            panelFeature.feature.bodies.item(0).name = '%s%s' % (self.name, panel.name)
+        return panelFeature
+
+    def _deletePanelFeatures(self, component, panel):
+        '''
+        deletes the base feature, the extrusion, the body and the sketch of a panel
+        '''
+        feature = component.features.extrudeFeatures.itemByName('%s%s' % (self.name, panel.name))
+        if feature != None:
+            feature.deleteMe()
+        elif self._parametric or self._baseFeatures:
+            # only parametric extrusions are named, a direct design has no base features
+            baseFeature = component.features.baseFeatures.itemByName('%s%s' % (self.name, panel.name))
+            if baseFeature != None:
+                baseFeature.deleteMe()
+        body = component.bRepBodies.itemByName('%s%s' % (self.name, panel.name))
+        if body != None:
+            body.deleteMe()
+        sketch = component.sketches.itemByName('%s%sSketch' % (self.name, panel.name))
+        if sketch != None:
+            sketch.deleteMe()
 
 def run(context):
     try:
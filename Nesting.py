@@ -0,0 +1,483 @@
+# Author-Florian
+# Description-Packs the panels of one or many cases onto stock sheets.
+#
+# Nothing in this module talks to Fusion 360. The panels are packed as their
+# bounding rectangles by a skyline bottom left packer, rotated by 90 degrees
+# where that fits better. The optional polygon mode afterwards slides every
+# panel left and down until its finger jointed outline touches another one,
+# so tabs move into the slots of the neighbouring panels. Tabs only fit into
+# slots if the spacing is smaller than the clearance between them, e.g. a
+# spacing of 0 for common line cutting. Panels with rounded corners slide
+# along their bounding box.
+#
+# The sheets are written to cut files with CutFileExport.exportOutlines.
+#
+# All lengths are in cm like the panel geometry.
+
+from .VectorMath import PointArray
+
+
+class Placement:
+    '''
+    a panel placed on a sheet
+
+    x and y are the position of the lower left corner of the bounding box of the
+    (rotated) panel on the sheet, a rotated panel is turned by 90 degrees
+    counter clockwise. The outline of a panel with a kerf reaches half the kerf
+    past its nominal size on every side, width and height include the kerf.
+    '''
+
+    def __init__(self, panel, label, rotated, x=0.0, y=0.0):
+        self.panel = panel
+        self.label = label
+        self.rotated = rotated
+        self.x = x
+        self.y = y
+        self._area = None
+        self._edges = {}
+
+    @property
+    def name(self):
+        return '%s%s' % (self.label, self.panel.name)
+
+    @property
+    def width(self):
+        return (self.panel.height if self.rotated else self.panel.width) + self.panel.kerf
+
+    @property
+    def height(self):
+        return (self.panel.width if self.rotated else self.panel.height) + self.panel.kerf
+
+    def localOutline(self):
+        '''
+        returns the outline of the (rotated) panel with its bounding box at the origin
+        '''
+        h = self.panel.height
+        half = self.panel.kerf / 2
+        if self.rotated:
+            return PointArray((h - y + half, x + half) for x, y in self.panel.iterOutline())
+        if half == 0:
+            return self.panel.outline()
+        return PointArray((x + half, y + half) for x, y in self.panel.iterOutline())
+
+    def outline(self):
+        '''
+        returns the outline of the panel in sheet coordinates
+        '''
+        return PointArray(self.iterOutline())
+
+    def iterOutline(self):
+        '''
+        yields the points of outline() one at a time
+        '''
+        h = self.panel.height
+        dx = self.x + self.panel.kerf / 2
+        dy = self.y + self.panel.kerf / 2
+        for x, y in self.panel.iterOutline():
+            if self.rotated:
+                x, y = h - y, x
+            yield x + dx, y + dy
+
+    def cuts(self):
+        '''
+        returns the cut lines inside the panel in sheet coordinates
+        '''
+        return list(self.iterCuts())
+
+    def iterCuts(self):
+        '''
+        yields the lines of cuts() one at a time
+        '''
+        h = self.panel.height
+        dx = self.x + self.panel.kerf / 2
+        dy = self.y + self.panel.kerf / 2
+        for (x1, y1), (x2, y2) in self.panel.iterCuts():
+            if self.rotated:
+                x1, y1, x2, y2 = h - y1, x1, h - y2, x2
+            yield (x1 + dx, y1 + dy), (x2 + dx, y2 + dy)
+
+    def compactEdges(self, axis):
+        '''
+        returns the (left, right) vertical edges of the outline the polygon mode
+        slides along relative to the position of the placement, with x and y
+        swapped for axis 1. Panels with curved outlines are represented by their
+        bounding box.
+
+        the edges do not change when the placement moves, so they are kept
+        '''
+        if axis not in self._edges:
+            if self.panel.rectilinear:
+                points = self.localOutline()
+            else:
+                points = [(0.0, 0.0), (self.width, 0.0), (self.width, self.height), (0.0, self.height)]
+            if axis == 1:
+                # sliding down is sliding left with x and y swapped, which mirrors the
+                # outline, so the orientation is restored by reversing it
+                points = [(y, x) for x, y in reversed(points)]
+            self._edges[axis] = _verticalEdges(points)
+        return self._edges[axis]
+
+    def area(self):
+        if self._area == None:
+            self._area = self.panel.area()
+        return self._area
+
+
+class Sheet:
+    '''
+    a stock sheet with a skyline of the placed panels
+
+    the skyline is a list of [x, y, width] segments from left to right, the
+    height of the packed panels over the width of the sheet
+    '''
+
+    def __init__(self, width, height, spacing):
+        self.width = width
+        self.height = height
+        self.spacing = spacing
+        self.placements = []
+        # every panel occupies its size plus spacing, the spacing at the far
+        # sheet edges is added by shrinking the usable area
+        self._usableWidth = width - spacing
+        self._usableHeight = height - spacing
+        self._skyline = [[0.0, 0.0, self._usableWidth]]
+
+    def _fit(self, index, width, height):
+        '''
+        returns the y of a rectangle placed at the start of the skyline segment or None
+        '''
+        x = self._skyline[index][0]
+        if x + width > self._usableWidth + 1e-9:
+            return None
+        y = 0.0
+        remaining = width
+        i = index
+        while remaining > 1e-9:
+            segment = self._skyline[i]
+            y = max(y, segment[1])
+            if y + height > self._usableHeight + 1e-9:
+                return None
+            remaining -= segment[2]
+            i += 1
+        return y
+
+    def findPosition(self, width, height):
+        '''
+        finds the bottom left position of a rectangle
+
+        returns (top, x, y, index) or None if it does not fit
+        '''
+        best = None
+        for i in range(len(self._skyline)):
+            y = self._fit(i, width, height)
+            if y != None:
+                candidate = (y + height, self._skyline[i][0], y, i)
+                if best == None or candidate < best:
+                    best = candidate
+        return best
+
+    def place(self, placement, position):
+        top, x, y, index = position
+        width = placement.width + self.spacing
+        placement.x = x + self.spacing
+        placement.y = y + self.spacing
+        self.placements.append(placement)
+
+        # the new segment replaces everything it covers
+        skyline = self._skyline
+        newSegment = [x, top, width]
+        end = x + width
+        i = index
+        while i < len(skyline) and skyline[i][0] < end - 1e-9:
+            segmentEnd = skyline[i][0] + skyline[i][2]
+            if segmentEnd > end + 1e-9:
+                skyline[i][2] = segmentEnd - end
+                skyline[i][0] = end
+                break
+            del skyline[i]
+        skyline.insert(index, newSegment)
+
+        # merge neighbours of the same height
+        i = 0
+        while i < len(skyline) - 1:
+            if abs(skyline[i][1] - skyline[i + 1][1]) < 1e-9:
+                skyline[i][2] += skyline[i + 1][2]
+                del skyline[i + 1]
+            else:
+                i += 1
+
+    def rebuildSkyline(self):
+        '''
+        sets the skyline to the upper envelope of the placed panels, after panels
+        have been moved
+        '''
+        spacing = self.spacing
+        edges = set([0.0, self._usableWidth])
+        for p in self.placements:
+            edges.add(min(max(p.x - spacing, 0.0), self._usableWidth))
+            edges.add(min(p.x + p.width, self._usableWidth))
+        edges = sorted(edges)
+
+        skyline = []
+        for x1, x2 in zip(edges, edges[1:]):
+            if x2 - x1 < 1e-9:
+                continue
+            top = 0.0
+            for p in self.placements:
+                if p.x - spacing < x2 - 1e-9 and p.x + p.width > x1 + 1e-9:
+                    top = max(top, p.y + p.height)
+            if skyline and abs(skyline[-1][1] - top) < 1e-9:
+                skyline[-1][2] += x2 - x1
+            else:
+                skyline.append([x1, top, x2 - x1])
+        self._skyline = skyline
+
+    def usedHeight(self):
+        '''
+        returns the height of the sheet covered by panels
+        '''
+        if not self.placements:
+            return 0.0
+        return max(p.y + p.height for p in self.placements) + self.spacing
+
+    def utilisation(self):
+        '''
+        returns the share of the sheet area covered by panel outlines
+        '''
+        return sum(p.area() for p in self.placements) / (self.width * self.height)
+
+    def outlines(self):
+        '''
+        yields a (name, points, cuts) tuple of every placed panel in sheet
+        coordinates, points and cuts are generators for CutFileExport.exportOutlines
+        '''
+        for placement in self.placements:
+            yield placement.name, placement.iterOutline(), placement.iterCuts()
+
+
+def _verticalEdges(points):
+    '''
+    splits the vertical edges of a counter clockwise rectilinear outline into the
+    edges facing left (running down) and facing right (running up)
+
+    returns two lists of (x, y1, y2) tuples with y1 < y2
+    '''
+    left = []
+    right = []
+    for i in range(len(points)):
+        x1, y1 = points[i - 1]
+        x2, y2 = points[i]
+        if abs(x1 - x2) < 1e-9 and abs(y1 - y2) > 1e-9:
+            if y2 < y1:
+                left.append((x1, y2, y1))
+            else:
+                right.append((x1, y1, y2))
+    return left, right
+
+
+def _slideDistance(movingLeft, fixedRight, spacing, dx=0.0, dy=0.0):
+    '''
+    calculates how far edges facing left can move left until they are spacing
+    away from edges facing right, the fixed edges are offset by dx and dy
+    '''
+    distance = float('inf')
+    for x, y1, y2 in movingLeft:
+        x -= dx
+        low = y1 - dy - spacing + 1e-9
+        high = y2 - dy + spacing - 1e-9
+        for fx, fy1, fy2 in fixedRight:
+            if fx <= x + 1e-9 and fy1 < high and fy2 > low:
+                distance = min(distance, x - fx - spacing)
+    return distance
+
+
+def _compactPlacement(sheet, placement, passes=2):
+    '''
+    slides a placed panel down and left until its outline is spacing away from
+    the outline of another panel or the sheet edge
+    '''
+    others = [p for p in sheet.placements if p is not placement]
+    for _ in range(passes):
+        moved = False
+        for axis in (1, 0):
+            distance = _axisDistance(placement, others, axis, sheet.spacing)
+            if distance > 1e-9:
+                moved = True
+                if axis == 0:
+                    placement.x -= distance
+                else:
+                    placement.y -= distance
+        if not moved:
+            break
+
+
+def _compactSheet(sheet):
+    '''
+    slides every placed panel down and left, the lowest first
+    '''
+    for placement in sorted(sheet.placements, key=lambda p: (p.y, p.x)):
+        _compactPlacement(sheet, placement)
+
+
+def _axisDistance(placement, others, axis, spacing):
+    '''
+    calculates how far the placement can slide towards 0 along axis
+    '''
+    def position(p):
+        return (p.x, p.y) if axis == 0 else (p.y, p.x)
+
+    def span(p):
+        return (p.y, p.y + p.height) if axis == 0 else (p.x, p.x + p.width)
+
+    start, across = position(placement)
+    low, high = span(placement)
+    distance = start - spacing
+    candidates = []
+    for other in others:
+        otherLow, otherHigh = span(other)
+        if position(other)[0] < start + (placement.width if axis == 0 else placement.height) \
+                and otherLow < high + spacing and otherHigh > low - spacing:
+            candidates.append(other)
+    if not candidates:
+        return distance
+
+    movingLeft, _ = placement.compactEdges(axis)
+    for other in candidates:
+        _, fixedRight = other.compactEdges(axis)
+        otherStart, otherAcross = position(other)
+        distance = min(distance, _slideDistance(movingLeft, fixedRight, spacing,
+                                                otherStart - start, otherAcross - across))
+    return max(distance, 0.0)
+
+
+class Nester:
+    '''
+    packs panels onto sheets of the same size
+
+    sheetWidth and sheetHeight are the size of the stock sheets
+    spacing is the gap between the panels and to the sheet edges
+    rotate is a bool and allows to turn panels by 90 degrees
+    polygon is a bool and compacts the packed sheets along the finger jointed outlines
+    '''
+
+    def __init__(self, sheetWidth, sheetHeight, spacing=0.5, rotate=True, polygon=False):
+        self.sheetWidth = sheetWidth
+        self.sheetHeight = sheetHeight
+        self.spacing = spacing
+        self.rotate = rotate
+        self.polygon = polygon
+        self.items = []
+        self.sheets = []
+
+    def addPanels(self, panels, label=''):
+        '''
+        adds panels to pack, label is put in front of the panel names (e.g. the case name)
+        '''
+        for panel in panels:
+            self.items.append((panel, label))
+
+    def addCase(self, case):
+        '''
+        adds the panels of a LaserCutCase.Case
+        '''
+        self.addPanels(case.geometry().panels(), case.name)
+
+    def defaultOrder(self):
+        '''
+        returns the indices of the added panels, the largest first
+        '''
+        return sorted(range(len(self.items)), key=lambda i: (max(self.items[i][0].width, self.items[i][0].height),
+                                                              min(self.items[i][0].width, self.items[i][0].height)),
+                      reverse=True)
+
+    def pack(self, order=None, rotations=None):
+        '''
+        packs all added panels
+
+        order is a list of the indices of the added panels in the order they are
+        packed, defaults to the largest first
+        rotations is a list with one entry per index in order, None lets the packer
+        choose the orientation, True or False rotates the panel or keeps it. It
+        falls back to the other orientation if the panel does not fit on the sheet.
+
+        returns the list of sheets
+        '''
+        spacing = self.spacing
+        for panel, _ in self.items:
+            width = panel.width + panel.kerf
+            height = panel.height + panel.kerf
+            fits = self._fitsSheet(width, height) or (self.rotate and self._fitsSheet(height, width))
+            if not fits:
+                raise Exception('panel %s does not fit on the sheet' % panel.name)
+
+        if order == None:
+            order = self.defaultOrder()
+        self.sheets = []
+        for k, index in enumerate(order):
+            panel, label = self.items[index]
+            orientations = [False, True] if self.rotate and panel.width != panel.height else [False]
+            if rotations != None and rotations[k] != None and len(orientations) == 2:
+                rotated = rotations[k]
+                placement = Placement(panel, label, rotated)
+                if self._fitsSheet(placement.width, placement.height):
+                    orientations = [rotated]
+            placed = False
+            for sheet in self.sheets:
+                placed = self._placeOnSheet(sheet, panel, label, orientations)
+                if placed:
+                    break
+            if not placed:
+                sheet = Sheet(self.sheetWidth, self.sheetHeight, spacing)
+                self.sheets.append(sheet)
+                if not self._placeOnSheet(sheet, panel, label, orientations):
+                    raise Exception('panel %s does not fit on the sheet' % panel.name)
+
+        return self.sheets
+
+    def _fitsSheet(self, width, height):
+        return width + 2 * self.spacing <= self.sheetWidth and height + 2 * self.spacing <= self.sheetHeight
+
+    def _placeOnSheet(self, sheet, panel, label, orientations):
+        best = None
+        for rotated in orientations:
+            placement = Placement(panel, label, rotated)
+            position = sheet.findPosition(placement.width + self.spacing, placement.height + self.spacing)
+            if position != None and (best == None or position < best[1]):
+                best = (placement, position)
+        if best == None:
+            return False
+        sheet.place(*best)
+        if self.polygon:
+            # move the panel into the slots below and left of it and let the
+            # next panels use the space this frees
+            _compactPlacement(sheet, best[0])
+            sheet.rebuildSkyline()
+        return True
+
+    def utilisation(self):
+        '''
+        returns the share of the area of all sheets covered by panel outlines
+        '''
+        if not self.sheets:
+            return 0.0
+        return sum(sheet.utilisation() for sheet in self.sheets) / len(self.sheets)
+
+    def report(self):
+        '''
+        returns the sheet count, utilisation and used height of every sheet as text
+        '''
+        lines = ['%d panels on %d sheets of %.1f x %.1f cm, utilisation %.1f %%'
+                 % (len(self.items), len(self.sheets), self.sheetWidth, self.sheetHeight, self.utilisation() * 100)]
+        for i, sheet in enumerate(self.sheets):
+            lines.append('sheet %d: %d panels, utilisation %.1f %%, used height %.1f cm'
+                         % (i + 1, len(sheet.placements), sheet.utilisation() * 100, sheet.usedHeight()))
+        return '\n'.join(lines)
+
+    def score(self):
+        '''
+        returns a tuple to compare packings by, lower is better: the number of
+        sheets and the height used on the last sheet
+        '''
+        if not self.sheets:
+            return (0, 0.0)
+        return (len(self.sheets), self.sheets[-1].usedHeight())
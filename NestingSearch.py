@@ -0,0 +1,188 @@
+# Author-Florian
+# Description-Searches orderings and rotations of the panels for the best nesting.
+#
+# A single greedy pass of Nesting.Nester packs the largest panel first. The
+# search packs the same panels again in other orders and with other rotations
+# and keeps the layout with the fewest sheets and the least height used on
+# the last sheet. Candidates are evaluated in a process pool until the time
+# budget is used up, every process holds its own copy of the panels and only
+# sends back the score of a candidate, the best one is packed again locally.
+#
+# Inside Fusion 360 the python executable is Fusion 360 itself, so no
+# processes can be started there and the search runs in the calling process.
+#
+# The budget is wall clock time. A worker checks it before every candidate,
+# so the search returns at most one candidate packing and the shutdown of the
+# pool after the budget. Starting the pool is part of the budget.
+
+import concurrent.futures
+import importlib.machinery
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+from .Nesting import Nester
+
+# candidates below this number are the deterministic sort orders
+sortKeys = [
+    lambda panel: (max(panel.width, panel.height), min(panel.width, panel.height)),
+    lambda panel: panel.width * panel.height,
+    lambda panel: panel.height,
+    lambda panel: panel.width,
+    lambda panel: panel.width + panel.height,
+]
+
+# the nester of a worker process, set up once per process
+_workerNester = None
+
+
+def candidate(nester, seed):
+    '''
+    creates the order and the rotations of a search candidate
+
+    seed 0 is the default order of the nester, the next seeds are other sort
+    orders and all further seeds are random variations of the default order
+
+    returns (order, rotations) for Nester.pack
+    '''
+    items = nester.items
+    if seed < len(sortKeys):
+        key = sortKeys[seed]
+        order = sorted(range(len(items)), key=lambda i: key(items[i][0]), reverse=True)
+        return order, None
+
+    rng = random.Random(seed)
+    order = nester.defaultOrder()
+    # swap panels with close neighbours, the order stays roughly largest first
+    window = rng.randint(2, 8)
+    for i in range(len(order)):
+        if rng.random() < 0.3:
+            j = min(len(order) - 1, i + rng.randint(1, window))
+            order[i], order[j] = order[j], order[i]
+    rotations = [rng.choice((None, None, False, True)) for _ in order]
+    return order, rotations
+
+
+def canUseProcesses():
+    '''
+    returns True if worker processes can be started from this interpreter
+    '''
+    return os.path.basename(sys.executable).lower().startswith('python')
+
+
+def processContext():
+    '''
+    returns the multiprocessing context to start the workers with, or None if
+    no worker can load this module
+
+    a spawned worker (the default on Windows and macOS) imports this module by
+    its name, so the package has to be found on sys.path. Otherwise the workers
+    are forked, where that is available, and inherit the loaded modules.
+    '''
+    if importlib.machinery.PathFinder.find_spec(__name__.split('.')[0]) != None:
+        return multiprocessing.get_context()
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return None
+
+
+def _initWorker(settings, items):
+    global _workerNester
+    _workerNester = Nester(*settings)
+    _workerNester.items = items
+
+
+def _evaluate(seeds, deadline):
+    '''
+    packs the candidates of the seeds with the nester of the worker, until the
+    deadline (time.time() of the end of the budget) has passed
+
+    returns a list of (score, seed) tuples
+    '''
+    results = []
+    for seed in seeds:
+        if time.time() >= deadline:
+            break
+        _workerNester.pack(*candidate(_workerNester, seed))
+        results.append((_workerNester.score(), seed))
+    return results
+
+
+def search(nester, budget=5.0, workers=None):
+    '''
+    searches the best packing of the panels of the nester within the time budget
+
+    budget is the wall clock time in seconds
+    workers is the number of processes, defaults to the number of cores. With 1
+    worker or if no processes can be started the search runs in this process.
+
+    the nester is left packed with the best layout found, returns a dictionary
+    with the number of evaluated candidates, the seconds used, the number of
+    workers, the score and the seed of the best candidate
+    '''
+    start = time.perf_counter()
+    deadline = start + budget
+
+    # the default packing is the baseline and gives the time of one candidate
+    nester.pack()
+    best = (nester.score(), 0)
+    packTime = max(time.perf_counter() - start, 1e-4)
+    evaluated = 1
+    # the best candidate is packed again at the end
+    deadline -= packTime
+
+    if workers == None:
+        workers = os.cpu_count() or 1
+    context = processContext() if canUseProcesses() else None
+    if context == None:
+        workers = 1
+
+    # enough candidates per task to keep the overhead of a task small
+    chunkSize = max(1, int(0.05 / packTime))
+    seeds = iter(range(1, sys.maxsize))
+
+    def nextChunk():
+        return [next(seeds) for _ in range(chunkSize)]
+
+    if workers > 1:
+        settings = (nester.sheetWidth, nester.sheetHeight, nester.spacing, nester.rotate, nester.polygon)
+        pool = concurrent.futures.ProcessPoolExecutor(workers, mp_context=context, initializer=_initWorker,
+                                                      initargs=(settings, nester.items))
+        # the workers compare the wall clock, perf_counter is per process
+        wallDeadline = time.time() + deadline - time.perf_counter()
+        pending = set()
+        try:
+            pending = set(pool.submit(_evaluate, nextChunk(), wallDeadline) for _ in range(2 * workers))
+            while pending:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                done, pending = concurrent.futures.wait(pending, remaining,
+                                                        concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    for result in future.result():
+                        best = min(best, result)
+                        evaluated += 1
+                    if time.perf_counter() < deadline:
+                        pending.add(pool.submit(_evaluate, nextChunk(), wallDeadline))
+        finally:
+            # running chunks stop at the deadline, queued ones are cancelled
+            for future in pending:
+                future.cancel()
+            if sys.version_info >= (3, 9):
+                pool.shutdown(wait=True, cancel_futures=True)
+            else:
+                pool.shutdown(wait=True)
+    else:
+        while time.perf_counter() + packTime < deadline:
+            seed = next(seeds)
+            nester.pack(*candidate(nester, seed))
+            best = min(best, (nester.score(), seed))
+            evaluated += 1
+
+    score, seed = best
+    nester.pack(*candidate(nester, seed))
+    return {'evaluated': evaluated, 'seconds': time.perf_counter() - start, 'workers': workers,
+            'score': score, 'seed': seed}
@@ -0,0 +1,175 @@
+# Author-Florian
+# Description-Opt-in timing of the EZFusionAPI operations of a case build.
+#
+# A Profiler wraps the methods of classes with timing spans while it runs and
+# puts the original methods back when it stops. Spans nest like the calls, so
+# the time of a sketch can be split into creating curves, adding constraints
+# and solving. The spans are written as an evented speedscope profile
+# (https://www.speedscope.app) and summed up in a text report.
+
+import functools
+import inspect
+import json
+import time
+
+from .EasyFusionAPI import EZFusionAPI, EZSketch, Sketch_Create, Sketch_Constrain, Features_Create
+
+
+class Profiler:
+    '''
+    records nested timing spans of wrapped methods
+
+    name is the name of the profile in the speedscope file
+    '''
+
+    def __init__(self, name='LaserCutCase'):
+        self.name = name
+        self.frames = []
+        self.events = []
+        self._frameIndex = {}
+        self._wrapped = []
+        self._start = None
+        self._end = None
+
+    @property
+    def active(self):
+        return self._start != None and self._end == None
+
+    def instrument(self, cls, names=None):
+        '''
+        wraps methods of a class with timing spans until stop() is called
+
+        names is a list of method names, defaults to all public methods and __init__
+        '''
+        if names == None:
+            names = [name for name, member in vars(cls).items()
+                     if inspect.isfunction(member) and (not name.startswith('_') or name == '__init__')]
+        for name in names:
+            original = vars(cls)[name]
+            setattr(cls, name, self._wrap(original, '%s.%s' % (cls.__name__, name)))
+            self._wrapped.append((cls, name, original))
+
+    def instrumentEZFusionAPI(self):
+        '''
+        wraps the sketch, constraint, feature and parameter operations of the EZFusionAPI
+        '''
+        self.instrument(EZFusionAPI, ['create_UserParameter', 'create_UserParameters'])
+        for cls in (EZSketch, Sketch_Create, Sketch_Constrain, Features_Create):
+            self.instrument(cls)
+
+    def _wrap(self, function, frameName):
+        profiler = self
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not profiler.active:
+                return function(*args, **kwargs)
+            frame = profiler._frame(frameName)
+            profiler.events.append(('O', frame, time.perf_counter()))
+            try:
+                return function(*args, **kwargs)
+            finally:
+                profiler.events.append(('C', frame, time.perf_counter()))
+        return wrapper
+
+    def _frame(self, frameName):
+        index = self._frameIndex.get(frameName)
+        if index == None:
+            index = len(self.frames)
+            self.frames.append(frameName)
+            self._frameIndex[frameName] = index
+        return index
+
+    def span(self, frameName):
+        '''
+        returns a context manager recording a span, for code that is not a wrapped method
+        '''
+        return _Span(self, frameName)
+
+    def start(self):
+        self.events = []
+        self._start = time.perf_counter()
+        self._end = None
+
+    def stop(self):
+        '''
+        stops recording and puts the original methods back
+        '''
+        self._end = time.perf_counter()
+        for cls, name, original in reversed(self._wrapped):
+            setattr(cls, name, original)
+        self._wrapped = []
+
+    def summary(self):
+        '''
+        returns a dictionary with the frame names as keys and (calls, totalSeconds,
+        selfSeconds) tuples as values, recursive calls are counted once in the total
+        '''
+        calls = [0] * len(self.frames)
+        total = [0.0] * len(self.frames)
+        selfTime = [0.0] * len(self.frames)
+        stack = []
+        for kind, frame, at in self.events:
+            if kind == 'O':
+                calls[frame] += 1
+                stack.append([frame, at, 0.0])
+            else:
+                frame, opened, children = stack.pop()
+                duration = at - opened
+                selfTime[frame] += duration - children
+                if not any(entry[0] == frame for entry in stack):
+                    total[frame] += duration
+                if stack:
+                    stack[-1][2] += duration
+        return dict((name, (calls[i], total[i], selfTime[i])) for i, name in enumerate(self.frames))
+
+    def report(self, top=20):
+        '''
+        returns the frames with the most self time as text
+        '''
+        rows = sorted(self.summary().items(), key=lambda item: item[1][2], reverse=True)
+        lines = ['%-40s %8s %12s %12s' % ('operation', 'calls', 'total ms', 'self ms')]
+        for name, (calls, total, selfTime) in rows[:top]:
+            lines.append('%-40s %8d %12.3f %12.3f' % (name, calls, total * 1000, selfTime * 1000))
+        return '\n'.join(lines)
+
+    def speedscope(self):
+        '''
+        returns the recorded spans as a speedscope evented profile
+        '''
+        end = self._end if self._end != None else time.perf_counter()
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': self.name,
+            'exporter': 'LaserCutCase Profiling',
+            'shared': {'frames': [{'name': name} for name in self.frames]},
+            'profiles': [{
+                'type': 'evented',
+                'name': self.name,
+                'unit': 'milliseconds',
+                'startValue': 0,
+                'endValue': (end - self._start) * 1000,
+                'events': [{'type': kind, 'frame': frame, 'at': (at - self._start) * 1000}
+                           for kind, frame, at in self.events],
+            }],
+        }
+
+    def writeSpeedscope(self, path):
+        with open(path, 'w') as file:
+            json.dump(self.speedscope(), file)
+
+
+class _Span:
+    def __init__(self, profiler, frameName):
+        self.profiler = profiler
+        self.frameName = frameName
+
+    def __enter__(self):
+        if self.profiler.active:
+            self.profiler.events.append(('O', self.profiler._frame(self.frameName), time.perf_counter()))
+        return self
+
+    def __exit__(self, excType, excValue, tb):
+        if self.profiler.active:
+            self.profiler.events.append(('C', self.profiler._frame(self.frameName), time.perf_counter()))
+        return False
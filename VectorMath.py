@@ -0,0 +1,301 @@
+# Description-Pure python 2D vector operations on whole point lists.
+#
+# The Sketch_Vector methods of the EZFusionAPI work on one vector at a time and
+# convert every point to a Point3D. The functions in here take python lists of
+# (x, y) tuples and compute whole outlines at once, only the final coordinates
+# need to be converted to Point3D objects at the Fusion 360 boundary.
+#
+# The conventions follow Sketch_Vector, e.g. the perpendicular of (x, y) is
+# (y, -x), which points to the outside of a counter clockwise outline.
+#
+# Outlines that are kept around are stored as PointArray, all coordinates in
+# one array of doubles instead of a tuple and two float objects per point.
+
+import math
+from array import array
+
+
+class PointArray:
+    '''
+    a compact sequence of 2D points
+
+    the coordinates are stored as x0, y0, x1, y1, ... in one array('d'), which
+    takes 16 bytes per point instead of about 100 for a (x, y) tuple in a list.
+    Reading a point returns a (x, y) tuple, so a PointArray can be used where a
+    list of points is read. Point3D objects are only created from it at the
+    Fusion 360 boundary.
+
+    points is an iterable of (x, y) tuples or another PointArray
+    '''
+
+    __slots__ = ('coordinates',)
+
+    def __init__(self, points=()):
+        self.coordinates = array('d')
+        self.extend(points)
+
+    @classmethod
+    def fromCoordinates(cls, coordinates):
+        '''
+        creates a PointArray from a flat sequence x0, y0, x1, y1, ...
+        '''
+        if len(coordinates) % 2:
+            raise Exception('coordinates must come in pairs of x and y')
+        points = cls()
+        points.coordinates.extend(coordinates)
+        return points
+
+    def append(self, point):
+        self.coordinates.append(point[0])
+        self.coordinates.append(point[1])
+
+    def extend(self, points):
+        if isinstance(points, PointArray):
+            self.coordinates.extend(points.coordinates)
+            return
+        coordinates = self.coordinates
+        for x, y in points:
+            coordinates.append(x)
+            coordinates.append(y)
+
+    def __len__(self):
+        return len(self.coordinates) // 2
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            points = PointArray()
+            if step == 1:
+                points.coordinates = self.coordinates[2 * start:2 * max(start, stop)]
+            else:
+                points.extend(self[i] for i in range(start, stop, step))
+            return points
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('point index out of range')
+        return self.coordinates[2 * index], self.coordinates[2 * index + 1]
+
+    def __iter__(self):
+        values = iter(self.coordinates)
+        return zip(values, values)
+
+    def __reversed__(self):
+        coordinates = self.coordinates
+        for i in range(len(coordinates) - 2, -1, -2):
+            yield coordinates[i], coordinates[i + 1]
+
+    def __eq__(self, other):
+        if isinstance(other, PointArray):
+            return self.coordinates == other.coordinates
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return 'PointArray(%r)' % list(self)
+
+    def translated(self, dx, dy):
+        '''
+        returns a copy moved by (dx, dy)
+        '''
+        points = PointArray()
+        points.extend((x + dx, y + dy) for x, y in self)
+        return points
+
+    def bounds(self):
+        '''
+        returns the (minX, minY, maxX, maxY) bounding box of the points
+        '''
+        xs = self.coordinates[0::2]
+        ys = self.coordinates[1::2]
+        return min(xs), min(ys), max(xs), max(ys)
+
+
+def segmentVectors(points, closed=False):
+    '''
+    calculates the vectors pointing from every point to the next point
+
+    points is a list of (x, y) tuples
+    closed is a bool and adds the vector from the last to the first point
+
+    returns a list of vectors
+    '''
+    vectors = [(x2 - x1, y2 - y1) for (x1, y1), (x2, y2) in zip(points, points[1:])]
+    if closed and len(points) > 1:
+        (x1, y1), (x2, y2) = points[-1], points[0]
+        vectors.append((x2 - x1, y2 - y1))
+    return vectors
+
+
+def magnitudes(vectors):
+    '''
+    returns a list of the magnitudes of the vectors
+    '''
+    return [math.sqrt(x * x + y * y) for x, y in vectors]
+
+
+def unitVectors(vectors):
+    '''
+    returns a list of the unit vectors of the vectors
+    '''
+    result = []
+    for x, y in vectors:
+        length = math.sqrt(x * x + y * y)
+        result.append((x / length, y / length))
+    return result
+
+
+def perpendicularUnitVectors(vectors):
+    '''
+    returns a list of unit vectors perpendicular to the vectors
+    '''
+    result = []
+    for x, y in vectors:
+        length = math.sqrt(x * x + y * y)
+        result.append((y / length, -x / length))
+    return result
+
+
+def scaleVectors(vectors, scale):
+    '''
+    scales the vectors
+
+    scale is a number or a list of numbers with one scale per vector
+    '''
+    if isinstance(scale, (int, float)):
+        return [(x * scale, y * scale) for x, y in vectors]
+    return [(x * s, y * s) for (x, y), s in zip(vectors, scale)]
+
+
+def addVectorsToPoints(vectors, points):
+    '''
+    returns a list of the points moved by the vectors
+    '''
+    return [(px + vx, py + vy) for (vx, vy), (px, py) in zip(vectors, points)]
+
+
+def dotProducts(vectors1, vectors2):
+    '''
+    returns a list of the dot products of the pairs of vectors
+    '''
+    return [x1 * x2 + y1 * y2 for (x1, y1), (x2, y2) in zip(vectors1, vectors2)]
+
+
+def crossProducts(vectors1, vectors2):
+    '''
+    returns a list of the scalar cross products of the pairs of vectors
+    '''
+    return [x1 * y2 - y1 * x2 for (x1, y1), (x2, y2) in zip(vectors1, vectors2)]
+
+
+def sweptAngles(vectors1, vectors2):
+    '''
+    returns a list of the angles in radians between the pairs of vectors
+    (note, will always return minor angle)
+    '''
+    angles = []
+    for (x1, y1), (x2, y2) in zip(vectors1, vectors2):
+        cosTheta = (x1 * x2 + y1 * y2) / math.sqrt((x1 * x1 + y1 * y1) * (x2 * x2 + y2 * y2))
+        angles.append(math.acos(max(-1.0, min(1.0, cosTheta))))
+    return angles
+
+
+def offsetOutline(points, distance, closed=True):
+    '''
+    offsets every segment of an outline by distance along its perpendicular
+
+    the corners are mitered, so a segment stays parallel to its original and
+    moves exactly by distance. A positive distance grows a counter clockwise
+    outline. Consecutive duplicate points must be removed before.
+
+    returns a PointArray of the offset points
+    '''
+    normals = perpendicularUnitVectors(segmentVectors(points, closed=closed))
+    count = len(points)
+    result = PointArray()
+    for i, (x, y) in enumerate(points):
+        if closed:
+            n1 = normals[i - 1]
+            n2 = normals[i % len(normals)]
+        else:
+            n1 = normals[max(i - 1, 0)]
+            n2 = normals[min(i, count - 2)]
+        mx = n1[0] + n2[0]
+        my = n1[1] + n2[1]
+        # |n1 + n2| is 2 cos(h) and the miter length is distance / cos(h), where h
+        # is half the angle between the normals, (n1 + n2) . n1 / 2 is cos(h)^2
+        cosHalfSquared = (mx * n1[0] + my * n1[1]) / 2
+        if cosHalfSquared < 1e-9:
+            # the outline reverses on itself, move along the incoming normal only
+            result.append((x + n1[0] * distance, y + n1[1] * distance))
+            continue
+        scale = distance / (2 * cosHalfSquared)
+        result.append((x + mx * scale, y + my * scale))
+    return result
+
+
+def tangentArc(start, end, tangent):
+    '''
+    calculates the arc from start to end that leaves start along tangent
+
+    start and end are (x, y) tuples, tangent is a unit vector. The centre of the
+    arc lies on the normal n of the tangent at the signed radius r = |c|^2 / (2 c.n),
+    where c is the chord from start to end. The arc sweeps twice the angle between
+    the tangent and the chord.
+
+    returns (midpoint, endTangent) with the point halfway along the arc and the
+    unit tangent of the arc at end
+    '''
+    tx, ty = tangent
+    cx = end[0] - start[0]
+    cy = end[1] - start[1]
+    # normal to the left of the tangent
+    nx, ny = -ty, tx
+    cn = cx * nx + cy * ny
+    if abs(cn) < 1e-12:
+        raise Exception('the end point of the arc lies on the tangent of its start point')
+    r = (cx * cx + cy * cy) / (2 * cn)
+    centreX = start[0] + r * nx
+    centreY = start[1] + r * ny
+
+    # counter clockwise if the centre is left of the tangent
+    sign = 1.0 if r > 0 else -1.0
+    halfSweep = sign * math.atan2(abs(tx * cy - ty * cx), tx * cx + ty * cy)
+    cosA = math.cos(halfSweep)
+    sinA = math.sin(halfSweep)
+    ux = start[0] - centreX
+    uy = start[1] - centreY
+    midpoint = (centreX + ux * cosA - uy * sinA, centreY + ux * sinA + uy * cosA)
+
+    # the tangent turns by the whole sweep
+    cosB = cosA * cosA - sinA * sinA
+    sinB = 2 * sinA * cosA
+    return midpoint, (tx * cosB - ty * sinB, tx * sinB + ty * cosB)
+
+
+def tangentArcMidpoints(points, commands):
+    '''
+    calculates the arcs of a chain of lines and tangent arcs
+
+    points is a list of (x, y) tuples, commands is a list with 'l' or 'a' for
+    every segment from points[i] to points[i + 1]. Every arc is tangent to the
+    segment before, the first segment must be a line.
+
+    returns a list with the midpoint of every arc and None for every line
+    '''
+    result = []
+    tangent = None
+    for i, command in enumerate(commands):
+        start = points[i]
+        end = points[i + 1]
+        if command == 'l':
+            dx = end[0] - start[0]
+            dy = end[1] - start[1]
+            length = math.sqrt(dx * dx + dy * dy)
+            tangent = (dx / length, dy / length)
+            result.append(None)
+        else:
+            if tangent == None:
+                raise Exception('an arc needs a line or an arc before it')
+            midpoint, tangent = tangentArc(start, end, tangent)
+            result.append(midpoint)
+    return result
@@ -0,0 +1,397 @@
+# Description-Benchmark suite of the case generation against the headless adsk stand-in.
+#
+# Times Case.buildCase, Sketch_Create.curveChain, Sketch_Create.rectangle, the
+# joint geometry, batch builds and the nesting of about 500 panels over a sweep
+# of finger counts, point counts and batch sizes. Every benchmark reports the
+# API calls, the simulated API time, the wall time and the peak python memory.
+# The points benchmarks hold 100k points as tuples, as PointArray and as
+# Point3D objects to compare the memory of the representations. The nesting
+# benchmarks with a kerf first check that the packed outlines stay on the
+# sheets and do not overlap, the rebuild benchmarks check that two rebuilds
+# leave one timeline group.
+#
+# The API calls and the memory do not depend on the machine, they are compared
+# against the stored baseline. Wall time is only compared with --time, since
+# it depends on the machine the baseline was taken on.
+#
+# Use:
+#  python benchmarks/CaseBenchmark.py                 run and print
+#  python benchmarks/CaseBenchmark.py --save          run and store the baseline
+#  python benchmarks/CaseBenchmark.py --compare       run and fail on regressions
+#  python benchmarks/CaseBenchmark.py --compare --time
+#  python benchmarks/CaseBenchmark.py geometry        only benchmarks starting with geometry
+
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'headless'))
+import HeadlessFusion
+
+baselineFile = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# allowed growth against the baseline before a comparison fails
+tolerances = {'apiCalls': 0.02, 'peakKiB': 0.25, 'wallSeconds': 0.5}
+
+# case size of the sweeps in cm
+caseSize = (30.0, 20.0, 10.0)
+materialThickness = 0.4
+
+
+def fingerWidthFor(fingers, length=caseSize[0]):
+    '''
+    returns the finger width that gives about fingers fingers along length
+    '''
+    return length / fingers
+
+
+def benchGeometry(fingers, cases):
+    LaserCutCase = HeadlessFusion.loadScript('LaserCutCase')
+    CaseGeometry = HeadlessFusion.loadScript('CaseGeometry')
+
+    def run():
+        CaseGeometry.clearPatternCache()
+        for i in range(cases):
+            # every case a bit longer, so the patterns are not all shared
+            geometry = LaserCutCase.CaseGeometry(caseSize[0] + i * 0.1, caseSize[1], caseSize[2],
+                                                 materialThickness, fingerWidthFor(fingers))
+            for panel in geometry.panels():
+                panel.outline()
+    return run
+
+
+def benchBuildCase(fingers):
+    LaserCutCase = HeadlessFusion.loadScript('LaserCutCase')
+
+    def run():
+        case = LaserCutCase.Case()
+        case.width, case.length, case.height = caseSize
+        case.materialThickness = materialThickness
+        case.fingerWidth = fingerWidthFor(fingers)
+        case.buildCase()
+    return run
+
+
+def checkTimelineGroups(name):
+    '''
+    raises an Exception if the timeline has not exactly one group named name
+    '''
+    import adsk.core
+    import adsk.fusion
+    design = adsk.fusion.Design.cast(adsk.core.Application.get().activeProduct)
+    groups = [group for group in design.timeline.timelineGroups if group.name == name]
+    if len(groups) != 1:
+        raise Exception('%d timeline groups named %s' % (len(groups), name))
+
+
+def benchRebuildCase(fingers):
+    LaserCutCase = HeadlessFusion.loadScript('LaserCutCase')
+
+    def setup():
+        case = LaserCutCase.Case()
+        case.width, case.length, case.height = caseSize
+        case.materialThickness = materialThickness
+        case.fingerWidth = fingerWidthFor(fingers)
+        case.buildCase()
+        # every rebuild regroups the timeline entries of the case
+        for _ in range(2):
+            case.height += 1.0
+            case.buildCase()
+        checkTimelineGroups(case.name)
+        return case
+
+    def run(case):
+        case.height += 1.0
+        case.buildCase()
+    return run, setup
+
+
+def zigzag(points):
+    '''
+    returns a closed rectilinear outline with about points points
+    '''
+    teeth = max(1, points // 4)
+    outline = []
+    for i in range(teeth):
+        outline.append((i * 2.0, 0.0))
+        outline.append((i * 2.0, 1.0))
+        outline.append((i * 2.0 + 1.0, 1.0))
+        outline.append((i * 2.0 + 1.0, 0.0))
+    outline.append((teeth * 2.0, -5.0))
+    outline.append((0.0, -5.0))
+    return outline
+
+
+def benchCurveChain(points, arcs):
+    EasyFusionAPI = HeadlessFusion.loadScript('EasyFusionAPI')
+
+    def run():
+        fa = EasyFusionAPI.EZFusionAPI()
+        sketch = fa.EZSketch(fa.__base__.rootComp.xYConstructionPlane)
+        chain = []
+        for i, point in enumerate(zigzag(points)):
+            if arcs and i % 8 == 4:
+                chain.append('a')
+            chain.append(point)
+        sketch.create.curveChain(chain, close=True, bulk=True)
+    return run
+
+
+def benchRectangle(count):
+    EasyFusionAPI = HeadlessFusion.loadScript('EasyFusionAPI')
+
+    def run():
+        fa = EasyFusionAPI.EZFusionAPI()
+        sketch = fa.EZSketch(fa.__base__.rootComp.xYConstructionPlane)
+        columns = int(math.ceil(math.sqrt(count)))
+        for i in range(count):
+            x = (i % columns) * 2.0
+            y = (i // columns) * 2.0
+            sketch.create.rectangle([(x, y, 0), (x + 1.0, y + 1.0, 0)], '2PR')
+    return run
+
+
+def benchBatch(cases):
+    CaseBatch = HeadlessFusion.loadScript('CaseBatch')
+
+    def run():
+        # every second case repeats the dimensions of the case before
+        specs = []
+        for i in range(cases):
+            size = i // 2
+            specs.append({'name': 'Case%d' % i, 'materialThickness': '4',
+                          'width': str(200 + size * 10), 'length': '150', 'height': '80'})
+        CaseBatch.buildCases(specs)
+    return run
+
+
+def _crosses(a, b):
+    '''
+    returns True if the segments a and b cross, touching segments do not cross
+    '''
+    def side(p, q, r):
+        value = (q[0] - p[0]) * (r[1] - p[1]) - (q[1] - p[1]) * (r[0] - p[0])
+        return 0 if abs(value) < 1e-9 else (1 if value > 0 else -1)
+    return side(a[0], a[1], b[0]) * side(a[0], a[1], b[1]) < 0 and side(b[0], b[1], a[0]) * side(b[0], b[1], a[1]) < 0
+
+
+def _inside(point, segments):
+    '''
+    returns True if point is inside the closed outline and not on it
+    '''
+    x, y = point
+    inside = False
+    for (x1, y1), (x2, y2) in segments:
+        if min(x1, x2) - 1e-9 <= x <= max(x1, x2) + 1e-9 and min(y1, y2) - 1e-9 <= y <= max(y1, y2) + 1e-9 \
+                and abs((x2 - x1) * (y - y1) - (y2 - y1) * (x - x1)) < 1e-9:
+            return False
+        if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+            inside = not inside
+    return inside
+
+
+def checkSheets(sheets):
+    '''
+    raises an Exception if an outline leaves its sheet or two outlines on a sheet overlap
+    '''
+    for number, sheet in enumerate(sheets):
+        outlines = []
+        for placement in sheet.placements:
+            points = placement.outline()
+            xs = [x for x, _ in points]
+            ys = [y for _, y in points]
+            box = (min(xs), min(ys), max(xs), max(ys))
+            if box[0] < sheet.spacing - 1e-9 or box[1] < sheet.spacing - 1e-9 \
+                    or box[2] > sheet.width - sheet.spacing + 1e-9 or box[3] > sheet.height - sheet.spacing + 1e-9:
+                raise Exception('%s leaves sheet %d' % (placement.name, number + 1))
+            segments = list(zip(points, list(points[1:]) + [points[0]]))
+            outlines.append((placement.name, box, points, segments))
+        for i, (name, box, points, segments) in enumerate(outlines):
+            for otherName, otherBox, otherPoints, otherSegments in outlines[i + 1:]:
+                # only the parts of the outlines in the common box can overlap
+                low = (max(box[0], otherBox[0]) - 1e-9, max(box[1], otherBox[1]) - 1e-9)
+                high = (min(box[2], otherBox[2]) + 1e-9, min(box[3], otherBox[3]) + 1e-9)
+                if low[0] >= high[0] or low[1] >= high[1]:
+                    continue
+
+                def near(segment):
+                    (x1, y1), (x2, y2) = segment
+                    return max(x1, x2) >= low[0] and min(x1, x2) <= high[0] \
+                        and max(y1, y2) >= low[1] and min(y1, y2) <= high[1]
+                near1 = [segment for segment in segments if near(segment)]
+                near2 = [segment for segment in otherSegments if near(segment)]
+                overlap = any(_crosses(a, b) for a in near1 for b in near2) \
+                    or any(_inside(((a[0][0] + a[1][0]) / 2, (a[0][1] + a[1][1]) / 2), otherSegments) for a in near1) \
+                    or any(_inside(((b[0][0] + b[1][0]) / 2, (b[0][1] + b[1][1]) / 2), segments) for b in near2)
+                if overlap:
+                    raise Exception('%s overlaps %s on sheet %d' % (name, otherName, number + 1))
+
+
+def benchNesting(cases, polygon, kerf=0.0):
+    LaserCutCase = HeadlessFusion.loadScript('LaserCutCase')
+    Nesting = HeadlessFusion.loadScript('Nesting')
+
+    def nester():
+        return Nesting.Nester(122.0, 61.0, spacing=0.0 if polygon else 0.3, polygon=polygon)
+
+    def setup():
+        # cases of a few different sizes, the panels are computed before the run,
+        # with a kerf every fourth case has rounded corners
+        panels = []
+        for i in range(cases):
+            size = (10.0 + (i % 7) * 2.5, 8.0 + (i % 5) * 2.0, 5.0 + (i % 3) * 2.0, materialThickness, 1.0)
+            if kerf > 0 and i % 4 == 3:
+                geometry = LaserCutCase.HingeCaseGeometry(*size, cornerRadius=2.0, kerf=kerf)
+            else:
+                geometry = LaserCutCase.CaseGeometry(*size, kerf=kerf)
+            panels.append(('Case%d' % i, geometry.panels()))
+        if kerf > 0:
+            # the kerf compensated outlines have to stay on the sheets and apart
+            checked = nester()
+            for label, casePanels in panels:
+                checked.addPanels(casePanels, label)
+            checkSheets(checked.pack())
+        return panels
+
+    def run(panels):
+        packer = nester()
+        for label, casePanels in panels:
+            packer.addPanels(casePanels, label)
+        packer.pack()
+    return run, setup
+
+
+def benchPoints(representation, count=100000):
+    VectorMath = HeadlessFusion.loadScript('VectorMath')
+    import adsk.core
+
+    def run():
+        coordinates = ((i * 0.1, (i % 100) * 0.1) for i in range(count))
+        if representation == 'tuples':
+            points = list(coordinates)
+        elif representation == 'array':
+            points = VectorMath.PointArray(coordinates)
+        else:
+            points = [adsk.core.Point3D.create(x, y, 0) for x, y in coordinates]
+        return len(points)
+    return run
+
+
+def benchmarks():
+    '''
+    returns a list of (name, run, setup) tuples, setup may be None
+    '''
+    result = []
+    for fingers in (5, 21, 101, 401):
+        result.append(('geometry/fingers=%d' % fingers, benchGeometry(fingers, 1), None))
+    for cases in (10, 100, 1000):
+        result.append(('geometry/panels=%d' % (cases * 6), benchGeometry(21, cases), None))
+    for fingers in (5, 21, 101):
+        result.append(('buildCase/fingers=%d' % fingers, benchBuildCase(fingers), None))
+        run, setup = benchRebuildCase(fingers)
+        result.append(('rebuildCase/fingers=%d' % fingers, run, setup))
+    for points in (100, 1000):
+        result.append(('curveChain/lines/points=%d' % points, benchCurveChain(points, False), None))
+    for points in (20, 100):
+        result.append(('curveChain/arcs/points=%d' % points, benchCurveChain(points, True), None))
+    for count in (10, 100):
+        result.append(('rectangle/count=%d' % count, benchRectangle(count), None))
+    for cases in (2, 10, 40):
+        result.append(('batch/cases=%d' % cases, benchBatch(cases), None))
+    for polygon in (False, True):
+        run, setup = benchNesting(84, polygon)
+        result.append(('nesting/%s/panels=504' % ('polygon' if polygon else 'rectangles'), run, setup))
+        run, setup = benchNesting(84, polygon, kerf=0.02)
+        result.append(('nesting/%s/kerf/panels=441' % ('polygon' if polygon else 'rectangles'), run, setup))
+    for representation in ('tuples', 'array', 'point3d'):
+        result.append(('points/%s=100000' % representation, benchPoints(representation), None))
+    return result
+
+
+def measure(run, setup):
+    '''
+    runs a benchmark twice in a new document, once for the time and the API
+    calls and once with tracemalloc for the peak memory
+    '''
+    stats = HeadlessFusion.stats()
+    result = {}
+    for traced in (False, True):
+        HeadlessFusion.newDocument()
+        args = (setup(),) if setup != None else ()
+        stats.reset()
+        if traced:
+            tracemalloc.start()
+        start = time.perf_counter()
+        run(*args)
+        wall = time.perf_counter() - start
+        if traced:
+            result['peakKiB'] = tracemalloc.get_traced_memory()[1] / 1024
+            tracemalloc.stop()
+        else:
+            result['wallSeconds'] = wall
+            result['apiCalls'] = stats.total
+            result['simulatedSeconds'] = stats.simulatedTime
+    return result
+
+
+def compare(results, baseline, checkTime):
+    '''
+    returns a list of regressions against the baseline as text
+    '''
+    regressions = []
+    keys = ['apiCalls', 'peakKiB'] + (['wallSeconds'] if checkTime else [])
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        for key in keys:
+            old = baseline[name][key]
+            new = result[key]
+            # tiny absolute values only regress past a floor, memory noise is a few KiB
+            floor = {'apiCalls': 0, 'peakKiB': 16, 'wallSeconds': 0.005}[key]
+            if new > old * (1 + tolerances[key]) and new - old > floor:
+                regressions.append('%s %s: %.4g -> %.4g (+%.0f %%)' % (name, key, old, new, (new / old - 1) * 100))
+    return regressions
+
+
+def main(args):
+    save = '--save' in args
+    checkCompare = '--compare' in args
+    checkTime = '--time' in args
+    prefixes = [arg for arg in args if not arg.startswith('--')]
+
+    results = {}
+    print('%-36s %10s %12s %12s %10s' % ('benchmark', 'API calls', 'simulated s', 'wall s', 'peak KiB'))
+    for name, run, setup in benchmarks():
+        if prefixes and not any(name.startswith(prefix) for prefix in prefixes):
+            continue
+        result = measure(run, setup)
+        results[name] = result
+        print('%-36s %10d %12.4f %12.4f %10.1f' % (name, result['apiCalls'], result['simulatedSeconds'],
+                                                   result['wallSeconds'], result['peakKiB']))
+
+    if save:
+        baseline = {}
+        if prefixes and os.path.exists(baselineFile):
+            with open(baselineFile) as file:
+                baseline = json.load(file)
+        baseline.update(results)
+        with open(baselineFile, 'w') as file:
+            json.dump(baseline, file, indent=1, sort_keys=True)
+        print('baseline saved to %s' % baselineFile)
+
+    if checkCompare:
+        with open(baselineFile) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, checkTime)
+        if regressions:
+            print('regressions:\n' + '\n'.join(regressions))
+            return 1
+        print('no regressions against %s' % baselineFile)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
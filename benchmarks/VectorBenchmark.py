@@ -0,0 +1,88 @@
+# Description-Micro benchmark of Sketch_Vector against the VectorMath list operations.
+#
+# Runs the guess point calculation of Sketch_Create.curveChain for every vertex
+# of a polygon, once per vertex with Sketch_Vector on Point3D objects and once
+# for the whole polygon with VectorMath, and prints wall time and API calls.
+#
+# Use: python benchmarks/VectorBenchmark.py [vertexCount ...]
+
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'headless'))
+import HeadlessFusion
+
+
+def polygon(n, radius=10.0):
+    return [(radius * math.cos(2 * math.pi * i / n), radius * math.sin(2 * math.pi * i / n)) for i in range(n)]
+
+
+def guessPointsSketchVector(vector, points, step):
+    adsk = HeadlessFusion.install()
+    pts = [adsk.core.Point3D.create(x, y, 0) for x, y in points]
+    guessPoints = []
+    for i in range(len(pts) - 1):
+        lineStart = pts[i]
+        lineEnd = pts[i + 1]
+        # guess point just past the end of the previous line
+        vect = vector.fromPoints(lineStart, lineEnd)
+        unitVect = vector.unitVector(vect)
+        length = vector.magnitude(vect) + step
+        guessPoint = vector.addVectorAndPoint(vector.scaleVector(unitVect, length), lineStart)
+        # guess points on both sides of the end of the line
+        perpVect = vector.scaleVector(vector.perpendicularUnitVector(vect), step)
+        guessPoint1 = vector.addVectorAndPoint(perpVect, lineEnd)
+        perpVect = vector.scaleVector(vector.scaleVector(vector.perpendicularUnitVector(vect), -1), step)
+        guessPoint2 = vector.addVectorAndPoint(perpVect, lineEnd)
+        angle = vector.sweptAngle(vect, vector.fromPoints(lineStart, guessPoint1))
+        guessPoints.append((guessPoint, guessPoint1, guessPoint2, angle))
+    return guessPoints
+
+
+def guessPointsVectorMath(VectorMath, points, step):
+    adsk = HeadlessFusion.install()
+    vects = VectorMath.segmentVectors(points)
+    starts = points[:-1]
+    ends = points[1:]
+    lengths = [length + step for length in VectorMath.magnitudes(vects)]
+    guessPoints = VectorMath.addVectorsToPoints(VectorMath.scaleVectors(VectorMath.unitVectors(vects), lengths), starts)
+    perpVects = VectorMath.perpendicularUnitVectors(vects)
+    guessPoints1 = VectorMath.addVectorsToPoints(VectorMath.scaleVectors(perpVects, step), ends)
+    guessPoints2 = VectorMath.addVectorsToPoints(VectorMath.scaleVectors(perpVects, -step), ends)
+    guessVects = [(gx - sx, gy - sy) for (sx, sy), (gx, gy) in zip(starts, guessPoints1)]
+    angles = VectorMath.sweptAngles(vects, guessVects)
+    # only the final coordinates cross the Fusion 360 boundary
+    create = adsk.core.Point3D.create
+    return [(create(g[0], g[1], 0), create(g1[0], g1[1], 0), create(g2[0], g2[1], 0), a)
+            for g, g1, g2, a in zip(guessPoints, guessPoints1, guessPoints2, angles)]
+
+
+def measure(function, *args):
+    stats = HeadlessFusion.stats()
+    stats.reset()
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, stats.total, result
+
+
+def main(counts):
+    EasyFusionAPI = HeadlessFusion.loadScript('EasyFusionAPI')
+    VectorMath = HeadlessFusion.loadScript('VectorMath')
+    HeadlessFusion.newDocument()
+    vector = EasyFusionAPI.EZFusionAPI().EZSketch().vector
+    step = 1e-4
+
+    print('%8s %14s %12s %14s %12s %8s' % ('vertices', 'Sketch_Vector', 'API calls', 'VectorMath', 'API calls', 'speedup'))
+    for n in counts:
+        points = polygon(n)
+        t1, calls1, result1 = measure(guessPointsSketchVector, vector, points, step)
+        t2, calls2, result2 = measure(guessPointsVectorMath, VectorMath, points, step)
+        for (a, a1, a2, angle), (b, b1, b2, angleB) in zip(result1, result2):
+            assert a.isEqualTo(b) and a1.isEqualTo(b1) and a2.isEqualTo(b2) and abs(angle - angleB) < 1e-9
+        print('%8d %12.4f s %12d %12.4f s %12d %7.1fx' % (n, t1, calls1, t2, calls2, t1 / t2))
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [100, 1000, 10000])
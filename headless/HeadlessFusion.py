@@ -0,0 +1,55 @@
+# Description-Runs the laser cut case scripts without Fusion 360.
+#
+# Use:
+#  import HeadlessFusion
+#  HeadlessFusion.install()
+#  LaserCutCase = HeadlessFusion.loadScript('LaserCutCase')
+#  LaserCutCase.Case().buildCase()
+#  print(HeadlessFusion.stats().report())
+
+import importlib
+import os
+import sys
+
+headlessFolder = os.path.dirname(os.path.abspath(__file__))
+scriptFolder = os.path.dirname(headlessFolder)
+scriptPackageName = 'lasercutcase'
+
+
+def install():
+    '''
+    puts the headless adsk package in front of sys.path, so "import adsk"
+    resolves to the stand-in
+    '''
+    if headlessFolder not in sys.path:
+        sys.path.insert(0, headlessFolder)
+    import adsk.core
+    import adsk.fusion
+    return adsk
+
+
+def loadScript(moduleName='LaserCutCase'):
+    '''
+    imports a module of the script folder like Fusion 360 does, as part of a
+    package, so the relative imports between the script modules work
+
+    the package is headless/lasercutcase, which points to the script folder
+    '''
+    install()
+    return importlib.import_module('%s.%s' % (scriptPackageName, moduleName))
+
+
+def newDocument():
+    '''
+    replaces the active design with an empty one and clears the API counters
+    '''
+    adsk = install()
+    adsk.core.Application._fakeReset()
+    return adsk.core.Application.get().activeProduct
+
+
+def stats():
+    '''
+    returns the API call counters of the stand-in
+    '''
+    return install().stats
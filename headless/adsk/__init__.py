@@ -0,0 +1,141 @@
+# Description-Headless stand-in for the Fusion 360 adsk package.
+#
+# Only the part of the API used by the EZFusionAPI and the laser cut case is
+# implemented, with just enough geometry to keep the scripts running. Every
+# API call is counted in adsk.stats and charged a simulated latency, so API
+# round trips of the scripts can be measured on machines without Fusion 360.
+#
+# Use:
+#  1) put the headless folder on sys.path (see headless/HeadlessFusion.py)
+#  2) "import adsk.core, adsk.fusion" resolves to this package
+#  3) read adsk.stats.counts / adsk.stats.simulatedTime after running a script
+
+
+class ApiStats:
+    '''
+    collects the number of calls and the simulated latency of every API member
+
+    latency is the simulated time in seconds of a call not listed in latencies
+    latencies is a dictionary of 'Class.member' names to simulated seconds
+    '''
+
+    def __init__(self):
+        self.latency = 50e-6
+        self.latencies = {
+            'Sketches.add': 5e-3,
+            'Sketch.compute': 200e-6,
+            'ExtrudeFeatures.add': 20e-3,
+            'RevolveFeatures.add': 20e-3,
+            'Occurrences.addNewComponent': 5e-3,
+            'Occurrences.addExistingComponent': 2e-3,
+            'UserParameters.add': 1e-3,
+        }
+        self.reset()
+
+    def reset(self):
+        '''
+        clears all counters
+        '''
+        self.counts = {}
+        self.times = {}
+        self.simulatedTime = 0.0
+
+    def record(self, name, weight=1.0):
+        '''
+        records one call of the API member name
+
+        weight scales the simulated latency (e.g. a sketch solve scales with the
+        number of sketch entities)
+        '''
+        latency = self.latencies.get(name, self.latency) * weight
+        self.counts[name] = self.counts.get(name, 0) + 1
+        self.times[name] = self.times.get(name, 0.0) + latency
+        self.simulatedTime += latency
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+    def snapshot(self):
+        '''
+        returns a copy of the counters as a dictionary
+        '''
+        return {'total': self.total, 'simulatedTime': self.simulatedTime, 'counts': dict(self.counts)}
+
+    def report(self, top=20):
+        '''
+        returns a printable table of the most called API members
+        '''
+        lines = ['%d API calls, %.3f s simulated latency' % (self.total, self.simulatedTime)]
+        ordered = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+        for name, count in ordered[:top]:
+            lines.append('  %-45s %8d %10.4f s' % (name, count, self.times[name]))
+        return '\n'.join(lines)
+
+
+stats = ApiStats()
+
+
+def _instrument(className, memberName, func, isMethod=True):
+    if isMethod:
+        # record under the class of the instance, so inherited members are told apart
+        def wrapper(self, *args, **kwargs):
+            stats.record('%s.%s' % (type(self).__name__, memberName))
+            return func(self, *args, **kwargs)
+    else:
+        name = '%s.%s' % (className, memberName)
+
+        def wrapper(*args, **kwargs):
+            stats.record(name)
+            return func(*args, **kwargs)
+
+    wrapper.__name__ = getattr(func, '__name__', memberName)
+    wrapper.__doc__ = getattr(func, '__doc__', None)
+    return wrapper
+
+
+class ApiObjectType(type):
+    '''
+    metaclass that counts every call of a public method or property of the class
+
+    members starting with '__' or '_fake' are helpers of the stand-in and are
+    not counted, '_set_*' members are part of the API and are counted
+    '''
+
+    def __new__(mcs, className, bases, namespace):
+        for attrName, value in list(namespace.items()):
+            if attrName.startswith('__') or attrName.startswith('_fake'):
+                continue
+            if isinstance(value, property):
+                namespace[attrName] = property(
+                    _instrument(className, attrName, value.fget) if value.fget else None,
+                    _instrument(className, attrName + '=', value.fset) if value.fset else None)
+            elif isinstance(value, staticmethod):
+                namespace[attrName] = staticmethod(_instrument(className, attrName, value.__func__, False))
+            elif isinstance(value, classmethod):
+                namespace[attrName] = classmethod(_instrument(className, attrName, value.__func__, False))
+            elif callable(value):
+                namespace[attrName] = _instrument(className, attrName, value)
+        return super().__new__(mcs, className, bases, namespace)
+
+
+class ApiObject(metaclass=ApiObjectType):
+    pass
+
+
+_autoTerminate = True
+_terminated = False
+
+
+def terminate():
+    global _terminated
+    _terminated = True
+
+
+def autoTerminate(value):
+    global _autoTerminate
+    _autoTerminate = value
+
+
+def doEvents():
+    pass
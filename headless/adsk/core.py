@@ -0,0 +1,652 @@
+# Description-Headless stand-in for adsk.core, see headless/adsk/__init__.py
+
+import math
+import re
+
+import adsk
+from . import ApiObject
+
+# internal length unit of Fusion 360 is cm, internal angle unit is radians
+_unitFactors = {
+    '': 1.0,
+    'mm': 0.1,
+    'cm': 1.0,
+    'm': 100.0,
+    'in': 2.54,
+    'ft': 30.48,
+    'deg': math.pi / 180,
+    'rad': 1.0,
+}
+
+_valuePattern = re.compile(r'^\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*([a-zA-Z]*)\s*$')
+
+
+def _fakeEvaluate(expression, units='', parameters=None):
+    '''
+    evaluates "number [unit]" or a parameter name to internal units
+    '''
+    units = (units or '').strip()
+    match = _valuePattern.match(str(expression))
+    if match:
+        unit = match.group(2) or units
+        if unit not in _unitFactors:
+            raise RuntimeError('unknown unit %s' % unit)
+        return float(match.group(1)) * _unitFactors[unit]
+    if parameters is not None:
+        parameter = parameters._fakeFind(str(expression).strip())
+        if parameter is not None:
+            return parameter._fakeValue
+    raise RuntimeError('can not evaluate expression %s' % expression)
+
+
+class Point3D(ApiObject):
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self._x = float(x)
+        self._y = float(y)
+        self._z = float(z)
+
+    @staticmethod
+    def create(x=0.0, y=0.0, z=0.0):
+        return Point3D(x, y, z)
+
+    @property
+    def x(self):
+        return self._x
+
+    @x.setter
+    def x(self, value):
+        self._x = float(value)
+
+    @property
+    def y(self):
+        return self._y
+
+    @y.setter
+    def y(self, value):
+        self._y = float(value)
+
+    @property
+    def z(self):
+        return self._z
+
+    @z.setter
+    def z(self, value):
+        self._z = float(value)
+
+    def copy(self):
+        return Point3D(self._x, self._y, self._z)
+
+    def asArray(self):
+        return [self._x, self._y, self._z]
+
+    def _fakeDistance(self, point):
+        return math.sqrt((self._x - point._x) ** 2 + (self._y - point._y) ** 2 + (self._z - point._z) ** 2)
+
+    def distanceTo(self, point):
+        return self._fakeDistance(point)
+
+    def isEqualTo(self, point):
+        return self._fakeDistance(point) < 1e-10
+
+    def transformBy(self, matrix):
+        self._x, self._y, self._z = matrix._fakeApply((self._x, self._y, self._z), 1.0)
+        return True
+
+    def __repr__(self):
+        return 'Point3D(%g, %g, %g)' % (self._x, self._y, self._z)
+
+
+class Vector3D(ApiObject):
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self._x = float(x)
+        self._y = float(y)
+        self._z = float(z)
+
+    @staticmethod
+    def create(x=0.0, y=0.0, z=0.0):
+        return Vector3D(x, y, z)
+
+    @property
+    def x(self):
+        return self._x
+
+    @property
+    def y(self):
+        return self._y
+
+    @property
+    def z(self):
+        return self._z
+
+    @property
+    def length(self):
+        return math.sqrt(self._x ** 2 + self._y ** 2 + self._z ** 2)
+
+    def asArray(self):
+        return [self._x, self._y, self._z]
+
+    def copy(self):
+        return Vector3D(self._x, self._y, self._z)
+
+
+class Matrix3D(ApiObject):
+    def __init__(self):
+        self._rows = [[1.0, 0.0, 0.0, 0.0],
+                      [0.0, 1.0, 0.0, 0.0],
+                      [0.0, 0.0, 1.0, 0.0],
+                      [0.0, 0.0, 0.0, 1.0]]
+
+    @staticmethod
+    def create():
+        return Matrix3D()
+
+    def setWithCoordinateSystem(self, origin, xAxis, yAxis, zAxis):
+        for i, axis in enumerate((xAxis, yAxis, zAxis)):
+            for row, value in enumerate((axis._x, axis._y, axis._z)):
+                self._rows[row][i] = value
+        for row, value in enumerate((origin._x, origin._y, origin._z)):
+            self._rows[row][3] = value
+        return True
+
+    def getAsCoordinateSystem(self):
+        columns = [Vector3D(*[self._rows[row][i] for row in range(3)]) for i in range(3)]
+        origin = Point3D(*[self._rows[row][3] for row in range(3)])
+        return origin, columns[0], columns[1], columns[2]
+
+    @property
+    def translation(self):
+        return Vector3D(*[self._rows[row][3] for row in range(3)])
+
+    @translation.setter
+    def translation(self, vector):
+        for row, value in enumerate((vector._x, vector._y, vector._z)):
+            self._rows[row][3] = value
+
+    def asArray(self):
+        return [value for row in self._rows for value in row]
+
+    def copy(self):
+        matrix = Matrix3D()
+        matrix._rows = [list(row) for row in self._rows]
+        return matrix
+
+    def transformBy(self, matrix):
+        rows = matrix._rows
+        self._rows = [[sum(rows[i][k] * self._rows[k][j] for k in range(4)) for j in range(4)] for i in range(4)]
+        return True
+
+    def _fakeApply(self, xyz, w):
+        return tuple(sum(self._rows[row][i] * xyz[i] for i in range(3)) + self._rows[row][3] * w
+                     for row in range(3))
+
+
+class ValueInput(ApiObject):
+    def __init__(self, realValue=None, stringValue=None, objectValue=None):
+        self._realValue = realValue
+        self._stringValue = stringValue
+        self._objectValue = objectValue
+
+    @staticmethod
+    def createByReal(realValue):
+        return ValueInput(realValue=float(realValue))
+
+    @staticmethod
+    def createByString(stringValue):
+        return ValueInput(stringValue=stringValue)
+
+    @staticmethod
+    def createByObject(objectValue):
+        return ValueInput(objectValue=objectValue)
+
+    @property
+    def realValue(self):
+        return self._realValue
+
+    @property
+    def stringValue(self):
+        return self._stringValue
+
+    def _fakeExpression(self, units=''):
+        if self._stringValue is not None:
+            return self._stringValue
+        factor = _unitFactors.get((units or '').strip(), 1.0)
+        return ('%r %s' % (self._realValue / factor, units or '')).strip()
+
+
+class ObjectCollection(ApiObject):
+    def __init__(self):
+        self._items = []
+
+    @staticmethod
+    def create():
+        return ObjectCollection()
+
+    def add(self, item):
+        self._items.append(item)
+        return True
+
+    def item(self, index):
+        return self._items[index]
+
+    @property
+    def count(self):
+        return len(self._items)
+
+    def clear(self):
+        self._items = []
+        return True
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+
+class NamedValues(ApiObject):
+    def __init__(self):
+        self._values = {}
+
+    @staticmethod
+    def create():
+        return NamedValues()
+
+    def add(self, name, value):
+        self._values[name] = value
+        return True
+
+    @property
+    def count(self):
+        return len(self._values)
+
+
+class Attribute(ApiObject):
+    def __init__(self, attributes, groupName, name, value):
+        self._attributes = attributes
+        self._groupName = groupName
+        self._name = name
+        self._value = value
+
+    @property
+    def groupName(self):
+        return self._groupName
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = value
+
+    def deleteMe(self):
+        del self._attributes._items[(self._groupName, self._name)]
+        return True
+
+
+class Attributes(ApiObject):
+    def __init__(self):
+        self._items = {}
+
+    def add(self, groupName, name, value):
+        attribute = Attribute(self, groupName, name, value)
+        self._items[(groupName, name)] = attribute
+        return attribute
+
+    def itemByName(self, groupName, name):
+        return self._items.get((groupName, name))
+
+    @property
+    def count(self):
+        return len(self._items)
+
+
+# ______ Events and Commands _______
+class Event(ApiObject):
+    def __init__(self, sender=None):
+        self._handlers = []
+        self._sender = sender
+
+    def add(self, handler):
+        self._handlers.append(handler)
+        return True
+
+    def remove(self, handler):
+        self._handlers.remove(handler)
+        return True
+
+    def _fakeFire(self, args):
+        args.firingEvent = self
+        for handler in list(self._handlers):
+            handler.notify(args)
+
+    @property
+    def sender(self):
+        return self._sender
+
+
+class CommandCreatedEvent(Event):
+    pass
+
+
+class CommandEvent(Event):
+    pass
+
+
+class InputChangedEvent(Event):
+    pass
+
+
+class EventArgs:
+    def __init__(self):
+        self.firingEvent = None
+
+
+class CommandCreatedEventArgs(EventArgs):
+    def __init__(self, command):
+        super().__init__()
+        self.command = command
+
+
+class CommandEventArgs(EventArgs):
+    def __init__(self, command):
+        super().__init__()
+        self.command = command
+        self.isValidResult = False
+        self.executeFailed = False
+
+
+class InputChangedEventArgs(EventArgs):
+    def __init__(self, command, input):
+        super().__init__()
+        self.input = input
+        self.inputs = command.commandInputs
+
+
+class CommandEventHandler:
+    def notify(self, args):
+        pass
+
+
+class CommandCreatedEventHandler:
+    def notify(self, args):
+        pass
+
+
+class InputChangedEventHandler:
+    def notify(self, args):
+        pass
+
+
+class CommandInput(ApiObject):
+    def __init__(self, id, name):
+        self._id = id
+        self._name = name
+
+    @property
+    def id(self):
+        return self._id
+
+    @property
+    def name(self):
+        return self._name
+
+
+class StringValueCommandInput(CommandInput):
+    def __init__(self, id, name, value):
+        super().__init__(id, name)
+        self._value = value
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = value
+
+
+class ValueCommandInput(CommandInput):
+    def __init__(self, id, name, unitType, initialValue):
+        super().__init__(id, name)
+        self._unitType = unitType
+        self._expression = initialValue._fakeExpression(unitType)
+
+    @property
+    def expression(self):
+        return self._expression
+
+    @expression.setter
+    def expression(self, value):
+        self._expression = value
+
+    @property
+    def value(self):
+        return _fakeEvaluate(self._expression, self._unitType)
+
+    @property
+    def unitType(self):
+        return self._unitType
+
+
+class BoolValueCommandInput(CommandInput):
+    def __init__(self, id, name, value):
+        super().__init__(id, name)
+        self._value = value
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = value
+
+
+class CommandInputs(ApiObject):
+    def __init__(self, command):
+        self._command = command
+        self._inputs = []
+
+    def _fakeAdd(self, input):
+        self._inputs.append(input)
+        return input
+
+    def addStringValueInput(self, id, name, initialValue=''):
+        return self._fakeAdd(StringValueCommandInput(id, name, initialValue))
+
+    def addValueInput(self, id, name, unitType, initialValue):
+        return self._fakeAdd(ValueCommandInput(id, name, unitType, initialValue))
+
+    def addBoolValueInput(self, id, name, isCheckBox, resourceFolder='', initialValue=False):
+        return self._fakeAdd(BoolValueCommandInput(id, name, initialValue))
+
+    def itemById(self, id):
+        for input in self._inputs:
+            if input._id == id:
+                return input
+        return None
+
+    def item(self, index):
+        return self._inputs[index]
+
+    @property
+    def count(self):
+        return len(self._inputs)
+
+    @property
+    def command(self):
+        return self._command
+
+    def __iter__(self):
+        return iter(list(self._inputs))
+
+
+class Command(ApiObject):
+    def __init__(self, parentCommandDefinition):
+        self._parentCommandDefinition = parentCommandDefinition
+        self._commandInputs = CommandInputs(self)
+        self._execute = CommandEvent(self)
+        self._executePreview = CommandEvent(self)
+        self._destroy = CommandEvent(self)
+        self._inputChanged = InputChangedEvent(self)
+        self.isRepeatable = True
+
+    @property
+    def commandInputs(self):
+        return self._commandInputs
+
+    @property
+    def execute(self):
+        return self._execute
+
+    @property
+    def executePreview(self):
+        return self._executePreview
+
+    @property
+    def destroy(self):
+        return self._destroy
+
+    @property
+    def inputChanged(self):
+        return self._inputChanged
+
+    @property
+    def parentCommandDefinition(self):
+        return self._parentCommandDefinition
+
+    def _fakeChangeInput(self, id, value):
+        '''
+        sets the value or expression of an input like a user in the dialog and
+        fires inputChanged and executePreview
+        '''
+        input = self._commandInputs.itemById(id)
+        if isinstance(input, ValueCommandInput):
+            input._expression = value
+        else:
+            input._value = value
+        self._inputChanged._fakeFire(InputChangedEventArgs(self, input))
+        self._fakeUndoPreview()
+        self._executePreview._fakeFire(CommandEventArgs(self))
+
+    def _fakeUndoPreview(self):
+        '''
+        deletes the custom graphics of the root component, like Fusion 360 drops
+        what the last preview created before the next preview or execute
+        '''
+        product = Application.get().activeProduct
+        if product != None:
+            product.rootComponent.customGraphicsGroups._items.clear()
+
+
+class CommandDefinition(ApiObject):
+    def __init__(self, id, name, tooltip):
+        self._id = id
+        self._name = name
+        self._tooltip = tooltip
+        self._commandCreated = CommandCreatedEvent(self)
+        self._lastCommand = None
+
+    @property
+    def id(self):
+        return self._id
+
+    @property
+    def commandCreated(self):
+        return self._commandCreated
+
+    def execute(self, inputs=None):
+        '''
+        runs the command like a user who opens the dialog and presses OK
+        '''
+        command = Command(self)
+        self._lastCommand = command
+        self._commandCreated._fakeFire(CommandCreatedEventArgs(command))
+        command._executePreview._fakeFire(CommandEventArgs(command))
+        command._fakeUndoPreview()
+        command._execute._fakeFire(CommandEventArgs(command))
+        command._destroy._fakeFire(CommandEventArgs(command))
+        return True
+
+
+class CommandDefinitions(ApiObject):
+    def __init__(self):
+        self._definitions = {}
+
+    def itemById(self, id):
+        return self._definitions.get(id)
+
+    def addButtonDefinition(self, id, name, tooltip, resourceFolder=''):
+        definition = CommandDefinition(id, name, tooltip)
+        self._definitions[id] = definition
+        return definition
+
+    @property
+    def count(self):
+        return len(self._definitions)
+
+
+class UserInterface(ApiObject):
+    def __init__(self):
+        self._commandDefinitions = CommandDefinitions()
+        self._messages = []
+
+    def messageBox(self, text, title='', buttons=0, icon=0):
+        self._messages.append(text)
+        return 0
+
+    @property
+    def commandDefinitions(self):
+        return self._commandDefinitions
+
+    @property
+    def activeSelections(self):
+        return ObjectCollection()
+
+
+class MaterialLibraries(ApiObject):
+    def itemByName(self, name):
+        return None
+
+
+class Application(ApiObject):
+    _fakeInstance = None
+
+    def __init__(self):
+        self._userInterface = UserInterface()
+        self._activeProduct = None
+        self._materialLibraries = MaterialLibraries()
+
+    @staticmethod
+    def get():
+        if Application._fakeInstance is None:
+            Application._fakeInstance = Application()
+        return Application._fakeInstance
+
+    @property
+    def userInterface(self):
+        return self._userInterface
+
+    @property
+    def activeProduct(self):
+        if self._activeProduct is None:
+            import adsk.fusion
+            self._activeProduct = adsk.fusion.Design()
+        return self._activeProduct
+
+    @property
+    def materialLibraries(self):
+        return self._materialLibraries
+
+    @staticmethod
+    def _fakeReset():
+        '''
+        replaces the document with a new empty design
+        '''
+        Application.get()._activeProduct = None
+        adsk.stats.reset()
@@ -0,0 +1,1473 @@
+# Description-Headless stand-in for adsk.fusion, see headless/adsk/__init__.py
+
+import math
+
+import adsk
+import adsk.core
+from . import ApiObject
+
+
+class DimensionOrientations:
+    AlignedDimensionOrientation = 0
+    HorizontalDimensionOrientation = 1
+    VerticalDimensionOrientation = 2
+
+
+class DesignTypes:
+    DirectDesignType = 0
+    ParametricDesignType = 1
+
+
+class FeatureOperations:
+    JoinFeatureOperation = 0
+    CutFeatureOperation = 1
+    IntersectFeatureOperation = 2
+    NewBodyFeatureOperation = 3
+    NewComponentFeatureOperation = 4
+
+
+def _fakeGeometry(point):
+    '''
+    returns the Point3D of a Point3D or SketchPoint without counting an API call
+    '''
+    if isinstance(point, SketchPoint):
+        return point._geometry
+    return point
+
+
+class _FakeCollection(ApiObject):
+    '''
+    base of all read only collections
+    '''
+
+    def __init__(self, items=None):
+        self._items = items if items is not None else []
+
+    def _fakeByName(self, name):
+        for item in self._items:
+            if item._name == name:
+                return item
+        return None
+
+    @property
+    def count(self):
+        return len(self._items)
+
+    def item(self, index):
+        return self._items[index]
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+
+# ______ Parameters _______
+class Parameter(ApiObject):
+    def __init__(self, name, expression, unit, parameters):
+        self._name = name
+        self._expression = expression
+        self._unit = unit
+        self._parameters = parameters
+        self._comment = ''
+        self._isFavorite = False
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def expression(self):
+        return self._expression
+
+    @expression.setter
+    def expression(self, value):
+        self._expression = value
+
+    def _set_expression(self, value):
+        self._expression = value
+
+    @property
+    def _fakeValue(self):
+        return adsk.core._fakeEvaluate(self._expression, self._unit, self._parameters)
+
+    @property
+    def value(self):
+        return self._fakeValue
+
+    @value.setter
+    def value(self, value):
+        self._expression = '%r %s' % (value, self._unit.strip() or 'cm')
+
+    @property
+    def unit(self):
+        return self._unit
+
+    @property
+    def comment(self):
+        return self._comment
+
+    @comment.setter
+    def comment(self, value):
+        self._comment = value
+
+    @property
+    def isFavorite(self):
+        return self._isFavorite
+
+    @isFavorite.setter
+    def isFavorite(self, value):
+        self._isFavorite = value
+
+
+class UserParameter(Parameter):
+    def deleteMe(self):
+        self._parameters._items.remove(self)
+        return True
+
+
+class ModelParameter(Parameter):
+    pass
+
+
+class UserParameters(_FakeCollection):
+    def __init__(self, design):
+        super().__init__()
+        self._design = design
+
+    def add(self, name, value, units, comment):
+        if self._design._designType == DesignTypes.DirectDesignType:
+            raise RuntimeError('user parameters are not supported in a direct design')
+        if self._fakeFind(name) is not None:
+            raise RuntimeError('parameter %s already exists' % name)
+        # user parameters are not part of the timeline
+        parameter = UserParameter(name, value._fakeExpression(units), units, self)
+        parameter._comment = comment
+        self._items.append(parameter)
+        return parameter
+
+    def itemByName(self, name):
+        return self._fakeFind(name)
+
+    def _fakeFind(self, name):
+        for parameter in self._items:
+            if parameter._name == name:
+                return parameter
+        return None
+
+
+class FusionUnitsManager(ApiObject):
+    def __init__(self, design):
+        self._design = design
+
+    def evaluateExpression(self, expression, units='cm'):
+        return adsk.core._fakeEvaluate(expression, units, self._design._userParameters)
+
+    @property
+    def defaultLengthUnits(self):
+        return 'mm'
+
+
+# ______ Design and Components _______
+class TimelineObject(ApiObject):
+    def __init__(self, timeline, entity):
+        self._timeline = timeline
+        self._entity = entity
+
+    @property
+    def entity(self):
+        return self._entity
+
+    @property
+    def index(self):
+        for i, item in enumerate(self._timeline._items):
+            if item is self:
+                return i
+        raise RuntimeError('the timeline object has been deleted')
+
+
+class TimelineGroup(ApiObject):
+    def __init__(self, timeline, startIndex, endIndex):
+        self._timeline = timeline
+        self._name = 'Group%d' % (timeline._groups.count + 1)
+        self._objects = timeline._items[startIndex:endIndex + 1]
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        self._name = value
+
+    @property
+    def count(self):
+        return len(self._fakeObjects())
+
+    def item(self, index):
+        return self._fakeObjects()[index]
+
+    def deleteMe(self, deleteGroupAndContents):
+        # deleteMe(False) only ungroups the entries
+        if deleteGroupAndContents:
+            for item in self._fakeObjects():
+                item._entity.deleteMe()
+        self._timeline._groups._items.remove(self)
+        return True
+
+    def _fakeObjects(self):
+        # entries deleted from the timeline leave the group
+        return [item for item in self._objects if item in self._timeline._items]
+
+
+class TimelineGroups(_FakeCollection):
+    def __init__(self, timeline):
+        super().__init__()
+        self._timeline = timeline
+
+    def add(self, startIndex, endIndex):
+        if not 0 <= startIndex <= endIndex < self._timeline.count:
+            raise RuntimeError('invalid timeline range %d - %d' % (startIndex, endIndex))
+        for item in self._timeline._items[startIndex:endIndex + 1]:
+            if any(item in group._objects for group in self._items):
+                raise RuntimeError('timeline groups can not overlap or be nested')
+        group = TimelineGroup(self._timeline, startIndex, endIndex)
+        self._items.append(group)
+        return group
+
+    def itemByName(self, name):
+        return self._fakeByName(name)
+
+
+class Timeline(_FakeCollection):
+    def __init__(self):
+        super().__init__()
+        self._groups = TimelineGroups(self)
+        # new entries are inserted at the marker
+        self._marker = 0
+
+    @property
+    def timelineGroups(self):
+        return self._groups
+
+    @property
+    def markerPosition(self):
+        return self._marker
+
+    @markerPosition.setter
+    def markerPosition(self, value):
+        if not 0 <= value <= len(self._items):
+            raise RuntimeError('invalid marker position %d' % value)
+        self._marker = value
+
+    def moveToEnd(self):
+        self._marker = len(self._items)
+        return True
+
+    def _fakeInsert(self, item):
+        self._items.insert(self._marker, item)
+        self._marker += 1
+
+    def _fakeRemove(self, entity):
+        before = self._items[:self._marker]
+        self._marker -= sum(1 for item in before if item._entity is entity)
+        self._items = [item for item in self._items if item._entity is not entity]
+
+
+class Design(ApiObject):
+    def __init__(self):
+        self._timeline = Timeline()
+        self._designType = DesignTypes.ParametricDesignType
+        self._userParameters = UserParameters(self)
+        self._unitsManager = FusionUnitsManager(self)
+        self._allComponents = Components()
+        self._attributes = adsk.core.Attributes()
+        self._rootComponent = Component(self, 'Root')
+        # base feature in edit, the entities created meanwhile belong to it
+        self._fakeEditedBaseFeature = None
+
+    @staticmethod
+    def cast(product):
+        if isinstance(product, Design):
+            return product
+        return None
+
+    @property
+    def rootComponent(self):
+        return self._rootComponent
+
+    @property
+    def userParameters(self):
+        return self._userParameters
+
+    @property
+    def unitsManager(self):
+        return self._unitsManager
+
+    @property
+    def fusionUnitsManager(self):
+        return self._unitsManager
+
+    @property
+    def allComponents(self):
+        return self._allComponents
+
+    @property
+    def timeline(self):
+        return self._timeline
+
+    @property
+    def designType(self):
+        return self._designType
+
+    @designType.setter
+    def designType(self, value):
+        if value == DesignTypes.DirectDesignType:
+            # a direct design drops the history
+            self._timeline = Timeline()
+        self._designType = value
+
+    @property
+    def attributes(self):
+        return self._attributes
+
+    def _fakeTimelineAdd(self, entity):
+        if self._fakeEditedBaseFeature != None:
+            self._fakeEditedBaseFeature._entities.append(entity)
+        elif self._designType == DesignTypes.ParametricDesignType:
+            self._timeline._fakeInsert(TimelineObject(self._timeline, entity))
+
+    def _fakeTimelineRemove(self, entity):
+        self._timeline._fakeRemove(entity)
+
+    def _fakeTimelineObject(self, entity):
+        for item in self._timeline._items:
+            if item._entity is entity:
+                return item
+        return None
+
+
+class Components(_FakeCollection):
+    def itemByName(self, name):
+        return self._fakeByName(name)
+
+
+class ConstructionPlane(ApiObject):
+    def __init__(self, parent, name):
+        self._parent = parent
+        self._name = name
+
+    @property
+    def parent(self):
+        return self._parent
+
+    @property
+    def name(self):
+        return self._name
+
+
+class ConstructionAxis(ApiObject):
+    def __init__(self, parent, name):
+        self._parent = parent
+        self._name = name
+
+    @property
+    def parent(self):
+        return self._parent
+
+    def createForAssemblyContext(self, occurrence):
+        return self
+
+
+class Component(ApiObject):
+    def __init__(self, design, name):
+        self._design = design
+        self._name = name
+        self._sketches = Sketches(self)
+        self._features = Features(self)
+        self._occurrences = Occurrences(self)
+        self._bRepBodies = BRepBodies()
+        self._xYConstructionPlane = ConstructionPlane(self, 'XY')
+        self._xZConstructionPlane = ConstructionPlane(self, 'XZ')
+        self._yZConstructionPlane = ConstructionPlane(self, 'YZ')
+        self._xConstructionAxis = ConstructionAxis(self, 'X')
+        self._yConstructionAxis = ConstructionAxis(self, 'Y')
+        self._zConstructionAxis = ConstructionAxis(self, 'Z')
+        self._attributes = adsk.core.Attributes()
+        self._customGraphicsGroups = CustomGraphicsGroups()
+        design._allComponents._items.append(self)
+
+    @property
+    def customGraphicsGroups(self):
+        return self._customGraphicsGroups
+
+    @property
+    def attributes(self):
+        return self._attributes
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        self._name = value
+
+    def _set_name(self, value):
+        self._name = value
+
+    @property
+    def sketches(self):
+        return self._sketches
+
+    @property
+    def features(self):
+        return self._features
+
+    @property
+    def occurrences(self):
+        return self._occurrences
+
+    @property
+    def bRepBodies(self):
+        return self._bRepBodies
+
+    @property
+    def xYConstructionPlane(self):
+        return self._xYConstructionPlane
+
+    @property
+    def xZConstructionPlane(self):
+        return self._xZConstructionPlane
+
+    @property
+    def yZConstructionPlane(self):
+        return self._yZConstructionPlane
+
+    @property
+    def xConstructionAxis(self):
+        return self._xConstructionAxis
+
+    @property
+    def yConstructionAxis(self):
+        return self._yConstructionAxis
+
+    @property
+    def zConstructionAxis(self):
+        return self._zConstructionAxis
+
+    @property
+    def parentDesign(self):
+        return self._design
+
+    def occurrencesByComponent(self, component):
+        return _FakeCollection([occurrence for occurrence in self._occurrences._items
+                                if occurrence._component is component])
+
+
+class Occurrence(ApiObject):
+    def __init__(self, parent, component, transform):
+        self._parent = parent
+        self._component = component
+        self._transform = transform.copy()
+        self._isLightBulbOn = True
+
+    @property
+    def component(self):
+        return self._component
+
+    @property
+    def name(self):
+        return '%s:%d' % (self._component._name, self._parent._occurrences._items.index(self) + 1)
+
+    @property
+    def transform(self):
+        return self._transform.copy()
+
+    @transform.setter
+    def transform(self, value):
+        self._transform = value.copy()
+
+    @property
+    def isLightBulbOn(self):
+        return self._isLightBulbOn
+
+    @isLightBulbOn.setter
+    def isLightBulbOn(self, value):
+        self._isLightBulbOn = value
+
+    @property
+    def timelineObject(self):
+        return self._parent._design._fakeTimelineObject(self)
+
+    def deleteMe(self):
+        self._parent._occurrences._items.remove(self)
+        self._parent._design._fakeTimelineRemove(self)
+        # a component without occurrences is removed from the design
+        if not any(occurrence._component is self._component
+                   for component in self._parent._design._allComponents._items
+                   for occurrence in component._occurrences._items):
+            self._parent._design._allComponents._items.remove(self._component)
+        return True
+
+
+class Occurrences(_FakeCollection):
+    def __init__(self, parent):
+        super().__init__()
+        self._parent = parent
+
+    def addNewComponent(self, transform):
+        component = Component(self._parent._design, 'Component%d' % self._parent._design._allComponents.count)
+        occurrence = Occurrence(self._parent, component, transform)
+        self._items.append(occurrence)
+        self._parent._design._fakeTimelineAdd(occurrence)
+        return occurrence
+
+    def addExistingComponent(self, component, transform):
+        occurrence = Occurrence(self._parent, component, transform)
+        self._items.append(occurrence)
+        self._parent._design._fakeTimelineAdd(occurrence)
+        return occurrence
+
+
+# ______ Sketches _______
+class Sketches(_FakeCollection):
+    def __init__(self, parent):
+        super().__init__()
+        self._parent = parent
+
+    def add(self, planarEntity, occurrenceForCreation=None):
+        sketch = Sketch(self._parent, planarEntity)
+        self._items.append(sketch)
+        self._parent._design._fakeTimelineAdd(sketch)
+        return sketch
+
+    def itemByName(self, name):
+        return self._fakeByName(name)
+
+
+class Sketch(ApiObject):
+    def __init__(self, parentComponent, referencePlane):
+        self._parentComponent = parentComponent
+        self._referencePlane = referencePlane
+        self._name = 'Sketch%d' % (parentComponent._sketches.count + 1)
+        self._isVisible = True
+        self._isComputeDeferred = False
+        self._entityCount = 0
+        self._sketchPoints = SketchPoints(self)
+        self._sketchCurves = SketchCurves(self)
+        self._sketchDimensions = SketchDimensions(self)
+        self._geometricConstraints = GeometricConstraints(self)
+
+    def _fakeAdded(self, count=1):
+        '''
+        models the sketch solve after every change unless compute is deferred
+        '''
+        self._entityCount += count
+        if not self._isComputeDeferred:
+            self._fakeCompute()
+
+    def _fakeCompute(self):
+        adsk.stats.record('Sketch.compute', weight=1.0 + self._entityCount / 100.0)
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        self._name = value
+
+    def _set_name(self, value):
+        self._name = value
+
+    @property
+    def isVisible(self):
+        return self._isVisible
+
+    @isVisible.setter
+    def isVisible(self, value):
+        self._isVisible = value
+
+    @property
+    def isComputeDeferred(self):
+        return self._isComputeDeferred
+
+    @isComputeDeferred.setter
+    def isComputeDeferred(self, value):
+        wasDeferred = self._isComputeDeferred
+        self._isComputeDeferred = value
+        if wasDeferred and not value:
+            self._fakeCompute()
+
+    @property
+    def parentComponent(self):
+        return self._parentComponent
+
+    @property
+    def referencePlane(self):
+        return self._referencePlane
+
+    @property
+    def sketchPoints(self):
+        return self._sketchPoints
+
+    @property
+    def sketchCurves(self):
+        return self._sketchCurves
+
+    @property
+    def sketchDimensions(self):
+        return self._sketchDimensions
+
+    @property
+    def geometricConstraints(self):
+        return self._geometricConstraints
+
+    @property
+    def profiles(self):
+        # every sketch with real curves is treated as one closed profile
+        for curve in self._sketchCurves._fakeAll():
+            if not curve._isConstruction:
+                return Profiles([Profile(self)])
+        return Profiles([])
+
+    @property
+    def timelineObject(self):
+        return self._parentComponent._design._fakeTimelineObject(self)
+
+    def deleteMe(self):
+        self._parentComponent._sketches._items.remove(self)
+        self._parentComponent._design._fakeTimelineRemove(self)
+        return True
+
+
+class Profile(ApiObject):
+    def __init__(self, parentSketch):
+        self._parentSketch = parentSketch
+
+    @property
+    def parentSketch(self):
+        return self._parentSketch
+
+
+class Profiles(_FakeCollection):
+    pass
+
+
+class SketchEntity(ApiObject):
+    def __init__(self, sketch):
+        self._sketch = sketch
+        self._isFixed = False
+        self._constraints = []
+        self._dimensions = []
+
+    @property
+    def parentSketch(self):
+        return self._sketch
+
+    @property
+    def isFixed(self):
+        return self._isFixed
+
+    @isFixed.setter
+    def isFixed(self, value):
+        self._isFixed = value
+
+    @property
+    def geometricConstraints(self):
+        return GeometricConstraintList(self._constraints)
+
+    # the EZFusionAPI uses the misspelled name
+    @property
+    def geomtricConstraints(self):
+        return GeometricConstraintList(self._constraints)
+
+    @property
+    def sketchDimensions(self):
+        return _FakeCollection(list(self._dimensions))
+
+
+class SketchPoint(SketchEntity):
+    def __init__(self, sketch, geometry):
+        super().__init__(sketch)
+        self._geometry = adsk.core.Point3D(geometry._x, geometry._y, geometry._z)
+
+    @property
+    def geometry(self):
+        return adsk.core.Point3D(self._geometry._x, self._geometry._y, self._geometry._z)
+
+    def move(self, translation):
+        self._geometry._x += translation._x
+        self._geometry._y += translation._y
+        self._geometry._z += translation._z
+        return True
+
+    def deleteMe(self):
+        self._sketch._sketchPoints._items.remove(self)
+        return True
+
+
+class SketchPoints(_FakeCollection):
+    def __init__(self, sketch):
+        super().__init__()
+        self._sketch = sketch
+
+    def add(self, point):
+        sketchPoint = self._fakeAdd(point)
+        self._sketch._fakeAdded()
+        return sketchPoint
+
+    def _fakeAdd(self, point):
+        if isinstance(point, SketchPoint):
+            return point
+        sketchPoint = SketchPoint(self._sketch, point)
+        self._items.append(sketchPoint)
+        return sketchPoint
+
+
+class SketchCurve(SketchEntity):
+    def __init__(self, sketch):
+        super().__init__(sketch)
+        self._isConstruction = False
+
+    @property
+    def isConstruction(self):
+        return self._isConstruction
+
+    @isConstruction.setter
+    def isConstruction(self, value):
+        self._isConstruction = value
+
+    def _set_isConstruction(self, value):
+        self._isConstruction = value
+
+    @property
+    def startSketchPoint(self):
+        return self._start
+
+    @property
+    def endSketchPoint(self):
+        return self._end
+
+    def deleteMe(self):
+        self._fakeCollection._items.remove(self)
+        return True
+
+
+class SketchLine(SketchCurve):
+    def __init__(self, sketch, start, end):
+        super().__init__(sketch)
+        self._start = start
+        self._end = end
+        self._fakeCollection = sketch._sketchCurves._sketchLines
+
+    @property
+    def length(self):
+        return self._start._geometry._fakeDistance(self._end._geometry)
+
+
+class SketchArc(SketchCurve):
+    def __init__(self, sketch, start, end, center, radius, sweep):
+        super().__init__(sketch)
+        self._start = start
+        self._end = end
+        self._center = center
+        self._radius = radius
+        self._sweep = sweep
+        self._fakeCollection = sketch._sketchCurves._sketchArcs
+
+    @property
+    def centerSketchPoint(self):
+        return self._center
+
+    @property
+    def radius(self):
+        return self._radius
+
+    @property
+    def length(self):
+        return abs(self._sweep) * self._radius
+
+
+class SketchCircle(SketchCurve):
+    def __init__(self, sketch, center, radius):
+        super().__init__(sketch)
+        self._center = center
+        self._radius = radius
+        self._start = center
+        self._end = center
+        self._fakeCollection = sketch._sketchCurves._sketchCircles
+
+    @property
+    def centerSketchPoint(self):
+        return self._center
+
+    @property
+    def radius(self):
+        return self._radius
+
+    @property
+    def length(self):
+        return 2 * math.pi * self._radius
+
+
+class SketchLineList(_FakeCollection):
+    pass
+
+
+class SketchLines(_FakeCollection):
+    def __init__(self, sketch):
+        super().__init__()
+        self._sketch = sketch
+
+    def _fakeLine(self, startPoint, endPoint):
+        points = self._sketch._sketchPoints
+        line = SketchLine(self._sketch, points._fakeAdd(startPoint), points._fakeAdd(endPoint))
+        self._items.append(line)
+        return line
+
+    def addByTwoPoints(self, startPoint, endPoint):
+        line = self._fakeLine(startPoint, endPoint)
+        self._sketch._fakeAdded()
+        return line
+
+    def _fakeRectangle(self, corners):
+        points = self._sketch._sketchPoints
+        corners = [points._fakeAdd(corner) for corner in corners]
+        lines = [self._fakeLine(corners[i], corners[(i + 1) % 4]) for i in range(4)]
+        self._sketch._fakeAdded(4)
+        return SketchLineList(lines)
+
+    def addTwoPointRectangle(self, pointOne, pointTwo):
+        a = _fakeGeometry(pointOne)
+        b = _fakeGeometry(pointTwo)
+        return self._fakeRectangle([pointOne, adsk.core.Point3D(b._x, a._y, 0), pointTwo,
+                                    adsk.core.Point3D(a._x, b._y, 0)])
+
+    def addThreePointRectangle(self, pointOne, pointTwo, pointThree):
+        a = _fakeGeometry(pointOne)
+        b = _fakeGeometry(pointTwo)
+        c = _fakeGeometry(pointThree)
+        dx, dy = b._x - a._x, b._y - a._y
+        length = math.hypot(dx, dy)
+        nx, ny = -dy / length, dx / length
+        height = (c._x - b._x) * nx + (c._y - b._y) * ny
+        return self._fakeRectangle([pointOne, pointTwo, adsk.core.Point3D(b._x + nx * height, b._y + ny * height, 0),
+                                    adsk.core.Point3D(a._x + nx * height, a._y + ny * height, 0)])
+
+    def addCenterPointRectangle(self, centerPoint, cornerPoint):
+        c = _fakeGeometry(centerPoint)
+        p = _fakeGeometry(cornerPoint)
+        dx, dy = p._x - c._x, p._y - c._y
+        return self._fakeRectangle([adsk.core.Point3D(c._x - dx, c._y - dy, 0), adsk.core.Point3D(c._x + dx, c._y - dy, 0),
+                                    cornerPoint, adsk.core.Point3D(c._x - dx, c._y + dy, 0)])
+
+
+def _fakeCircumcircle(a, b, c):
+    d = 2 * (a._x * (b._y - c._y) + b._x * (c._y - a._y) + c._x * (a._y - b._y))
+    if abs(d) < 1e-12:
+        raise RuntimeError('points are collinear')
+    aa = a._x ** 2 + a._y ** 2
+    bb = b._x ** 2 + b._y ** 2
+    cc = c._x ** 2 + c._y ** 2
+    x = (aa * (b._y - c._y) + bb * (c._y - a._y) + cc * (a._y - b._y)) / d
+    y = (aa * (c._x - b._x) + bb * (a._x - c._x) + cc * (b._x - a._x)) / d
+    return adsk.core.Point3D(x, y, 0), math.hypot(a._x - x, a._y - y)
+
+
+class SketchArcs(_FakeCollection):
+    def __init__(self, sketch):
+        super().__init__()
+        self._sketch = sketch
+
+    def _fakeArc(self, startPoint, endPoint, center, radius, sweep):
+        points = self._sketch._sketchPoints
+        arc = SketchArc(self._sketch, points._fakeAdd(startPoint), points._fakeAdd(endPoint),
+                        points._fakeAdd(center), radius, sweep)
+        self._items.append(arc)
+        self._sketch._fakeAdded()
+        return arc
+
+    def addByThreePoints(self, startPoint, point, endPoint):
+        a = _fakeGeometry(startPoint)
+        b = _fakeGeometry(point)
+        c = _fakeGeometry(endPoint)
+        center, radius = _fakeCircumcircle(a, b, c)
+        start = math.atan2(a._y - center._y, a._x - center._x)
+        mid = (math.atan2(b._y - center._y, b._x - center._x) - start) % (2 * math.pi)
+        end = (math.atan2(c._y - center._y, c._x - center._x) - start) % (2 * math.pi)
+        sweep = end if mid < end else end - 2 * math.pi
+        return self._fakeArc(startPoint, endPoint, center, radius, sweep)
+
+    def addByCenterStartSweep(self, centerPoint, startPoint, sweepAngle):
+        c = _fakeGeometry(centerPoint)
+        s = _fakeGeometry(startPoint)
+        radius = c._fakeDistance(s)
+        angle = math.atan2(s._y - c._y, s._x - c._x) + sweepAngle
+        end = adsk.core.Point3D(c._x + radius * math.cos(angle), c._y + radius * math.sin(angle), 0)
+        return self._fakeArc(startPoint, end, centerPoint, radius, sweepAngle)
+
+    def addFillet(self, firstEntity, firstEntityPoint, secondEntity, secondEntityPoint, radius):
+        a = _fakeGeometry(firstEntity._end)
+        return self._fakeArc(firstEntity._end, secondEntity._start, adsk.core.Point3D(a._x, a._y, 0), radius,
+                             math.pi / 2)
+
+
+class SketchCircles(_FakeCollection):
+    def __init__(self, sketch):
+        super().__init__()
+        self._sketch = sketch
+
+    def _fakeCircle(self, center, radius):
+        circle = SketchCircle(self._sketch, self._sketch._sketchPoints._fakeAdd(center), radius)
+        self._items.append(circle)
+        self._sketch._fakeAdded()
+        return circle
+
+    def addByCenterRadius(self, centerPoint, radius):
+        return self._fakeCircle(centerPoint, radius)
+
+    def addByTwoPoints(self, pointOne, pointTwo):
+        a = _fakeGeometry(pointOne)
+        b = _fakeGeometry(pointTwo)
+        return self._fakeCircle(adsk.core.Point3D((a._x + b._x) / 2, (a._y + b._y) / 2, 0), a._fakeDistance(b) / 2)
+
+    def addByThreePoints(self, pointOne, pointTwo, pointThree):
+        center, radius = _fakeCircumcircle(_fakeGeometry(pointOne), _fakeGeometry(pointTwo),
+                                           _fakeGeometry(pointThree))
+        return self._fakeCircle(center, radius)
+
+    def addByTwoTangents(self, tangentOne, tangentTwo, radius, hintPoint=None):
+        return self._fakeCircle(_fakeGeometry(tangentOne._end), radius)
+
+    def addByThreeTangents(self, tangentOne, tangentTwo, tangentThree, hintPoint=None):
+        return self._fakeCircle(_fakeGeometry(tangentOne._end), 1.0)
+
+
+class SketchCurves(ApiObject):
+    def __init__(self, sketch):
+        self._sketchLines = SketchLines(sketch)
+        self._sketchArcs = SketchArcs(sketch)
+        self._sketchCircles = SketchCircles(sketch)
+
+    def _fakeAll(self):
+        return self._sketchLines._items + self._sketchArcs._items + self._sketchCircles._items
+
+    @property
+    def sketchLines(self):
+        return self._sketchLines
+
+    @property
+    def sketchArcs(self):
+        return self._sketchArcs
+
+    @property
+    def sketchCircles(self):
+        return self._sketchCircles
+
+    @property
+    def count(self):
+        return len(self._fakeAll())
+
+    def item(self, index):
+        return self._fakeAll()[index]
+
+    def __iter__(self):
+        return iter(self._fakeAll())
+
+
+# ______ Constraints and Dimensions _______
+class GeometricConstraint(ApiObject):
+    def __init__(self, sketch, constraintType, entities):
+        self._sketch = sketch
+        self._constraintType = constraintType
+        self._entities = entities
+
+    @property
+    def parentSketch(self):
+        return self._sketch
+
+    def deleteMe(self):
+        self._sketch._geometricConstraints._items.remove(self)
+        for entity in self._entities:
+            entity._constraints.remove(self)
+        return True
+
+
+class GeometricConstraintList(_FakeCollection):
+    pass
+
+
+class GeometricConstraints(_FakeCollection):
+    def __init__(self, sketch):
+        super().__init__()
+        self._sketch = sketch
+
+    def _fakeAdd(self, constraintType, *entities):
+        constraint = GeometricConstraint(self._sketch, constraintType, entities)
+        for entity in entities:
+            entity._constraints.append(constraint)
+        self._items.append(constraint)
+        self._sketch._fakeAdded()
+        return constraint
+
+    def addHorizontal(self, line):
+        return self._fakeAdd('horizontal', line)
+
+    def addHorizontalPoints(self, pointOne, pointTwo):
+        return self._fakeAdd('horizontal', pointOne, pointTwo)
+
+    def addVertical(self, line):
+        return self._fakeAdd('vertical', line)
+
+    def addVerticalPoints(self, pointOne, pointTwo):
+        return self._fakeAdd('vertical', pointOne, pointTwo)
+
+    def addCoincident(self, point, entity):
+        return self._fakeAdd('coincident', point, entity)
+
+    def addCollinear(self, lineOne, lineTwo):
+        return self._fakeAdd('collinear', lineOne, lineTwo)
+
+    def addMidPoint(self, point, midPointCurve):
+        return self._fakeAdd('midpoint', point, midPointCurve)
+
+    def addParallel(self, lineOne, lineTwo):
+        return self._fakeAdd('parallel', lineOne, lineTwo)
+
+    def addPerpendicular(self, lineOne, lineTwo):
+        return self._fakeAdd('perpendicular', lineOne, lineTwo)
+
+    def addConcentric(self, entityOne, entityTwo):
+        return self._fakeAdd('concentric', entityOne, entityTwo)
+
+    def addSymmetry(self, entityOne, entityTwo, symmetryLine):
+        return self._fakeAdd('symmetry', entityOne, entityTwo, symmetryLine)
+
+    def addTangent(self, curveOne, curveTwo):
+        return self._fakeAdd('tangent', curveOne, curveTwo)
+
+    def addSmooth(self, curveOne, curveTwo):
+        return self._fakeAdd('smooth', curveOne, curveTwo)
+
+    def addEqual(self, curveOne, curveTwo):
+        return self._fakeAdd('equal', curveOne, curveTwo)
+
+
+class SketchDimension(ApiObject):
+    def __init__(self, sketch, dimensionType, entities, textPoint):
+        self._sketch = sketch
+        self._dimensionType = dimensionType
+        self._entities = entities
+        self._textPoint = textPoint
+        self._parameter = ModelParameter('d%d' % (sketch._sketchDimensions.count + 1), '1 cm', 'cm', None)
+
+    @property
+    def parameter(self):
+        return self._parameter
+
+    @property
+    def textPosition(self):
+        return self._textPoint
+
+    def deleteMe(self):
+        self._sketch._sketchDimensions._items.remove(self)
+        return True
+
+
+class SketchDimensions(_FakeCollection):
+    def __init__(self, sketch):
+        super().__init__()
+        self._sketch = sketch
+
+    def _fakeAdd(self, dimensionType, entities, textPoint):
+        dimension = SketchDimension(self._sketch, dimensionType, entities, textPoint)
+        for entity in entities:
+            if isinstance(entity, SketchEntity):
+                entity._dimensions.append(dimension)
+        self._items.append(dimension)
+        self._sketch._fakeAdded()
+        return dimension
+
+    def addDistanceDimension(self, pointOne, pointTwo, orientation, textPoint, isDriving=True):
+        return self._fakeAdd('distance', (pointOne, pointTwo), textPoint)
+
+    def addAngularDimension(self, lineOne, lineTwo, textPoint, isDriving=True):
+        return self._fakeAdd('angular', (lineOne, lineTwo), textPoint)
+
+    def addRadialDimension(self, entity, textPoint, isDriving=True):
+        return self._fakeAdd('radial', (entity,), textPoint)
+
+    def addDiameterDimension(self, entity, textPoint, isDriving=True):
+        return self._fakeAdd('diameter', (entity,), textPoint)
+
+    def addConcentricCircleDimension(self, circleOne, circleTwo, textPoint, isDriving=True):
+        return self._fakeAdd('concentric', (circleOne, circleTwo), textPoint)
+
+    def addOffsetDimension(self, line, entityTwo, textPoint, isDriving=True):
+        return self._fakeAdd('offset', (line, entityTwo), textPoint)
+
+
+# ______ Bodies and Features _______
+class BRepBody(ApiObject):
+    def __init__(self, parentComponent):
+        self._parentComponent = parentComponent
+        self._name = 'Body%d' % (parentComponent._bRepBodies.count + 1)
+        self._material = None
+        self._appearance = None
+
+    def deleteMe(self):
+        self._parentComponent._bRepBodies._items.remove(self)
+        return True
+
+    @property
+    def parentComponent(self):
+        return self._parentComponent
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        self._name = value
+
+    @property
+    def faces(self):
+        return BRepFaces([BRepFace(self) for _ in range(6)])
+
+    @property
+    def edges(self):
+        return _FakeCollection([])
+
+    @property
+    def material(self):
+        return self._material
+
+    @material.setter
+    def material(self, value):
+        self._material = value
+
+    @property
+    def appearance(self):
+        return self._appearance
+
+    @appearance.setter
+    def appearance(self, value):
+        self._appearance = value
+
+    def createForAssemblyContext(self, occurrence):
+        return self
+
+
+class BRepBodies(_FakeCollection):
+    def itemByName(self, name):
+        return self._fakeByName(name)
+
+
+class BRepFace(ApiObject):
+    def __init__(self, body):
+        self._body = body
+
+    @property
+    def body(self):
+        return self._body
+
+
+class BRepFaces(_FakeCollection):
+    pass
+
+
+class FeatureInput(ApiObject):
+    '''
+    generic input object of a feature, stores every argument given to it
+    '''
+
+    def __init__(self, *args):
+        self._args = args
+        self._extent = None
+        self._targetBaseFeature = None
+
+    @property
+    def targetBaseFeature(self):
+        return self._targetBaseFeature
+
+    @targetBaseFeature.setter
+    def targetBaseFeature(self, value):
+        self._targetBaseFeature = value
+
+    def setDistanceExtent(self, isSymmetric, distance):
+        self._extent = (isSymmetric, distance)
+        return True
+
+    def setAngleExtent(self, isSymmetric, angle):
+        self._extent = (isSymmetric, angle)
+        return True
+
+    def addConstantRadiusEdgeSet(self, edges, radius, isTangentChain):
+        self._extent = radius
+        return True
+
+
+class Feature(ApiObject):
+    def __init__(self, parentComponent, featureInput, collection):
+        self._parentComponent = parentComponent
+        self._input = featureInput
+        self._collection = collection
+        self._name = None
+        self._bodies = [BRepBody(parentComponent)]
+        parentComponent._bRepBodies._items.extend(self._bodies)
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        self._name = value
+
+    @property
+    def parentComponent(self):
+        return self._parentComponent
+
+    @property
+    def bodies(self):
+        return BRepBodies(list(self._bodies))
+
+    @property
+    def faces(self):
+        return self._bodies[0].faces
+
+    @property
+    def startFaces(self):
+        return BRepFaces(list(self._bodies[0].faces)[:1])
+
+    @property
+    def endFaces(self):
+        return BRepFaces(list(self._bodies[0].faces)[1:2])
+
+    @property
+    def sideFaces(self):
+        return BRepFaces(list(self._bodies[0].faces)[2:])
+
+    @property
+    def timelineObject(self):
+        return self._parentComponent._design._fakeTimelineObject(self)
+
+    def deleteMe(self):
+        for body in self._bodies:
+            self._parentComponent._bRepBodies._items.remove(body)
+        self._collection._items.remove(self)
+        self._parentComponent._design._fakeTimelineRemove(self)
+        return True
+
+
+class ExtrudeFeature(Feature):
+    pass
+
+
+class BaseFeature(ApiObject):
+    '''
+    a non parametric feature, the sketches and features created while it is
+    edited belong to it and are not part of the timeline
+    '''
+
+    def __init__(self, parentComponent, collection):
+        self._parentComponent = parentComponent
+        self._collection = collection
+        self._name = None
+        self._entities = []
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        self._name = value
+
+    @property
+    def parentComponent(self):
+        return self._parentComponent
+
+    @property
+    def timelineObject(self):
+        return self._parentComponent._design._fakeTimelineObject(self)
+
+    def startEdit(self):
+        self._parentComponent._design._fakeEditedBaseFeature = self
+        return True
+
+    def finishEdit(self):
+        self._parentComponent._design._fakeEditedBaseFeature = None
+        return True
+
+    def deleteMe(self):
+        for entity in list(self._entities):
+            entity.deleteMe()
+        self._collection._items.remove(self)
+        self._parentComponent._design._fakeTimelineRemove(self)
+        return True
+
+
+class RevolveFeature(Feature):
+    pass
+
+
+class FilletFeature(Feature):
+    pass
+
+
+class ShellFeature(Feature):
+    pass
+
+
+class CircularPatternFeature(Feature):
+    pass
+
+
+class _FakeFeatures(_FakeCollection):
+    _fakeFeatureClass = Feature
+
+    def __init__(self, parentComponent):
+        super().__init__()
+        self._parentComponent = parentComponent
+
+    def createInput(self, *args):
+        return FeatureInput(*args)
+
+    def add(self, input):
+        feature = self._fakeFeatureClass(self._parentComponent, input, self)
+        self._items.append(feature)
+        self._parentComponent._design._fakeTimelineAdd(feature)
+        return feature
+
+    def itemByName(self, name):
+        return self._fakeByName(name)
+
+
+class ExtrudeFeatures(_FakeFeatures):
+    _fakeFeatureClass = ExtrudeFeature
+
+
+class BaseFeatures(_FakeCollection):
+    def __init__(self, parentComponent):
+        super().__init__()
+        self._parentComponent = parentComponent
+
+    def add(self):
+        feature = BaseFeature(self._parentComponent, self)
+        self._items.append(feature)
+        self._parentComponent._design._fakeTimelineAdd(feature)
+        return feature
+
+    def itemByName(self, name):
+        return self._fakeByName(name)
+
+
+class RevolveFeatures(_FakeFeatures):
+    _fakeFeatureClass = RevolveFeature
+
+
+class FilletFeatures(_FakeFeatures):
+    _fakeFeatureClass = FilletFeature
+
+
+class ShellFeatures(_FakeFeatures):
+    _fakeFeatureClass = ShellFeature
+
+
+class CircularPatternFeatures(_FakeFeatures):
+    _fakeFeatureClass = CircularPatternFeature
+
+
+class Features(ApiObject):
+    def __init__(self, parentComponent):
+        self._extrudeFeatures = ExtrudeFeatures(parentComponent)
+        self._revolveFeatures = RevolveFeatures(parentComponent)
+        self._filletFeatures = FilletFeatures(parentComponent)
+        self._shellFeatures = ShellFeatures(parentComponent)
+        self._circularPatternFeatures = CircularPatternFeatures(parentComponent)
+        self._baseFeatures = BaseFeatures(parentComponent)
+
+    @property
+    def extrudeFeatures(self):
+        return self._extrudeFeatures
+
+    @property
+    def revolveFeatures(self):
+        return self._revolveFeatures
+
+    @property
+    def filletFeatures(self):
+        return self._filletFeatures
+
+    @property
+    def shellFeatures(self):
+        return self._shellFeatures
+
+    @property
+    def circularPatternFeatures(self):
+        return self._circularPatternFeatures
+
+    @property
+    def baseFeatures(self):
+        return self._baseFeatures
+
+
+# ______ Custom Graphics _______
+class CustomGraphicsCoordinates(ApiObject):
+    def __init__(self, coordinates):
+        self._coordinates = list(coordinates)
+
+    @staticmethod
+    def create(coordinates):
+        return CustomGraphicsCoordinates(coordinates)
+
+    @property
+    def coordinateCount(self):
+        return len(self._coordinates) // 3
+
+
+class CustomGraphicsEntity(ApiObject):
+    def __init__(self, group):
+        self._group = group
+
+    def deleteMe(self):
+        self._group._items.remove(self)
+        return True
+
+
+class CustomGraphicsLines(CustomGraphicsEntity):
+    def __init__(self, group, coordinates, indexList, isLineStrip):
+        super().__init__(group)
+        self._coordinates = coordinates
+        self._indexList = list(indexList)
+        self._isLineStrip = isLineStrip
+
+
+class CustomGraphicsGroup(_FakeCollection):
+    def __init__(self, groups):
+        super().__init__()
+        self._groups = groups
+
+    def addLines(self, coordinates, indexList, isLineStrip, lineStripLengths=None):
+        lines = CustomGraphicsLines(self, coordinates, indexList, isLineStrip)
+        self._items.append(lines)
+        return lines
+
+    def deleteMe(self):
+        self._groups._items.remove(self)
+        return True
+
+
+class CustomGraphicsGroups(_FakeCollection):
+    def add(self):
+        group = CustomGraphicsGroup(self)
+        self._items.append(group)
+        return group
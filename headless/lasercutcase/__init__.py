@@ -0,0 +1,10 @@
+# Description-Package of the script folder for the headless stand-in.
+#
+# The script modules use relative imports, Fusion 360 loads them as a package.
+# With the headless folder on sys.path they are importable as
+# lasercutcase.<Module>, also in worker processes started by spawn, which
+# import the modules again by name.
+
+import os
+
+__path__ = [os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))]